@@ -0,0 +1,19 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from services.export_service import stream_export
+
+export_bp = Blueprint('export_bp', __name__)
+
+MIMETYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+@export_bp.route('/export')
+def export():
+    """Streams stats for every player and/or team: ?format=ndjson|csv&kind=players|teams|all"""
+    fmt = request.args.get('format', 'ndjson')
+    kind = request.args.get('kind', 'all' if fmt == 'ndjson' else 'players')
+
+    chunks = stream_export(fmt, kind)
+    if isinstance(chunks, dict):
+        return jsonify(chunks), 400
+    response = Response(stream_with_context(chunks), mimetype=MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=ipl-{kind}.{fmt}'
+    return response
@@ -0,0 +1,73 @@
+import time
+
+from flask import g, request
+
+from services import metrics, registry
+from services.profiler import from_env as profiler_from_env
+from .response_cache import response_cache, in_flight
+
+
+def _cache_metrics():
+    stats = response_cache.stats()
+    return [
+        ('ipl_response_cache_hits_total', 'counter', 'Response cache hits.', [({}, stats['hits'])]),
+        ('ipl_response_cache_misses_total', 'counter', 'Response cache misses.', [({}, stats['misses'])]),
+        ('ipl_response_cache_entries', 'gauge', 'Bodies held by the response cache.', [({}, stats['entries'])]),
+        ('ipl_response_cache_bytes', 'gauge', 'Size of the bodies held by the response cache.', [({}, stats['bytes'])]),
+    ]
+
+
+def _coalescing_metrics():
+    stats = in_flight.stats()
+    return [
+        ('ipl_coalesce_leaders_total', 'counter', 'Cache misses that ran their computation.', [({}, stats['leaders'])]),
+        ('ipl_coalesce_followers_total', 'counter',
+         'Cache misses that waited for an identical in-flight computation instead.', [({}, stats['followers'])]),
+        ('ipl_coalesce_hit_ratio', 'gauge', 'Share of cache misses served by an in-flight computation.',
+         [({}, round(stats['hit_rate'], 4))]),
+        ('ipl_coalesce_in_flight', 'gauge', 'Computations currently running.', [({}, stats['in_flight'])]),
+    ]
+
+
+def _startup_metrics():
+    status = registry.status()
+    return [
+        ('ipl_ready', 'gauge', '1 once the datasets, indexes and model are built.',
+         [({}, int(status['state'] == 'ready'))]),
+        ('ipl_component_build_seconds', 'gauge', 'Time taken to build each registry component at startup.',
+         [({'component': name}, seconds) for name, seconds in status['timings'].items()]),
+    ]
+
+
+def instrument(app):
+    """
+    Records the latency and status of every request, and adds a Server-Timing header that
+    breaks the response time down by the service functions (and phases) it went through.
+    """
+    profiler = profiler_from_env()
+    metrics.register_collector(_cache_metrics)
+    metrics.register_collector(_coalescing_metrics)
+    metrics.register_collector(_startup_metrics)
+
+    @app.before_request
+    def start_timing():
+        g.request_start = time.perf_counter()
+        g.metrics_token = metrics.start_request()
+        if profiler is not None:
+            profiler.begin()
+
+    @app.after_request
+    def finish_timing(response):
+        if 'metrics_token' not in g:
+            return response
+        total = time.perf_counter() - g.request_start
+        timings = metrics.finish_request(g.pop('metrics_token'))
+        # The URL rule, not the path, so the label set stays bounded
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+        metrics.observe('ipl_request_duration_seconds', total, endpoint=endpoint)
+        metrics.inc('ipl_requests_total', endpoint=endpoint, status=response.status_code)
+        response.headers['Server-Timing'] = metrics.server_timing(timings, total)
+        if profiler is not None:
+            profiler.end(f"{request.method} {request.full_path}", total)
+        return response
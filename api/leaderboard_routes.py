@@ -0,0 +1,23 @@
+from flask import Blueprint, request
+from services.leaderboard_service import get_leaderboard, MAX_LIMIT
+from .response_cache import cached_result
+
+leaderboard_bp = Blueprint('leaderboard_bp', __name__)
+
+@leaderboard_bp.route('/leaderboard')
+def leaderboard():
+    """Top players by a metric, e.g. ?metric=economy&role=bowling&season=2016&phase=Death&min_balls=120"""
+    role = request.args.get('role', 'batting')
+    role = {'batsman': 'batting', 'bowler': 'bowling'}.get(role, role)
+    metric = request.args.get('metric', 'runs' if role == 'batting' else 'wickets')
+    season = request.args.get('season')
+    phase = request.args.get('phase')
+    min_balls = max(0, request.args.get('min_balls', 0, type=int))
+    limit = max(1, min(request.args.get('limit', 10, type=int), MAX_LIMIT))
+
+    # 'All', empty and missing filters all mean "no filter"
+    season = season if season and season != 'All' else None
+    phase = phase if phase and phase != 'All' else None
+
+    return cached_result(('leaderboard', metric, role, season, phase, min_balls, limit),
+                         lambda: get_leaderboard(metric, role, season, phase, min_balls, limit))
@@ -0,0 +1,37 @@
+from flask import Blueprint, request
+from services.lineup_service import (
+    resolve_player, get_appearances, get_with_without, get_common_teammates, MAX_TEAMMATES, DEFAULT_TEAMMATES
+)
+from .response_cache import cached_result
+from .team_routes import standardize_team_name
+
+lineup_bp = Blueprint('lineup_bp', __name__)
+
+
+def _season():
+    season = request.args.get('season')
+    return season if season and season != 'All' else None
+
+
+@lineup_bp.route('/appearances')
+def appearances():
+    """Matches a player was in the playing XI for, e.g. ?player=MS Dhoni&season=2011"""
+    player, season = resolve_player(request.args.get('player')), _season()
+    return cached_result(('appearances', player, season), lambda: get_appearances(player, season))
+
+
+@lineup_bp.route('/with-without')
+def with_without():
+    """A team's record with and without a player in the XI, e.g. ?player=V Kohli&team=RCB"""
+    player, season = resolve_player(request.args.get('player')), _season()
+    team = request.args.get('team')
+    team = standardize_team_name(team) if team else None
+    return cached_result(('with-without', player, team, season), lambda: get_with_without(player, team, season))
+
+
+@lineup_bp.route('/common-teammates')
+def common_teammates():
+    """The players who shared the most XIs with a player."""
+    player, season = resolve_player(request.args.get('player')), _season()
+    limit = max(1, min(request.args.get('limit', DEFAULT_TEAMMATES, type=int), MAX_TEAMMATES))
+    return cached_result(('common-teammates', player, season, limit), lambda: get_common_teammates(player, season, limit))
@@ -0,0 +1,12 @@
+from flask import Blueprint, request
+from services.match_service import get_match_progression
+from .response_cache import cached_result
+
+match_bp = Blueprint('match_bp', __name__)
+
+
+@match_bp.route('/match/<int:match_id>/progression')
+def match_progression(match_id):
+    """Worm and Manhattan chart data for a match, e.g. /api/match/1312200/progression?innings=2"""
+    innings = request.args.get('innings', type=int)
+    return cached_result(('match-progression', match_id, innings), lambda: get_match_progression(match_id, innings))
@@ -1,11 +1,14 @@
-from flask import Blueprint, jsonify, request
-from services.player_service import get_batsman_summary, get_bowler_summary, get_player_runs_per_season, standardize_player_name
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, request
 from services.player_service import (
-    standardize_player_name, 
-    get_player_vs_player_stats, 
-    get_performance_by_phase
+    standardize_player_name,
+    get_batsman_summary,
+    get_bowler_summary,
+    get_player_runs_per_season,
+    get_player_vs_player_stats,
+    get_performance_by_phase,
+    get_top_matchups
 )
+from .response_cache import cached_json
 
 player_bp = Blueprint('player_bp', __name__)
 
@@ -17,11 +20,10 @@ def head_to_head():
     batsman = standardize_player_name(batsman_raw)
     bowler = standardize_player_name(bowler_raw)
     
-    stats = get_player_vs_player_stats(batsman, bowler)
-    return jsonify({
+    return cached_json(('player-head-to-head', batsman, bowler), lambda: {
         'corrected_batsman': batsman,
         'corrected_bowler': bowler,
-        'stats': stats
+        'stats': get_player_vs_player_stats(batsman, bowler)
     })
 
 @player_bp.route('/phase-analysis')
@@ -29,39 +31,43 @@ def head_to_head():
 def phase_analysis():
     player_raw = request.args.get('player')
     role = request.args.get('role')
+    season = request.args.get('season')
+    season = season if season and season != 'All' else None # Whole career by default
     
     player = standardize_player_name(player_raw)
-    stats = get_performance_by_phase(player, role)
     
-    return jsonify({
+    return cached_json(('phase-analysis', player, role, season), lambda: {
         'corrected_player': player,
         'role': role,
-        'stats': stats
+        'stats': get_performance_by_phase(player, role, season)
     })
 
 @player_bp.route('/player-stats')
 def player_stats():
     player_name_raw = request.args.get('player')
     role = request.args.get('role', 'batsman') # Default to batsman
+    role = 'batsman' if role == 'batsman' else 'bowler'
     
     player_name = standardize_player_name(player_name_raw)
     
-    if role == 'batsman':
-        summary = get_batsman_summary(player_name)
-    else:
-        summary = get_bowler_summary(player_name)
-        
-    return jsonify({
-        'corrected_name': player_name,
-        'summary': summary
-    })
+    def build():
+        if role == 'batsman':
+            summary = get_batsman_summary(player_name)
+        else:
+            summary = get_bowler_summary(player_name)
+        return {
+            'corrected_name': player_name,
+            'summary': summary
+        }
+
+    return cached_json(('player-stats', player_name, role), build)
 
 @player_bp.route('/player-runs-per-season')
 def player_runs_chart():
     player_name_raw = request.args.get('player')
     player_name = standardize_player_name(player_name_raw)
-    chart_data = get_player_runs_per_season(player_name)
-    return jsonify(chart_data)
+    return cached_json(('player-runs-per-season', player_name),
+                       lambda: get_player_runs_per_season(player_name))
 
 @player_bp.route('/player-head-to-head')
 def player_head_to_head():
@@ -73,11 +79,24 @@ def player_head_to_head():
     batsman = standardize_player_name(batsman_raw)
     bowler = standardize_player_name(bowler_raw)
     
-    # Call the correct service function from player_service
-    stats = get_player_vs_player_stats(batsman, bowler)
-    
-    return jsonify({
+    # Same payload as /head-to-head, so both routes share one cache entry
+    return cached_json(('player-head-to-head', batsman, bowler), lambda: {
         'corrected_batsman': batsman,
         'corrected_bowler': bowler,
-        'stats': stats
-    })
\ No newline at end of file
+        'stats': get_player_vs_player_stats(batsman, bowler)
+    })
+
+@player_bp.route('/top-matchups')
+def top_matchups():
+    """A batsman's toughest bowlers, or a bowler's favourite victims (role=bowler)."""
+    player_raw = request.args.get('player')
+    role = request.args.get('role', 'batsman')
+    n = max(1, min(request.args.get('n', 10, type=int), 100))
+    min_balls = max(1, request.args.get('min_balls', 12, type=int))
+
+    player = standardize_player_name(player_raw)
+    return cached_json(('top-matchups', player, role, n, min_balls), lambda: {
+        'corrected_player': player,
+        'role': role,
+        'matchups': get_top_matchups(player, role, n, min_balls)
+    })
@@ -1,9 +1,13 @@
 from flask import Blueprint, jsonify, request
-from services.model_service import predict_win_probability
+from services.model_service import predict_win_probability, predict_win_probabilities, predict_win_matrix
+from services.team_service import get_all_teams
 from .team_routes import standardize_team_name
+from .response_cache import cached_json
 
 predictor_bp = Blueprint('predictor_bp', __name__)
 
+MAX_BATCH_SIZE = 10000
+
 @predictor_bp.route('/predict')
 def predict():
     team1 = standardize_team_name(request.args.get('team1'))
@@ -22,5 +26,51 @@ def predict():
         'TossDecision': toss_decision
     }
     
-    result = predict_win_probability(prediction_data)
-    return jsonify(result)
\ No newline at end of file
+    return cached_json(('predict',) + tuple(prediction_data.values()),
+                       lambda: predict_win_probability(prediction_data))
+
+@predictor_bp.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Scores many fixtures at once. Body: {"fixtures": [{team1, team2, venue, toss_winner, toss_decision}, ...]}"""
+    payload = request.get_json(silent=True) or {}
+    fixtures = payload.get('fixtures')
+    if not isinstance(fixtures, list):
+        return jsonify({'error': "Request body must contain a 'fixtures' list"}), 400
+    if len(fixtures) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} fixtures per request'}), 400
+
+    try:
+        prediction_data = [
+            {
+                'Team1': standardize_team_name(fx['team1']),
+                'Team2': standardize_team_name(fx['team2']),
+                'Venue': fx['venue'],
+                'TossWinner': standardize_team_name(fx['toss_winner']),
+                'TossDecision': fx['toss_decision']
+            }
+            for fx in fixtures
+        ]
+    except (KeyError, TypeError, AttributeError):
+        return jsonify({'error': 'Each fixture needs team1, team2, venue, toss_winner and toss_decision'}), 400
+
+    result = predict_win_probabilities(prediction_data)
+    if isinstance(result, dict):
+        return jsonify(result)
+    return jsonify({'predictions': result})
+
+@predictor_bp.route('/predict/matrix')
+def predict_matrix():
+    """Win probabilities for every pair of teams at one venue."""
+    venue = request.args.get('venue')
+    if not venue:
+        return jsonify({'error': "Missing 'venue' parameter"}), 400
+    toss_decision = request.args.get('toss_decision')
+
+    teams_param = request.args.get('teams')
+    if teams_param:
+        teams = [standardize_team_name(t) for t in teams_param.split(',') if t.strip()]
+    else:
+        teams = get_all_teams()
+
+    return cached_json(('predict-matrix', venue, toss_decision) + tuple(teams),
+                       lambda: predict_win_matrix(teams, venue, toss_decision))
@@ -0,0 +1,56 @@
+import json
+
+from flask import Blueprint, jsonify, request
+from services.player_service import standardize_player_name
+from services.query_service import prepare_query, execute_query
+from .response_cache import cached_json
+from .team_routes import standardize_team_name
+
+query_bp = Blueprint('query_bp', __name__)
+
+# Filter values that go through the same name correction as the other endpoints
+RESOLVERS = {
+    'batter': standardize_player_name, 'bowler': standardize_player_name,
+    'batting_team': standardize_team_name, 'bowling_team': standardize_team_name,
+}
+
+
+def _standardize(spec):
+    """The spec with player and team filter values corrected to their dataset names."""
+    filters = spec.get('filters')
+    if not isinstance(filters, dict):
+        return spec
+    fixed = {}
+    for dim, values in filters.items():
+        resolve = RESOLVERS.get(dim)
+        if resolve is None:
+            fixed[dim] = values
+        elif isinstance(values, list):
+            fixed[dim] = [resolve(str(v)) for v in values]
+        else:
+            fixed[dim] = resolve(str(values))
+    return dict(spec, filters=fixed)
+
+
+@query_bp.route('/query', methods=['GET', 'POST'])
+def query():
+    """
+    Aggregates deliveries by a declarative spec, sent as the JSON body or as ?spec=<json>, e.g.
+    {"filters": {"batter": "V Kohli", "phase": "Death"}, "group_by": ["season"], "metrics": ["runs", "strike_rate"]}
+    """
+    if request.method == 'POST':
+        spec = request.get_json(silent=True)
+    else:
+        try:
+            spec = json.loads(request.args.get('spec', '{}'))
+        except ValueError:
+            return jsonify({'error': "'spec' must be JSON"}), 400
+    if not isinstance(spec, dict):
+        return jsonify({'error': 'The query must be a JSON object.'}), 400
+
+    spec = _standardize(spec)
+    query, error = prepare_query(spec)
+    if error:
+        return jsonify(error), 400
+    # Only the (cheap) validation runs before the cache lookup; the aggregation runs on a miss
+    return cached_json(('query', json.dumps(spec, sort_keys=True, default=str)), lambda: execute_query(query))
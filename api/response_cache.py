@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app, jsonify, request
+
+from services import metrics, registry
+from services.data_service import get_dataset
+from services.model_service import get_model_version
+
+# --- Cache Configuration ---
+CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+CACHE_MAX_AGE = int(os.environ.get('RESPONSE_CACHE_MAX_AGE', 300))
+# Concurrent identical requests share one computation; set COALESCE_REQUESTS=0 to turn it off
+COALESCE_REQUESTS = os.environ.get('COALESCE_REQUESTS', '1') != '0'
+
+
+class ResponseCache:
+    """A thread-safe LRU of serialized JSON bodies, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = body
+            self._size += len(body)
+            # Evict least recently used bodies until we fit again
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the leader) runs the
+    computation, the ones arriving while it runs (followers) wait for it and share its
+    result, or its exception. Nothing is kept once the computation finishes.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, compute):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            with metrics.span('coalesced_wait'):
+                flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.followers
+            return {'leaders': self.leaders, 'followers': self.followers, 'in_flight': len(self._flights),
+                    'hit_rate': self.followers / calls if calls else 0.0}
+
+
+response_cache = ResponseCache(CACHE_MAX_BYTES)
+in_flight = SingleFlight()
+# Bodies of the old data version can never be served again once a reload swaps in new data
+registry.on_swap(response_cache.clear)
+
+
+def current_version():
+    """Identifies the dataset and model every cached body was computed from."""
+    return f"{get_dataset().version}:{get_model_version()}"
+
+
+def cached_json(key, build):
+    """
+    Returns a JSON response for the canonical request 'key', computing it with 'build()'
+    only on a cache miss. Concurrent misses for the same key wait for one computation. The
+    ETag is derived from the data/model version and the key, so a matching If-None-Match is
+    answered with 304 without touching the cache at all.
+    """
+    version = current_version()
+    etag = hashlib.sha1(json.dumps([version, key], default=str).encode()).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        body = response_cache.get((version, key))
+        if body is None:
+            def render():
+                data = build()
+                with metrics.span('serialize'):
+                    rendered = jsonify(data).get_data()
+                response_cache.put((version, key), rendered)
+                return rendered
+
+            body = in_flight.do((version, key), render) if COALESCE_REQUESTS else render()
+        response = current_app.response_class(body, mimetype='application/json')
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={CACHE_MAX_AGE}'
+    return response
+
+
+class _Uncached(Exception):
+    """Carries a result out of a cached_json() build that is answered but not cached."""
+
+    def __init__(self, result, status):
+        super().__init__(result.get('error'))
+        self.result = result
+        self.status = status
+
+
+def cached_result(key, compute, keep=None):
+    """
+    cached_json() for a service call that reports bad input as an {'error': ...} dict. The call
+    runs only on a cache miss; an error is answered with 400 and never cached, and neither is a
+    result that keep(result) turns down.
+    """
+    def build():
+        result = compute()
+        if 'error' in result:
+            raise _Uncached(result, 400)
+        if keep is not None and not keep(result):
+            raise _Uncached(result, 200)
+        return result
+
+    try:
+        return cached_json(key, build)
+    except _Uncached as e:
+        return jsonify(e.result), e.status
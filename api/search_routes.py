@@ -0,0 +1,20 @@
+from flask import Blueprint, request
+from services.name_service import get_player_resolver, get_team_resolver
+from .response_cache import cached_json
+
+search_bp = Blueprint('search_bp', __name__)
+
+@search_bp.route('/suggest')
+def suggest():
+    """Autocomplete for player or team names, served from the name resolver index."""
+    query = request.args.get('q', '')
+    kind = request.args.get('type', 'player')
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+
+    kind = 'team' if kind == 'team' else 'player'
+    resolver = get_team_resolver() if kind == 'team' else get_player_resolver()
+    return cached_json(('suggest', query, kind, limit), lambda: {
+        'query': query,
+        'type': kind,
+        'suggestions': resolver.suggest(query, limit)
+    })
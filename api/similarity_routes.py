@@ -0,0 +1,24 @@
+from flask import Blueprint, jsonify, request
+from services.player_service import standardize_player_name
+from services.similarity_service import get_similar_players, DEFAULT_NEIGHBOURS, MAX_NEIGHBOURS, MAX_QUERY_PLAYERS
+from .response_cache import cached_result
+
+similarity_bp = Blueprint('similarity_bp', __name__)
+
+
+@similarity_bp.route('/similar-players')
+def similar_players():
+    """Players with the closest phase profiles, e.g. ?player=V Kohli&role=batting&min_balls=500 (player may repeat)"""
+    names = [name for name in request.args.getlist('player') if name]
+    if not names:
+        return jsonify({'error': "Missing 'player' parameter"}), 400
+    if len(names) > MAX_QUERY_PLAYERS:
+        return jsonify({'error': f'At most {MAX_QUERY_PLAYERS} players per request'}), 400
+    players = [standardize_player_name(name) for name in names]
+    role = request.args.get('role', 'batting')
+    role = {'batsman': 'batting', 'bowler': 'bowling'}.get(role, role)
+    min_balls = max(0, request.args.get('min_balls', 0, type=int))
+    limit = max(1, min(request.args.get('limit', DEFAULT_NEIGHBOURS, type=int), MAX_NEIGHBOURS))
+
+    return cached_result(('similar-players', tuple(players), role, min_balls, limit),
+                         lambda: get_similar_players(players, role, min_balls, limit))
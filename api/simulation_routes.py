@@ -0,0 +1,71 @@
+from flask import Blueprint, jsonify, request
+from services.simulation_service import (
+    simulate_season, simulate_known_season, DEFAULT_SIMULATIONS, MAX_SIMULATIONS, DEFAULT_QUALIFY
+)
+from .response_cache import cached_result
+from .team_routes import standardize_team_name
+
+simulation_bp = Blueprint('simulation_bp', __name__)
+
+MAX_FIXTURES = 200
+
+
+def _options(source):
+    simulations = max(1, min(int(source.get('simulations', DEFAULT_SIMULATIONS)), MAX_SIMULATIONS))
+    return simulations, int(source.get('qualify', DEFAULT_QUALIFY)), max(0, int(source.get('seed', 0)))
+
+
+@simulation_bp.route('/simulate-season')
+def simulate_dataset_season():
+    """Playoff odds for a season's schedule, e.g. ?season=2022&after=50 keeps the first 50 real results."""
+    season = request.args.get('season')
+    if not season:
+        return jsonify({'error': "Missing 'season' parameter"}), 400
+    after = max(0, request.args.get('after', 0, type=int))
+    try:
+        simulations, qualify, seed = _options(request.args)
+    except ValueError:
+        return jsonify({'error': "'simulations', 'qualify' and 'seed' must be integers"}), 400
+
+    # A run cut short by the time budget is answered but not cached: a later request may finish it
+    return cached_result(('simulate-season', season, after, simulations, qualify, seed),
+                         lambda: simulate_known_season(season, after, simulations, qualify, seed),
+                         keep=lambda result: not result['truncated'])
+
+
+@simulation_bp.route('/simulate-season', methods=['POST'])
+def simulate_fixture_list():
+    """
+    Playoff odds for a fixture list. Body: {"fixtures": [{team1, team2, venue, toss_winner?,
+    toss_decision?, winner?}, ...], "simulations": 100000, "qualify": 4, "seed": 0}. A fixture
+    with a 'winner' (one of its two teams, or null for no result) counts as already played.
+    """
+    payload = request.get_json(silent=True) or {}
+    fixtures = payload.get('fixtures')
+    if not isinstance(fixtures, list):
+        return jsonify({'error': "Request body must contain a 'fixtures' list"}), 400
+    if len(fixtures) > MAX_FIXTURES:
+        return jsonify({'error': f'At most {MAX_FIXTURES} fixtures per request'}), 400
+
+    try:
+        simulations, qualify, seed = _options(payload)
+        prepared = []
+        for fx in fixtures:
+            fixture = {
+                'Team1': standardize_team_name(fx['team1']),
+                'Team2': standardize_team_name(fx['team2']),
+                'Venue': fx['venue'],
+                'TossWinner': standardize_team_name(fx['toss_winner']) if fx.get('toss_winner') else None,
+                'TossDecision': fx.get('toss_decision'),
+            }
+            if 'winner' in fx:
+                fixture['Played'] = True
+                fixture['Winner'] = standardize_team_name(fx['winner']) if fx['winner'] else None
+            prepared.append(fixture)
+    except (KeyError, TypeError, AttributeError, ValueError):
+        return jsonify({'error': "Each fixture needs team1, team2 and venue; options must be integers"}), 400
+
+    result = simulate_season(prepared, simulations, qualify, seed)
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify(result)
@@ -1,11 +1,17 @@
-from flask import Blueprint, jsonify, request
-from services.venue_service import get_venue_fortress_stats
+from flask import Blueprint, request
+from services.venue_service import get_venue_fortress_stats, get_venue_fortress_matrix
 from .team_routes import standardize_team_name
+from .response_cache import cached_json
 
 venue_bp = Blueprint('venue_bp', __name__)
 
 @venue_bp.route('/venue-fortress')
 def venue_fortress():
     team_name = standardize_team_name(request.args.get('team'))
-    stats = get_venue_fortress_stats(team_name)
-    return jsonify(stats)
\ No newline at end of file
+    return cached_json(('venue-fortress', team_name), lambda: get_venue_fortress_stats(team_name))
+
+@venue_bp.route('/venue-fortress-matrix')
+def venue_fortress_matrix():
+    """Win percentage of every team at every venue, for heatmap views."""
+    min_matches = max(1, request.args.get('min_matches', 5, type=int))
+    return cached_json(('venue-fortress-matrix', min_matches), lambda: get_venue_fortress_matrix(min_matches))
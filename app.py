@@ -1,12 +1,25 @@
-from flask import Flask, render_template
+from flask import Flask, Response, render_template, jsonify, request
 import os
 
 from api.team_routes import team_bp
 from api.player_routes import player_bp
 from api.venue_routes import venue_bp
 from api.predictor import predictor_bp # Import the new blueprint
+from api.search_routes import search_bp
+from api.leaderboard_routes import leaderboard_bp
+from api.export_routes import export_bp
+from api.lineup_routes import lineup_bp
+from api.simulation_routes import simulation_bp
+from api.match_routes import match_bp
+from api.similarity_routes import similarity_bp
+from api.query_routes import query_bp
+from api.instrumentation import instrument
 
+from services import metrics, registry
 from services.team_service import get_all_teams, get_all_venues
+from services.data_service import MATCHES_CSV, DELIVERIES_CSV, RELOAD_TRIGGER
+from services.model_service import model_path, artifact_path
+from services.ingest_service import append_records
 
 # --- App & Cache Configuration ---
 app = Flask(__name__)
@@ -17,6 +30,98 @@ app.register_blueprint(team_bp, url_prefix='/api')
 app.register_blueprint(player_bp, url_prefix='/api')
 app.register_blueprint(venue_bp, url_prefix='/api')
 app.register_blueprint(predictor_bp, url_prefix='/api')
+app.register_blueprint(search_bp, url_prefix='/api')
+app.register_blueprint(leaderboard_bp, url_prefix='/api')
+app.register_blueprint(export_bp, url_prefix='/api')
+app.register_blueprint(lineup_bp, url_prefix='/api')
+app.register_blueprint(simulation_bp, url_prefix='/api')
+app.register_blueprint(match_bp, url_prefix='/api')
+app.register_blueprint(similarity_bp, url_prefix='/api')
+app.register_blueprint(query_bp, url_prefix='/api')
+
+# --- Latency metrics and Server-Timing headers for every request ---
+instrument(app)
+
+# --- One consistent snapshot per request, even across a hot reload ---
+@app.before_request
+def pin_snapshot():
+    registry.pin()
+
+@app.teardown_request
+def unpin_snapshot(exc):
+    registry.unpin()
+
+# --- Startup ---
+# Importing the app loads nothing heavy; data, indexes and the model are built by the registry.
+# WARMUP=background (default) builds them on a thread right away, WARMUP=lazy waits for the
+# first request that needs them, WARMUP=sync builds them before the import returns.
+# Process pool workers (the season simulator's) re-import a script-run app as '__mp_main__'
+# and need none of the data, so they skip the warm-up.
+WARMUP = os.environ.get('WARMUP', 'background') if __name__ != '__mp_main__' else 'lazy'
+if WARMUP == 'background':
+    registry.start_warmup()
+elif WARMUP == 'sync':
+    registry.snapshot()
+
+# --- Hot Reload ---
+# WATCH_RELOAD=1 polls the datasets and the model every RELOAD_POLL_SECONDS and swaps in
+# freshly built data once a change settles; POST /admin/reload (with ADMIN_TOKEN) triggers it.
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+if os.environ.get('WATCH_RELOAD', '0') not in ('', '0', 'false'):
+    registry.start_watching([MATCHES_CSV, DELIVERIES_CSV, model_path, artifact_path, RELOAD_TRIGGER],
+                            interval=float(os.environ.get('RELOAD_POLL_SECONDS', 2)))
+
+@app.route('/health')
+def health():
+    """Liveness: the process is up and serving, whether or not the data is loaded yet."""
+    return jsonify({'status': 'up'})
+
+@app.route('/ready')
+def ready():
+    """Readiness: 200 once the datasets, indexes and model are built, 503 until then."""
+    status = registry.status()
+    return jsonify(status), (200 if status['state'] == 'ready' else 503)
+
+def admin_denied():
+    """The error response for an admin request without the right token, or None if it may proceed."""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Admin endpoints are disabled (ADMIN_TOKEN is not set).'}), 404
+    if request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({'error': 'Invalid admin token.'}), 403
+    return None
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Rebuilds the data, indexes and model off the request path and swaps them in."""
+    denied = admin_denied()
+    if denied:
+        return denied
+
+    if registry.is_watching():
+        # Every worker watches the trigger file, so touching it reloads all of them
+        with open(RELOAD_TRIGGER, 'a'):
+            os.utime(RELOAD_TRIGGER)
+    else:
+        registry.reload_async()
+    return jsonify({'status': 'reloading', 'generation': registry.status()['generation']}), 202
+
+@app.route('/admin/ingest', methods=['POST'])
+def admin_ingest():
+    """Appends new matches and deliveries (JSON records in the CSV schemas) and updates the indexes."""
+    denied = admin_denied()
+    if denied:
+        return denied
+
+    body = request.get_json(silent=True) or {}
+    result = append_records(body.get('matches'), body.get('deliveries'))
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request and service latency histograms, in the Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 # --- Main Route ---
 @app.route('/')
@@ -0,0 +1,217 @@
+"""
+Generates synthetic IPL datasets in the same CSV schemas as data/, scaled up from the real ones.
+
+Matches are drawn from the real matches file as templates (teams, venue, season, playing XIs,
+umpires); every innings is then simulated ball by ball from the per-phase outcome distribution
+of the real deliveries (or built-in IPL-like rates when the ball-by-ball file isn't present).
+The simulation is vectorized over whole chunks of innings, so 100x scale stays practical.
+
+    python -m benchmarks.generate_data --scale 10 --out bench_data/x10
+"""
+import argparse
+import ast
+import os
+
+import numpy as np
+import pandas as pd
+
+SOURCE_DIR = 'data'
+MATCHES_FILE = 'IPL_Matches_2008_2022.csv'
+DELIVERIES_FILE = 'IPL_Ball_by_Ball_2008_2022.csv'
+DELIVERY_COLUMNS = ['ID', 'innings', 'overs', 'ballnumber', 'batter', 'bowler', 'non-striker',
+                    'extra_type', 'batsman_run', 'extras_run', 'total_run', 'non_boundary',
+                    'isWicketDelivery', 'player_out', 'kind', 'fielders_involved', 'BattingTeam']
+
+PHASE_BOUNDS = [6, 15]  # Powerplay: overs 0-5, Middle: 6-14, Death: 15-19
+SLOTS = 140             # deliveries simulated per innings (120 legal balls plus extras)
+CHUNK_MATCHES = 2000
+
+# (extra_type, batsman_run, extras_run, isWicketDelivery) -> rate per phase, used when the
+# real ball-by-ball file isn't available.
+DEFAULT_OUTCOMES = {
+    (None, 0, 0, 0): (0.40, 0.35, 0.33),
+    (None, 1, 0, 0): (0.29, 0.39, 0.33),
+    (None, 2, 0, 0): (0.05, 0.07, 0.08),
+    (None, 3, 0, 0): (0.003, 0.004, 0.003),
+    (None, 4, 0, 0): (0.14, 0.09, 0.11),
+    (None, 6, 0, 0): (0.035, 0.045, 0.075),
+    (None, 0, 0, 1): (0.042, 0.048, 0.075),
+    ('wides', 0, 1, 0): (0.035, 0.03, 0.035),
+    ('noballs', 0, 1, 0): (0.004, 0.004, 0.005),
+    ('legbyes', 0, 1, 0): (0.017, 0.015, 0.018),
+    ('byes', 0, 1, 0): (0.003, 0.003, 0.003),
+}
+WICKET_KINDS = ['caught', 'bowled', 'lbw', 'run out', 'caught and bowled', 'stumped']
+WICKET_KIND_RATES = [0.61, 0.17, 0.09, 0.08, 0.03, 0.02]
+
+
+def outcome_table(source_dir):
+    """Returns the outcome table and its per-phase probabilities, learnt from the real deliveries if present."""
+    path = os.path.join(source_dir, DELIVERIES_FILE)
+    if not os.path.exists(path):
+        outcomes = list(DEFAULT_OUTCOMES)
+        probs = np.array([DEFAULT_OUTCOMES[o] for o in outcomes]).T
+    else:
+        deliveries = pd.read_csv(path, usecols=['overs', 'extra_type', 'batsman_run', 'extras_run', 'isWicketDelivery'])
+        deliveries['phase'] = np.searchsorted(PHASE_BOUNDS, deliveries['overs'], side='right')
+        deliveries['extra_type'] = deliveries['extra_type'].astype(object).where(deliveries['extra_type'].notna(), None)
+        counts = (deliveries.groupby(['extra_type', 'batsman_run', 'extras_run', 'isWicketDelivery', 'phase'], dropna=False)
+                  .size().unstack('phase', fill_value=0))
+        outcomes = [tuple(None if pd.isna(v) else v for v in key) for key in counts.index]
+        probs = counts.to_numpy(dtype=float).T
+
+    probs = probs / probs.sum(axis=1, keepdims=True)
+    table = pd.DataFrame(outcomes, columns=['extra_type', 'batsman_run', 'extras_run', 'isWicketDelivery'])
+    return table, probs
+
+
+def _load_templates(source_dir):
+    matches = pd.read_csv(os.path.join(source_dir, MATCHES_FILE))
+    # Playing XIs as an (n_matches, 2, 11) array of names
+    xis = np.array([
+        [(ast.literal_eval(t1) + [''] * 11)[:11], (ast.literal_eval(t2) + [''] * 11)[:11]]
+        for t1, t2 in zip(matches['Team1Players'], matches['Team2Players'])
+    ], dtype=object)
+    return matches, xis
+
+
+def _simulate_chunk(rng, templates, xis, first_id, table, probs):
+    """Simulates one chunk of matches; returns (matches, deliveries) DataFrames."""
+    n = len(templates)
+    team1 = templates['Team1'].to_numpy(dtype=object)
+    team2 = templates['Team2'].to_numpy(dtype=object)
+
+    # --- Toss and batting order ---
+    toss_t1 = rng.random(n) < 0.5
+    bat = rng.random(n) < 0.45
+    toss_winner = np.where(toss_t1, team1, team2)
+    t1_bats_first = toss_t1 == bat
+    batting_side = np.stack([np.where(t1_bats_first, 0, 1), np.where(t1_bats_first, 1, 0)], axis=1).ravel()
+    match_of_innings = np.repeat(np.arange(n), 2)
+
+    # --- Ball outcomes for every innings slot, sampled from the phase distribution ---
+    innings_count = 2 * n
+    slot_over = np.arange(SLOTS) * 20 // 126
+    slot_phase = np.searchsorted(PHASE_BOUNDS, slot_over, side='right')
+    u = rng.random((innings_count, SLOTS))
+    outcome = np.empty((innings_count, SLOTS), dtype=np.int64)
+    cdf = np.cumsum(probs, axis=1)
+    for phase in range(len(cdf)):
+        cols = slot_phase == phase
+        outcome[:, cols] = np.minimum(np.searchsorted(cdf[phase], u[:, cols]), len(table) - 1)
+
+    extra_type = table['extra_type'].to_numpy(dtype=object)[outcome]
+    batsman_run = table['batsman_run'].to_numpy()[outcome]
+    extras_run = table['extras_run'].to_numpy()[outcome]
+    wicket = table['isWicketDelivery'].to_numpy()[outcome]
+    total_run = batsman_run + extras_run
+    legal = ~np.isin(extra_type, ['wides', 'noballs'])
+
+    legal_before = np.cumsum(legal, axis=1) - legal
+    over = legal_before // 6
+    wickets_before = np.cumsum(wicket, axis=1) - wicket
+    runs_before = np.cumsum(total_run, axis=1) - total_run
+    valid = (over < 20) & (wickets_before < 10)
+
+    # The chase stops on the ball that passes the first-innings total
+    first_totals = (total_run * valid)[0::2].sum(axis=1)
+    valid[1::2] &= runs_before[1::2] <= first_totals[:, None]
+    totals = (total_run * valid).sum(axis=1)
+    wickets_lost = (wicket * valid).sum(axis=1)
+
+    # --- Who is on strike: batting order advances on wickets, strike rotates on odd runs and over ends ---
+    odd_before = np.cumsum(batsman_run % 2, axis=1) - batsman_run % 2
+    strike = (odd_before + over) % 2
+    striker_pos = np.minimum(wickets_before + strike, 10)
+    non_striker_pos = np.minimum(wickets_before + 1 - strike, 10)
+    bowler_pos = 10 - over % 5
+
+    rows, cols = np.nonzero(valid)
+    innings_match = match_of_innings[rows]
+    template_idx = templates.index.to_numpy()[innings_match]
+    bat_side = batting_side[rows]
+    batting_xi = xis[template_idx, bat_side]
+    bowling_xi = xis[template_idx, 1 - bat_side]
+    batter = batting_xi[np.arange(len(rows)), striker_pos[rows, cols]]
+    non_striker = batting_xi[np.arange(len(rows)), non_striker_pos[rows, cols]]
+    bowler = bowling_xi[np.arange(len(rows)), bowler_pos[rows, cols]]
+    is_wicket = wicket[rows, cols]
+    kinds = np.array(WICKET_KINDS, dtype=object)[rng.choice(len(WICKET_KINDS), len(rows), p=WICKET_KIND_RATES)]
+
+    ids = first_id + np.arange(n)
+    deliveries = pd.DataFrame({
+        'ID': ids[innings_match],
+        'innings': rows % 2 + 1,
+        'overs': over[rows, cols],
+        'ballnumber': 0,
+        'batter': batter,
+        'bowler': bowler,
+        'non-striker': non_striker,
+        'extra_type': extra_type[rows, cols],
+        'batsman_run': batsman_run[rows, cols],
+        'extras_run': extras_run[rows, cols],
+        'total_run': total_run[rows, cols],
+        'non_boundary': 0,
+        'isWicketDelivery': is_wicket,
+        'player_out': np.where(is_wicket == 1, batter, None),
+        'kind': np.where(is_wicket == 1, kinds, None),
+        'fielders_involved': None,
+        'BattingTeam': np.where(bat_side == 0, team1[innings_match], team2[innings_match]),
+    })
+    deliveries['ballnumber'] = deliveries.groupby(['ID', 'innings', 'overs']).cumcount() + 1
+
+    # --- Match results from the simulated totals ---
+    first, second = totals[0::2], totals[1::2]
+    first_team = np.where(t1_bats_first, team1, team2)
+    second_team = np.where(t1_bats_first, team2, team1)
+    tie = first == second
+    chase_won = second > first
+    tie_winner = np.where(rng.random(n) < 0.5, first_team, second_team)
+    winner = np.where(tie, tie_winner, np.where(chase_won, second_team, first_team))
+    winner_side = np.where(winner == team1, 0, 1)
+    mom = xis[templates.index.to_numpy(), winner_side, rng.integers(0, 11, n)]
+
+    matches = templates.copy()
+    matches['ID'] = ids
+    matches['TossWinner'] = toss_winner
+    matches['TossDecision'] = np.where(bat, 'bat', 'field')
+    matches['SuperOver'] = np.where(tie, 'Y', 'N')
+    matches['WinningTeam'] = winner
+    matches['WonBy'] = np.where(tie, 'SuperOver', np.where(chase_won, 'Wickets', 'Runs'))
+    matches['Margin'] = np.where(tie, np.nan, np.where(chase_won, 10 - wickets_lost[1::2], first - second)).astype(float)
+    matches['method'] = np.nan
+    matches['Player_of_Match'] = mom
+    return matches, deliveries[DELIVERY_COLUMNS]
+
+
+def generate(scale, out_dir, source_dir=SOURCE_DIR, seed=42):
+    """Writes scale x (number of real matches) synthetic matches and their deliveries to 'out_dir'."""
+    rng = np.random.default_rng(seed)
+    templates, xis = _load_templates(source_dir)
+    table, probs = outcome_table(source_dir)
+    total = int(round(len(templates) * scale))
+
+    os.makedirs(out_dir, exist_ok=True)
+    matches_path = os.path.join(out_dir, MATCHES_FILE)
+    deliveries_path = os.path.join(out_dir, DELIVERIES_FILE)
+    delivery_rows = 0
+    for start in range(0, total, CHUNK_MATCHES):
+        n = min(CHUNK_MATCHES, total - start)
+        chunk_templates = templates.iloc[rng.integers(0, len(templates), n)]
+        matches, deliveries = _simulate_chunk(rng, chunk_templates.reset_index(drop=False).set_index('index'),
+                                              xis, 10_000_000 + start, table, probs)
+        header = start == 0
+        matches.to_csv(matches_path, mode='w' if header else 'a', header=header, index=False)
+        deliveries.to_csv(deliveries_path, mode='w' if header else 'a', header=header, index=False)
+        delivery_rows += len(deliveries)
+    return {'matches': total, 'deliveries': delivery_rows}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate synthetic IPL datasets at a given scale.")
+    parser.add_argument('--scale', type=float, default=1, help="Multiple of the real number of matches")
+    parser.add_argument('--out', required=True, help="Output directory for the two CSV files")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    counts = generate(args.scale, args.out, seed=args.seed)
+    print(f"Wrote {counts['matches']} matches and {counts['deliveries']} deliveries to {args.out}")
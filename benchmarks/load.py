@@ -0,0 +1,145 @@
+"""
+Load test for request coalescing: starts gunicorn with the repo's gunicorn.conf.py, sends a
+burst of identical "trending" queries from many concurrent clients, and reports throughput,
+latency and the coalesce hit rate for each configuration.
+
+    python -m benchmarks.load --scale 10 --threads 1 4 --clients 16 --duration 10
+
+Every configuration runs with the response cache disabled, so each request that isn't
+coalesced does its real work. By default it compares threads x (coalescing off, on). The hit
+rate comes from /metrics, so use one worker (the default) to read all of it from one scrape.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from .run import _data_dir, DEFAULT_DATA_ROOT
+
+# The same few queries, as when one matchup is trending
+TRENDING = [
+    ('/api/team-head-to-head', {'team1': 'Chennai Super Kings', 'team2': 'Mumbai Indians', 'season': 'All'}),
+    ('/api/player-stats', {'player': 'V Kohli', 'role': 'batsman'}),
+    ('/api/player-runs-per-season', {'player': 'V Kohli'}),
+    ('/api/head-to-head', {'batsman': 'V Kohli', 'bowler': 'JJ Bumrah'}),
+]
+
+
+def _get(url, timeout=30):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def _serve(data_dir, port, workers, threads, coalesce):
+    env = dict(os.environ, IPL_DATA_DIR=data_dir, RESPONSE_CACHE_MAX_BYTES='0', WEB_CONCURRENCY=str(workers),
+               GUNICORN_THREADS=str(threads), COALESCE_REQUESTS='1' if coalesce else '0')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                               '-b', f'127.0.0.1:{port}', 'app:app'],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        try:
+            if _get(f'http://127.0.0.1:{port}/ready', timeout=2)[0] == 200:
+                return server
+        except OSError:
+            pass
+        if server.poll() is not None:
+            raise SystemExit(f"Error: gunicorn exited with code {server.returncode}")
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("Error: gunicorn did not become ready in time")
+
+
+def _load(port, clients, duration):
+    """Each client cycles through the trending queries until 'duration' is up."""
+    urls = [f'http://127.0.0.1:{port}{path}?{urllib.parse.urlencode(params)}' for path, params in TRENDING]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(offset):
+        mine, failed, i = [], 0, offset
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                _get(urls[i % len(urls)])
+                mine.append(time.perf_counter() - start)
+            except OSError:
+                failed += 1
+            i += 1
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p99_ms': round(latencies[int(0.99 * (len(latencies) - 1))] * 1000, 2) if latencies else None,
+    }
+
+
+def _coalescing(port):
+    """The ipl_coalesce_* samples of one worker's /metrics."""
+    text = _get(f'http://127.0.0.1:{port}/metrics')[1].decode()
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('ipl_coalesce_'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the coalescing of identical concurrent requests.")
+    parser.add_argument('--scale', type=float, default=1, help="Dataset size as a multiple of the real one")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4], help="GUNICORN_THREADS values to try")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--clients', type=int, default=16, help="Concurrent clients")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds of load per configuration")
+    parser.add_argument('--port', type=int, default=8131)
+    parser.add_argument('--data-root', default=DEFAULT_DATA_ROOT)
+    parser.add_argument('--report', help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    data_dir = _data_dir(args.scale, args.data_root)
+    results = []
+    for threads in args.threads:
+        for coalesce in (False, True):
+            server = _serve(data_dir, args.port, args.workers, threads, coalesce)
+            try:
+                result = {'threads': threads, 'coalesce': coalesce, **_load(args.port, args.clients, args.duration)}
+                samples = _coalescing(args.port)
+                result['coalesce_hit_ratio'] = samples.get('ipl_coalesce_hit_ratio', 0.0)
+            finally:
+                server.terminate()
+                server.wait()
+            results.append(result)
+            print(f"threads={threads:<3} coalesce={'on ' if coalesce else 'off'}  {result['throughput_rps']:>8.1f} req/s"
+                  f"   p50 {result['p50_ms']:>8.2f} ms   p99 {result['p99_ms']:>8.2f} ms"
+                  f"   hit rate {result['coalesce_hit_ratio']:.1%}   errors {result['errors']}", file=sys.stderr)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'scale': args.scale, 'workers': args.workers, 'clients': args.clients,
+                       'duration': args.duration, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+Benchmarks the service functions and API endpoints against the real dataset and synthetic
+copies scaled up from it (see generate_data.py), and writes a JSON report that two commits
+can be compared on.
+
+    python -m benchmarks.run --scales 1 10 --report bench_report.json
+    python -m benchmarks.run --compare before.json after.json
+
+Every scale runs in its own subprocess (pointed at its data with IPL_DATA_DIR), so startup
+times, imports and peak RSS are measured from a clean interpreter. Each scale is started
+twice: once 'cold' with the binary snapshot deleted (CSV parse + snapshot write) and once
+'warm' from the snapshot, which then runs the timed benchmarks. The response cache is
+disabled so every endpoint call does its real work.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .generate_data import generate, MATCHES_FILE, DELIVERIES_FILE
+
+DEFAULT_DATA_ROOT = 'bench_data'
+SAMPLE_SIZE = 40  # distinct seeded inputs per benchmark, cycled through the timed calls
+
+
+# --- Benchmark definitions (run inside the worker) ---
+
+def _sample_inputs(seed):
+    from services.data_service import get_dataset
+    from services.team_service import get_all_teams, get_all_venues
+
+    rng = random.Random(seed)
+    dataset = get_dataset()
+    batters = sorted(dataset.deliveries['batter'].value_counts().head(300).index)
+    bowlers = sorted(dataset.deliveries['bowler'].value_counts().head(300).index)
+    teams = get_all_teams()
+    venues = get_all_venues()
+    return {
+        'batters': [rng.choice(batters) for _ in range(SAMPLE_SIZE)],
+        'bowlers': [rng.choice(bowlers) for _ in range(SAMPLE_SIZE)],
+        'team_pairs': [tuple(rng.sample(teams, 2)) for _ in range(SAMPLE_SIZE)],
+        'teams': [rng.choice(teams) for _ in range(SAMPLE_SIZE)],
+        'venues': [rng.choice(venues) for _ in range(SAMPLE_SIZE)],
+        'seasons': [rng.choice(['All', '2012', '2018', '2022']) for _ in range(SAMPLE_SIZE)],
+    }
+
+
+def _benchmarks(inputs, client):
+    """Returns {name: [zero-argument callables]}, one callable per sampled input."""
+    from services.player_service import (
+        get_batsman_summary, get_bowler_summary, get_performance_by_phase,
+        get_player_runs_per_season, get_player_vs_player_stats
+    )
+    from services.team_service import get_advanced_head_to_head
+    from services.venue_service import get_venue_fortress_stats
+
+    def get(url, **params):
+        def call():
+            response = client.get(url, query_string=params)
+            assert response.status_code == 200, (url, params, response.status_code)
+        return call
+
+    batters, bowlers, pairs = inputs['batters'], inputs['bowlers'], inputs['team_pairs']
+    teams, venues, seasons = inputs['teams'], inputs['venues'], inputs['seasons']
+    return {
+        'service.get_batsman_summary': [lambda p=p: get_batsman_summary(p) for p in batters],
+        'service.get_bowler_summary': [lambda p=p: get_bowler_summary(p) for p in bowlers],
+        'service.get_player_runs_per_season': [lambda p=p: get_player_runs_per_season(p) for p in batters],
+        'service.get_player_vs_player_stats': [lambda b=b, w=w: get_player_vs_player_stats(b, w)
+                                               for b, w in zip(batters, bowlers)],
+        'service.get_performance_by_phase': [lambda p=p: get_performance_by_phase(p, 'batsman') for p in batters],
+        'service.get_advanced_head_to_head': [lambda t=t, s=s: get_advanced_head_to_head(t[0], t[1], s, None)
+                                              for t, s in zip(pairs, seasons)],
+        'service.get_venue_fortress_stats': [lambda t=t: get_venue_fortress_stats(t) for t in teams],
+        'api.player-stats': [get('/api/player-stats', player=p, role='batsman') for p in batters],
+        'api.phase-analysis': [get('/api/phase-analysis', player=p, role='bowler') for p in bowlers],
+        'api.head-to-head': [get('/api/head-to-head', batsman=b, bowler=w) for b, w in zip(batters, bowlers)],
+        'api.team-head-to-head': [get('/api/team-head-to-head', team1=t[0], team2=t[1], season=s)
+                                  for t, s in zip(pairs, seasons)],
+        'api.venue-fortress': [get('/api/venue-fortress', team=t) for t in teams],
+        'api.leaderboard': [get('/api/leaderboard', metric='economy', role='bowling', season=s, phase='Death',
+                                min_balls=60) for s in seasons],
+        'api.predict': [get('/api/predict', team1=t[0], team2=t[1], venue=v, toss_winner=t[0], toss_decision='bat')
+                        for t, v in zip(pairs, venues)],
+    }
+
+
+def _time_calls(calls, repeat):
+    """Times 'repeat' calls cycling through 'calls'; returns summary stats in milliseconds."""
+    for call in calls[:3]:
+        call()  # warm any per-input caches the way a live server would have them
+    samples = []
+    for i in range(repeat):
+        call = calls[i % len(calls)]
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'calls': repeat,
+        'min_ms': round(samples[0], 4),
+        'median_ms': round(statistics.median(samples), 4),
+        'p95_ms': round(samples[int(0.95 * (len(samples) - 1))], 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+    }
+
+
+def _peak_alloc_kib(calls):
+    """Largest peak of Python allocations over one pass of the calls (tracemalloc, so untimed)."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for call in calls[:10]:
+            tracemalloc.reset_peak()
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def _worker(args):
+    """Runs inside the per-scale subprocess; prints the scale's results as JSON on stdout."""
+    # The app's own startup messages go to stderr so stdout carries only the result
+    with contextlib.redirect_stdout(sys.stderr):
+        result = _measure(args)
+    json.dump(result, sys.stdout)
+
+
+def _measure(args):
+    start = time.perf_counter()
+    from app import app
+    from services import registry
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    registry.snapshot()
+    startup = {'import_s': round(import_s, 4), 'warmup_s': round(time.perf_counter() - start, 4),
+               'phases': registry.status()['timings']}
+
+    from services.data_service import get_dataset
+    dataset = get_dataset()
+    result = {
+        'rows': {'matches': len(dataset.matches), 'deliveries': len(dataset.deliveries)},
+        'startup': startup,
+        'memory': {'frames_mib': round((dataset.matches.memory_usage(deep=True).sum() +
+                                        dataset.deliveries.memory_usage(deep=True).sum()) / 2**20, 1)},
+    }
+
+    if not args.startup_only:
+        benchmarks = _benchmarks(_sample_inputs(args.seed), app.test_client())
+        result['benchmarks'] = {}
+        for name, calls in benchmarks.items():
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+            stats = _time_calls(calls, args.repeat)
+            stats['peak_alloc_kib'] = _peak_alloc_kib(calls)
+            result['benchmarks'][name] = stats
+            print(f"  {name:<40} median {stats['median_ms']:>9.3f} ms   p95 {stats['p95_ms']:>9.3f} ms",
+                  file=sys.stderr)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result['memory']['peak_rss_mib'] = round(maxrss / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+    return result
+
+
+# --- Orchestration ---
+
+def _data_dir(scale, data_root):
+    """The real dataset for scale 1, a generated copy for anything else."""
+    if scale == 1:
+        return 'data'
+    data_dir = os.path.join(data_root, f"x{scale:g}")
+    if not all(os.path.exists(os.path.join(data_dir, f)) for f in (MATCHES_FILE, DELIVERIES_FILE)):
+        print(f"Generating {scale:g}x dataset in {data_dir} ...", file=sys.stderr)
+        counts = generate(scale, data_dir)
+        print(f"  {counts['matches']} matches, {counts['deliveries']} deliveries", file=sys.stderr)
+    return data_dir
+
+
+def _run_worker(data_dir, args, startup_only):
+    env = dict(os.environ, IPL_DATA_DIR=data_dir, WARMUP='lazy', RESPONSE_CACHE_MAX_BYTES='0')
+    command = [sys.executable, '-m', 'benchmarks.run', '--worker', '--repeat', str(args.repeat),
+               '--seed', str(args.seed)]
+    if startup_only:
+        command.append('--startup-only')
+    if args.only:
+        command += ['--only'] + args.only
+    completed = subprocess.run(command, env=env, stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout)
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    report = {
+        'commit': _commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'scales': {},
+    }
+    for scale in args.scales:
+        data_dir = _data_dir(scale, args.data_root)
+        print(f"Scale {scale:g}x ({data_dir})", file=sys.stderr)
+        shutil.rmtree(os.path.join(data_dir, '.snapshot'), ignore_errors=True)
+        cold = _run_worker(data_dir, args, startup_only=True)
+        warm = _run_worker(data_dir, args, startup_only=False)
+        report['scales'][f"{scale:g}"] = {
+            'rows': warm['rows'],
+            'startup': {'cold': cold['startup'], 'warm': warm['startup']},
+            'memory': {'cold_peak_rss_mib': cold['memory']['peak_rss_mib'], **warm['memory']},
+            'benchmarks': warm['benchmarks'],
+        }
+
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.report}", file=sys.stderr)
+
+
+def compare(before_path, after_path):
+    """Prints the per-benchmark change in median latency between two reports."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"before: {before.get('commit')}  after: {after.get('commit')}")
+    for scale, new in after['scales'].items():
+        old = before['scales'].get(scale)
+        if old is None:
+            continue
+        print(f"\nScale {scale}x")
+        rows = [('startup.cold', old['startup']['cold']['warmup_s'] * 1000, new['startup']['cold']['warmup_s'] * 1000),
+                ('startup.warm', old['startup']['warm']['warmup_s'] * 1000, new['startup']['warm']['warmup_s'] * 1000)]
+        rows += [(name, old['benchmarks'][name]['median_ms'], stats['median_ms'])
+                 for name, stats in new['benchmarks'].items() if name in old['benchmarks']]
+        for name, old_ms, new_ms in rows:
+            ratio = old_ms / new_ms if new_ms else float('inf')
+            print(f"  {name:<40} {old_ms:>10.3f} ms -> {new_ms:>10.3f} ms   {ratio:>7.2f}x")
+        print(f"  {'memory.peak_rss':<40} {old['memory']['peak_rss_mib']:>10.1f} MiB -> "
+              f"{new['memory']['peak_rss_mib']:>9.1f} MiB")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the IPL services and endpoints.")
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100],
+                        help="Dataset sizes as multiples of the real one (default: 1 10 100)")
+    parser.add_argument('--repeat', type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument('--seed', type=int, default=7, help="Seed for the sampled inputs")
+    parser.add_argument('--only', nargs='+', help="Run only benchmarks whose name contains one of these")
+    parser.add_argument('--data-root', default=DEFAULT_DATA_ROOT, help="Where generated datasets are kept")
+    parser.add_argument('--report', default='bench_report.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="Compare two reports")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--startup-only', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    elif args.worker:
+        _worker(args)
+    else:
+        run(args)
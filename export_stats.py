@@ -0,0 +1,32 @@
+import argparse
+import contextlib
+import sys
+
+from services import registry
+from services.export_service import stream_export, EXPORT_FORMATS, EXPORT_KINDS
+
+# Writes the same bulk export as /api/export, without running the server:
+#   python export_stats.py --format csv --kind players --out players.csv
+
+parser = argparse.ArgumentParser(description="Export stats for every player and team.")
+parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+parser.add_argument('--kind', choices=EXPORT_KINDS, default=None,
+                    help="players, teams or all (default: all for NDJSON, players for CSV)")
+parser.add_argument('--out', help="Output file (default: stdout)")
+args = parser.parse_args()
+
+kind = args.kind or ('all' if args.format == 'ndjson' else 'players')
+# Load up front, keeping the startup message off stdout (which may be the export itself)
+with contextlib.redirect_stdout(sys.stderr):
+    registry.snapshot()
+chunks = stream_export(args.format, kind)
+if isinstance(chunks, dict):
+    sys.exit(f"Error: {chunks['error']}")
+
+out = open(args.out, 'w', newline='') if args.out else sys.stdout
+try:
+    for chunk in chunks:
+        out.write(chunk)
+finally:
+    if args.out:
+        out.close()
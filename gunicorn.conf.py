@@ -0,0 +1,27 @@
+import gc
+import os
+
+# --- Gunicorn Configuration ---
+# Load the app (datasets, derived indexes and model) once in the master and fork the workers
+# from it, so they share those pages copy-on-write instead of each holding a private copy.
+# Set GUNICORN_PRELOAD=0 to go back to loading the app separately in every worker.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Threads per worker. The default of 1 is the sync worker. More threads (the gthread worker) let
+# concurrent identical requests in one worker share a single computation (see COALESCE_REQUESTS),
+# but pay for GIL contention on traffic that doesn't overlap, so they are opt-in.
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+# Loading is done before the fork, but a lazily loaded worker on a small box can take a while
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def when_ready(server):
+    # Runs in the master after the preload and before any worker is forked. With preload the
+    # warm-up thread started by app.py runs in the master, so wait for it here: the workers then
+    # inherit the built data instead of each loading their own copy. Freezing moves
+    # every object allocated so far out of the garbage collector's reach, so collections in the
+    # workers don't write to (and thereby un-share) the pages holding the loaded data.
+    if preload_app:
+        from services import registry
+        registry.wait_until_ready()
+    gc.freeze()
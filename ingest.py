@@ -0,0 +1,33 @@
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+# Registers every component, so each derived index is updated (or checked) with the data
+from services import registry, team_service, name_service, model_service, player_service, venue_service  # noqa: F401
+from services import leaderboard_service  # noqa: F401
+from services.ingest_service import append_rows, compare_with_rebuild
+
+# Appends new matches and their deliveries to the datasets and updates the derived indexes
+# incrementally, without running the server:
+#   python ingest.py --matches new_matches.csv --deliveries new_deliveries.csv --verify
+
+parser = argparse.ArgumentParser(description="Append new matches and deliveries to the datasets.")
+parser.add_argument('--matches', required=True, help="CSV of new matches, in the IPL_Matches schema")
+parser.add_argument('--deliveries', required=True, help="CSV of their deliveries, in the IPL_Ball_by_Ball schema")
+parser.add_argument('--verify', action='store_true',
+                    help="Afterwards, check every updated index against a full rebuild from the CSVs")
+args = parser.parse_args()
+
+registry.snapshot()
+result = append_rows(pd.read_csv(args.matches), pd.read_csv(args.deliveries))
+if 'error' in result:
+    sys.exit(f"Error: {result['error']}")
+print(json.dumps(result, indent=2))
+
+if args.verify:
+    different = compare_with_rebuild()
+    if different:
+        sys.exit(f"Error: Incremental update differs from a full rebuild in: {', '.join(different)}")
+    print("Consistency check passed: the incremental update matches a full rebuild.")
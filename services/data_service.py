@@ -1,35 +1,190 @@
+import os
+
+import numpy as np
 import pandas as pd
 
-def load_data():
-    """Loads and preprocesses the IPL datasets."""
-    try:
-        matches = pd.read_csv('data/IPL_Matches_2008_2022.csv')
-        deliveries = pd.read_csv('data/IPL_Ball_by_Ball_2008_2022.csv')
-    except FileNotFoundError:
-        print("Error: Dataset files not found. Make sure they are in the 'data/' directory.")
-        return None, None, None # Return three Nones
+from . import registry
+from .snapshot_service import source_hash, read_snapshot, write_snapshot
+
+# IPL_DATA_DIR points the app at another copy of the datasets (e.g. the benchmark's synthetic ones)
+DATA_DIR = os.environ.get('IPL_DATA_DIR', 'data')
+MATCHES_CSV = os.path.join(DATA_DIR, 'IPL_Matches_2008_2022.csv')
+DELIVERIES_CSV = os.path.join(DATA_DIR, 'IPL_Ball_by_Ball_2008_2022.csv')
+SNAPSHOT_ROOT = os.path.join(DATA_DIR, '.snapshot')
+# Touched by the admin reload endpoint so every worker's file watcher picks the reload up
+RELOAD_TRIGGER = os.path.join(DATA_DIR, '.reload')
+
+# Columns that hold the same kind of name share one dictionary, so their integer codes are
+# directly comparable (e.g. player_out == batter compares codes, not strings).
+PLAYER_COLUMNS = {'deliveries': ['batter', 'bowler', 'non-striker', 'player_out'], 'matches': ['Player_of_Match']}
+TEAM_COLUMNS = {'deliveries': ['BattingTeam', 'BowlingTeam'],
+                'matches': ['Team1', 'Team2', 'TossWinner', 'WinningTeam']}
+
+# Innings phases by (0-based) over: Powerplay 0-5, Middle 6-14, Death 15-19
+PHASES = ['Powerplay', 'Middle', 'Death']
+PHASE_START_OVERS = [6, 15]
+LAST_OVER = 19
+
+
+def encode_categoricals(frames):
+    """
+    Converts the string columns of the frames to categoricals in place. Player and team
+    columns use shared dictionaries; other low-cardinality string columns get their own.
+    High-cardinality ones (dates, playing XIs) stay as plain strings.
+    """
+    for shared in (PLAYER_COLUMNS, TEAM_COLUMNS):
+        values = pd.concat([frames[name][col] for name, cols in shared.items() for col in cols])
+        dtype = pd.CategoricalDtype(sorted(values.dropna().unique()))
+        for name, cols in shared.items():
+            for col in cols:
+                frames[name][col] = frames[name][col].astype(dtype)
+
+    for df in frames.values():
+        for col in df.columns:
+            if df[col].dtype == object and df[col].nunique() <= len(df) // 2:
+                df[col] = df[col].astype('category')
+    return frames
+
+
+def _extended_dtype(dtype, values):
+    """'dtype' with any new 'values' added, keeping the categories sorted as a full load would."""
+    new = pd.Index(values).dropna().unique().difference(dtype.categories)
+    if len(new) == 0:
+        return dtype
+    return pd.CategoricalDtype(sorted(dtype.categories.tolist() + new.tolist()))
+
+
+def append_frames(frames, new_frames):
+    """
+    Returns each frame with its new rows appended. The new rows are encoded with the existing
+    dictionaries, extended with any names they introduce, so codes stay comparable across the
+    old and new rows and between columns sharing a dictionary. Also returns the encoded new rows.
+    """
+    dtypes = {}
+    for shared in (PLAYER_COLUMNS, TEAM_COLUMNS):
+        dtype = frames['deliveries'][shared['deliveries'][0]].dtype
+        for name, cols in shared.items():
+            for col in cols:
+                dtype = _extended_dtype(dtype, new_frames[name][col])
+        dtypes.update({(name, col): dtype for name, cols in shared.items() for col in cols})
+
+    merged, encoded = {}, {}
+    for name, df in frames.items():
+        old, new = df.copy(deep=False), new_frames[name][df.columns].copy()
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                dtype = dtypes.get((name, col)) or _extended_dtype(df[col].dtype, new[col])
+                if dtype != df[col].dtype:
+                    old[col] = old[col].astype(dtype)  # recodes the codes, not the strings
+                new[col] = new[col].astype(dtype)
+        new.index = pd.RangeIndex(len(old), len(old) + len(new))
+        merged[name] = pd.concat([old, new])
+        encoded[name] = new
+    return merged, encoded
+
+
+def category_code(series, value):
+    """Returns the integer code of 'value' in a categorical column, or None if it isn't a category."""
+    code = series.cat.categories.get_indexer([value])[0]
+    return None if code < 0 else code
+
+
+def code_mask(series, value):
+    """Boolean mask of the rows equal to 'value', compared on integer codes instead of strings."""
+    code = category_code(series, value)
+    if code is None:
+        return np.zeros(len(series), dtype=bool)
+    return series.cat.codes.to_numpy() == code
+
 
-    # === FIX APPLIED HERE ===
+def phase_column(overs):
+    """Maps an 'overs' column to the categorical innings phase (NaN past the 20th over)."""
+    overs = overs.to_numpy()
+    codes = np.searchsorted(PHASE_START_OVERS, overs, side='right')
+    codes[(overs < 0) | (overs > LAST_OVER)] = -1
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(PHASES))
+
+
+def derive_columns(matches, deliveries):
+    """Adds the derived delivery columns (BowlingTeam, phase) to raw deliveries rows."""
     # To determine the BowlingTeam, we first need to bring Team1 and Team2 into the deliveries DataFrame.
     # We do this by merging with the matches DataFrame on the common 'ID' column.
     deliveries = pd.merge(deliveries, matches[['ID', 'Team1', 'Team2']], on='ID', how='left')
 
-    # Now that 'Team1' and 'Team2' are available in the deliveries DataFrame, this apply() will work.
-    deliveries['BowlingTeam'] = deliveries.apply(
-        lambda row: row['Team2'] if row['BattingTeam'] == row['Team1'] else row['Team1'],
-        axis=1
+    # The bowling side is whichever of Team1/Team2 is not batting (vectorized, no row-wise apply).
+    deliveries['BowlingTeam'] = np.where(
+        deliveries['BattingTeam'] == deliveries['Team1'],
+        deliveries['Team2'],
+        deliveries['Team1']
     )
-    
+    # Team1/Team2 were only needed for the line above; don't keep two more string columns per delivery.
+    deliveries = deliveries.drop(columns=['Team1', 'Team2'])
+
+    # The phase of every ball, computed once here instead of as masks on every request
+    deliveries['phase'] = phase_column(deliveries['overs'])
+    return deliveries
+
+
+def build_frames():
+    """Parses the raw CSVs and computes the derived columns (the slow path)."""
+    matches = pd.read_csv(MATCHES_CSV)
+    deliveries = derive_columns(matches, pd.read_csv(DELIVERIES_CSV))
+    encode_categoricals({'matches': matches, 'deliveries': deliveries})
+    return matches, deliveries
+
+
+def load_data():
+    """Loads and preprocesses the IPL datasets, reusing the binary snapshot when it is fresh."""
+    try:
+        with registry.phase('data.hash'):
+            key = source_hash([MATCHES_CSV, DELIVERIES_CSV])
+    except FileNotFoundError:
+        print("Error: Dataset files not found. Make sure they are in the 'data/' directory.")
+        return None, None, None, None # Return four Nones
+
+    with registry.phase('data.snapshot_read'):
+        frames = read_snapshot(SNAPSHOT_ROOT, key)
+    if frames is not None:
+        matches, deliveries = frames['matches'], frames['deliveries']
+    else:
+        # Snapshot missing or stale: fall back to the CSVs and rebuild it for the next start.
+        with registry.phase('data.csv_parse'):
+            matches, deliveries = build_frames()
+        try:
+            with registry.phase('data.snapshot_write'):
+                write_snapshot(SNAPSHOT_ROOT, key, {'matches': matches, 'deliveries': deliveries})
+        except OSError as e:
+            print(f"Warning: Could not write data snapshot: {e}")
+
     # Create a list of all known player names from the merged dataframe
     player_names = list(set(
         deliveries['batter'].unique().tolist() +
         deliveries['bowler'].unique().tolist()
     ))
 
-    return matches, deliveries, player_names
+    return matches, deliveries, player_names, key
+
+
+class Dataset:
+    """The loaded frames, the known player names and the content hash ('version') they came from."""
+
+    def __init__(self, matches, deliveries, player_names, version):
+        self.matches = matches
+        self.deliveries = deliveries
+        self.player_names = player_names or []
+        self.version = version
+
+
+# Loaded on first use (or by the warm-up thread), not at import time. An incremental change
+# (see ingest_service.Append) produces the new Dataset itself.
+registry.register('data', lambda parts: Dataset(*load_data()),
+                  updater=lambda parts, previous, change: change.apply(previous))
+
+
+def get_dataset():
+    """Returns the current Dataset, loading it if needed."""
+    return registry.get('data')
 
-# Load data and player names once when the module is imported
-matches_df, deliveries_df, player_names = load_data()
 
 # Team name aliases for fuzzy matching
 team_aliases = {
@@ -43,4 +198,4 @@ team_aliases = {
     "rr": "Rajasthan Royals", "rajasthan": "Rajasthan Royals",
     "gt": "Gujarat Titans", "gujarat": "Gujarat Titans",
     "lsg": "Lucknow Super Giants", "lucknow": "Lucknow Super Giants"
-}
\ No newline at end of file
+}
@@ -0,0 +1,168 @@
+import csv
+import io
+import json
+import re
+
+import pandas as pd
+
+from . import registry
+from .data_service import get_dataset
+from .player_service import get_batsman_summary, get_bowler_summary
+
+# --- Bulk Export ---
+# Stats for every player and team, produced by generators in chunks of CHUNK_ROWS records so
+# an export of any size streams with flat memory. Everything is read from the precomputed
+# career and phase tables; the per-team stats come from one grouped pass over the matches.
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_KINDS = ('players', 'teams', 'all')
+CHUNK_ROWS = 200
+
+
+def _runs_per_season(phase_stats):
+    """{player: {season: runs}} from the (player, phase, season) batting table, in one groupby."""
+    runs = phase_stats['batting']['runs'].groupby(level=['player', 'season'], observed=True).sum()
+    by_player = {}
+    for (player, season), value in runs.items():
+        by_player.setdefault(player, {})[str(season)] = int(value)
+    return by_player
+
+
+def iter_player_records():
+    """Yields one record per player: career batting and bowling summaries and runs per season."""
+    careers = registry.get('career_aggregates')
+    phase_stats = registry.get('phase_stats')
+    runs_by_season = _runs_per_season(phase_stats) if phase_stats is not None else {}
+    for player in sorted(set(careers['batting']) | set(careers['bowling'])):
+        yield {
+            'type': 'player',
+            'player': player,
+            'batting': get_batsman_summary(player) or None,
+            'bowling': get_bowler_summary(player) or None,
+            'runs_per_season': runs_by_season.get(player, {}),
+        }
+
+
+def team_table(matches):
+    """Per-team results (matches, wins, losses, no results, toss wins) and wins per season."""
+    sides = pd.DataFrame({
+        'team': pd.concat([matches['Team1'], matches['Team2']], ignore_index=True),
+        'Season': pd.concat([matches['Season'], matches['Season']], ignore_index=True).astype(str),
+    })
+    winners = pd.concat([matches['WinningTeam'], matches['WinningTeam']], ignore_index=True)
+    tosses = pd.concat([matches['TossWinner'], matches['TossWinner']], ignore_index=True)
+    sides['win'] = (sides['team'] == winners).to_numpy()
+    sides['no_result'] = winners.isna().to_numpy()
+    sides['toss_win'] = (sides['team'] == tosses).to_numpy()
+
+    totals = sides.groupby('team', observed=True).agg(
+        matches=('win', 'size'), wins=('win', 'sum'), no_result=('no_result', 'sum'), toss_wins=('toss_win', 'sum'))
+    totals['losses'] = totals['matches'] - totals['wins'] - totals['no_result']
+    per_season = sides.groupby(['team', 'Season'], observed=True)['win'].sum()
+    return totals.astype(int), per_season
+
+
+def iter_team_records():
+    """Yields one record per team: overall results and wins per season."""
+    matches = get_dataset().matches
+    if matches is None:
+        return
+    totals, per_season = team_table(matches)
+    wins_by_season = {}
+    for (team, season), wins in per_season.items():
+        wins_by_season.setdefault(team, {})[season] = int(wins)
+    for team, row in zip(totals.index, totals.to_dict('records')):
+        decided = row['matches'] - row['no_result']
+        yield {
+            'type': 'team',
+            'team': team,
+            'matches': row['matches'],
+            'wins': row['wins'],
+            'losses': row['losses'],
+            'no_result': row['no_result'],
+            'win_percentage': round(row['wins'] / decided * 100, 2) if decided > 0 else 0.0,
+            'toss_wins': row['toss_wins'],
+            'wins_per_season': wins_by_season.get(team, {}),
+        }
+
+
+def iter_records(kind):
+    if kind in ('players', 'all'):
+        yield from iter_player_records()
+    if kind in ('teams', 'all'):
+        yield from iter_team_records()
+
+
+def _chunked(lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_ROWS:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_ndjson(kind):
+    """Yields the export as newline-delimited JSON, one record per line, in chunks."""
+    return _chunked(json.dumps(record) + '\n' for record in iter_records(kind))
+
+
+def _column(prefix, key):
+    return f"{prefix}_{re.sub(r'[^a-z0-9]+', '_', key.lower()).strip('_')}"
+
+
+def _flatten(record):
+    """Flattens a player or team record into one CSV row ({'batting': {'Total Runs': ..}} -> batting_total_runs)."""
+    row = {}
+    for key, value in record.items():
+        if key == 'type':
+            continue
+        if isinstance(value, dict):
+            prefix = {'runs_per_season': 'runs', 'wins_per_season': 'wins'}.get(key, key)
+            row.update({_column(prefix, k): v for k, v in value.items()})
+        elif value is not None:
+            row[key] = value
+    return row
+
+
+def _csv_columns(kind):
+    """The CSV header: the record's scalar fields, then its nested fields, then one column per season."""
+    seasons = sorted(str(s) for s in get_dataset().matches['Season'].unique())
+    if kind == 'teams':
+        return (['team', 'matches', 'wins', 'losses', 'no_result', 'win_percentage', 'toss_wins'] +
+                [_column('wins', s) for s in seasons])
+
+    careers = registry.get('career_aggregates')
+    batting = get_batsman_summary(next(iter(careers['batting']))) if careers['batting'] else {}
+    bowling = get_bowler_summary(next(iter(careers['bowling']))) if careers['bowling'] else {}
+    return (['player'] + [_column('batting', k) for k in batting] + [_column('bowling', k) for k in bowling] +
+            [_column('runs', s) for s in seasons])
+
+
+def stream_csv(kind):
+    """Yields the export as CSV (players or teams, one row each), in chunks."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_csv_columns(kind), restval='', extrasaction='ignore')
+
+    def lines():
+        writer.writeheader()
+        for record in iter_records(kind):
+            writer.writerow(_flatten(record))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    return _chunked(lines())
+
+
+def stream_export(fmt, kind):
+    """Returns a generator of text chunks, or an {'error': ...} dict for unknown options."""
+    if fmt not in EXPORT_FORMATS:
+        return {'error': f"Unknown format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}."}
+    if kind not in EXPORT_KINDS:
+        return {'error': f"Unknown kind '{kind}'. Use one of: {', '.join(EXPORT_KINDS)}."}
+    if fmt == 'csv' and kind == 'all':
+        return {'error': "CSV exports one kind at a time: use kind=players or kind=teams."}
+    return stream_ndjson(kind) if fmt == 'ndjson' else stream_csv(kind)
@@ -0,0 +1,257 @@
+import csv
+import os
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+
+from . import registry
+from .data_service import (
+    Dataset, MATCHES_CSV, DELIVERIES_CSV, SNAPSHOT_ROOT, append_frames, build_frames, derive_columns
+)
+from .snapshot_service import source_hash, write_snapshot
+from .venue_service import with_text_labels
+
+# --- Incremental Ingestion ---
+# New matches and their deliveries, in the same schemas as the CSVs, are appended to the files
+# and folded into the loaded data without a full rebuild: each derived index registers an
+# updater that merges the aggregates of just the new rows into its previous version.
+
+_lock = threading.Lock()  # one append at a time
+
+
+def csv_columns(path):
+    """The header row of a CSV file."""
+    with open(path, newline='') as f:
+        return next(csv.reader(f))
+
+
+def _as_text(value):
+    """JSON numbers in text columns become the strings the CSV holds (2023 -> '2023')."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value) if isinstance(value, (int, float)) else value
+
+
+def _normalize(rows, like):
+    """Coerces new rows to the column types of the loaded frame 'like'."""
+    rows = rows.copy()
+    for col in rows.columns.intersection(like.columns):
+        if like[col].dtype == object or isinstance(like[col].dtype, pd.CategoricalDtype):
+            rows[col] = rows[col].astype(object).map(_as_text, na_action='ignore')
+        else:
+            rows[col] = pd.to_numeric(rows[col])
+            if rows[col].notna().all() and (rows[col] % 1 == 0).all():
+                rows[col] = rows[col].astype(like[col].dtype)
+    return rows
+
+
+def _appended_copy(path, rows, columns):
+    """Writes a copy of a CSV with the rows appended next to it and returns the copy's path."""
+    fd, tmp_path = tempfile.mkstemp(prefix='.append-', suffix='.csv', dir=os.path.dirname(path) or '.')
+    try:
+        with open(path, 'rb') as src, os.fdopen(fd, 'wb') as out:
+            shutil.copyfileobj(src, out)
+            if src.tell() > 0:
+                src.seek(-1, os.SEEK_END)
+                if src.read(1) != b'\n':
+                    out.write(b'\n')
+            out.write(rows[columns].to_csv(header=False, index=False).encode())
+        shutil.copymode(path, tmp_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _append_csvs(appends):
+    """
+    Appends rows to several CSVs: every appended copy is written first and only then swapped in,
+    so a failed write leaves all of the files as they were, and readers never see half a file.
+    """
+    copies = []
+    try:
+        for path, rows in appends:
+            copies.append((_appended_copy(path, rows, csv_columns(path)), path))
+    except Exception:
+        for tmp_path, _ in copies:
+            os.remove(tmp_path)
+        raise
+    for tmp_path, path in copies:
+        os.replace(tmp_path, path)
+
+
+def _ids_on_disk():
+    """The match IDs already in the CSV files (of matches, or of deliveries left by an older failed append)."""
+    return pd.Index(pd.concat([pd.read_csv(MATCHES_CSV, usecols=['ID'])['ID'],
+                               pd.read_csv(DELIVERIES_CSV, usecols=['ID'])['ID']]).unique())
+
+
+class Append:
+    """
+    New matches and deliveries to add to the datasets, applied with registry.update(). The 'data'
+    updater calls apply(), which validates the rows and leaves the encoded new rows in 'matches'
+    and 'deliveries' for the other components' updaters. Once they have all succeeded, the
+    registry calls commit(), which appends the rows to the CSVs.
+    """
+
+    def __init__(self, matches, deliveries):
+        self.raw_matches = matches
+        self.raw_deliveries = deliveries
+        self.matches = None
+        self.deliveries = None
+        self.dataset = None
+
+    def validate(self, previous):
+        """Returns an error message, or None if the rows can be appended to 'previous'."""
+        matches, deliveries = self.raw_matches, self.raw_deliveries
+        if previous.matches is None:
+            return "Data not loaded."
+        for name, rows, path in (('matches', matches, MATCHES_CSV), ('deliveries', deliveries, DELIVERIES_CSV)):
+            expected = csv_columns(path)
+            missing = [col for col in expected if col not in rows.columns]
+            unknown = [col for col in rows.columns if col not in expected]
+            if missing or unknown:
+                return f"The {name} rows don't match the CSV schema (missing: {missing}, unknown: {unknown})."
+        if matches.empty:
+            return "No matches to append."
+        if matches['ID'].isna().any() or deliveries['ID'].isna().any():
+            return "Every row needs an ID."
+
+        ids = pd.Index(matches['ID'])
+        if ids.has_duplicates:
+            return "Duplicate match IDs in the new rows."
+        existing = ids[ids.isin(previous.matches['ID'])]
+        if len(existing):
+            return f"Matches already loaded: {existing[:10].tolist()}."
+        # The files can hold matches the loaded data doesn't (e.g. appended by another process)
+        existing = ids[ids.isin(_ids_on_disk())]
+        if len(existing):
+            return f"Matches already in the CSV files: {existing[:10].tolist()}."
+        # Career innings counts add up only if every new delivery belongs to a new match
+        orphans = pd.Index(deliveries['ID']).difference(ids)
+        if len(orphans):
+            return f"Deliveries must belong to the matches appended with them (unknown IDs: {orphans[:10].tolist()})."
+
+        sides = matches.set_index('ID')[['Team1', 'Team2']].loc[deliveries['ID']]
+        batting = deliveries['BattingTeam'].to_numpy()
+        if not ((batting == sides['Team1'].to_numpy()) | (batting == sides['Team2'].to_numpy())).all():
+            return "Every delivery's BattingTeam must be one of its match's teams."
+        return None
+
+    def apply(self, previous):
+        """Validates the rows and returns the new Dataset (its version is set by commit())."""
+        self.raw_matches = _normalize(self.raw_matches, previous.matches)
+        self.raw_deliveries = _normalize(self.raw_deliveries, previous.deliveries)
+        error = self.validate(previous)
+        if error:
+            raise ValueError(error)
+
+        new_frames = {
+            'matches': self.raw_matches,
+            'deliveries': derive_columns(self.raw_matches, self.raw_deliveries),
+        }
+        merged, encoded = append_frames({'matches': previous.matches, 'deliveries': previous.deliveries}, new_frames)
+        self.matches, self.deliveries = encoded['matches'], encoded['deliveries']
+
+        known = set(previous.player_names)
+        new_names = pd.concat([encoded['deliveries']['batter'], encoded['deliveries']['bowler']]).dropna().unique()
+        player_names = previous.player_names + [name for name in new_names if name not in known]
+        self.dataset = Dataset(merged['matches'], merged['deliveries'], player_names, None)
+        return self.dataset
+
+    def commit(self):
+        """Appends the rows to the CSVs (deliveries first) and versions the new Dataset by them."""
+        _append_csvs([(DELIVERIES_CSV, self.raw_deliveries), (MATCHES_CSV, self.raw_matches)])
+        self.dataset.version = source_hash([MATCHES_CSV, DELIVERIES_CSV])
+
+
+def append_rows(matches, deliveries):
+    """
+    Appends new matches and their deliveries (DataFrames in the CSV schemas) to the datasets
+    and updates every derived index incrementally. Returns a summary, or an {'error': ...} dict.
+    """
+    change = Append(matches, deliveries)
+    with _lock:
+        try:
+            generation = registry.update(change)
+        except ValueError as e:
+            return {'error': str(e)}
+        except OSError as e:
+            return {'error': f"Could not append to the CSV files: {e}"}
+
+        # Refresh the on-disk snapshot so the next start (and other workers' reloads) stay fast
+        data = change.dataset
+        try:
+            write_snapshot(SNAPSHOT_ROOT, data.version, {'matches': data.matches, 'deliveries': data.deliveries})
+        except OSError as e:
+            print(f"Warning: Could not write data snapshot: {e}")
+
+    return {
+        'matches_added': int(len(change.matches)),
+        'deliveries_added': int(len(change.deliveries)),
+        'total_matches': int(len(data.matches)),
+        'generation': generation,
+        'timings': registry.status()['timings'],
+    }
+
+
+def append_records(matches, deliveries):
+    """append_rows() for lists of JSON records (e.g. from the admin endpoint)."""
+    if not isinstance(matches, list) or not isinstance(deliveries, list):
+        return {'error': "Send 'matches' and 'deliveries' as lists of records."}
+    return append_rows(pd.DataFrame.from_records(matches), pd.DataFrame.from_records(deliveries))
+
+
+# --- Consistency Check ---
+# Each incrementally updated component in a form that compares equal to a full build's,
+# whatever the row order or categorical dictionaries it ended up with.
+
+def _frames_equal(a, b):
+    try:
+        pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True),
+                                      check_dtype=False, check_categorical=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def _rows(table):
+    return sorted(tuple(str(value) for value in row) for row in table.reset_index().itertuples(index=False))
+
+
+def _matrix(matrix):
+    return with_text_labels(matrix).sort_index().sort_index(axis=1).to_dict()
+
+
+CANONICAL = {
+    'h2h_cube': lambda cube: cube,
+    'name_index': lambda index: {kind: sorted(resolver.names) for kind, resolver in index.items()},
+    'career_aggregates': lambda careers: dict(
+        careers, batting_innings=_rows(careers['batting_innings']),
+        bowling_innings=_rows(careers['bowling_innings'])),
+    'matchup_cube': lambda matchups: matchups,
+    'fortress': lambda fortress: dict(fortress, played=_matrix(fortress['played']), wins=_matrix(fortress['wins'])),
+}
+
+
+def compare_with_rebuild():
+    """
+    Rebuilds the frames from the CSVs, and every index from those frames, and compares them
+    with the current (incrementally updated) ones. Returns the names of the components that differ.
+    """
+    current = registry.snapshot()
+    matches, deliveries = build_frames()
+    player_names = list(set(deliveries['batter'].unique().tolist() + deliveries['bowler'].unique().tolist()))
+    data = current['data']
+    fresh = registry.build(data=Dataset(matches, deliveries, player_names, data.version))
+
+    different = []
+    if not (_frames_equal(data.matches, matches) and _frames_equal(data.deliveries, deliveries) and
+            set(data.player_names) == set(player_names)):
+        different.append('data')
+    for name, canonical in CANONICAL.items():
+        if canonical(current[name]) != canonical(fresh[name]):
+            different.append(name)
+    return different
@@ -0,0 +1,118 @@
+import numpy as np
+
+from . import metrics, registry
+from .data_service import PHASES
+from . import player_service  # noqa: F401 -- registers 'phase_stats', which must be built first
+
+# --- Leaderboard Metrics ---
+# metric -> (value from the summed columns, True if higher is better). Rate metrics that are
+# undefined for a player (no dismissals, no wickets) leave the player out of that ranking.
+BATTING_METRICS = {
+    'runs': (lambda c: c['runs'], True),
+    'average': (lambda c: c['runs'] / np.where(c['dismissals'] > 0, c['dismissals'], np.nan), True),
+    'strike_rate': (lambda c: c['runs'] / np.where(c['balls'] > 0, c['balls'], np.nan) * 100, True),
+    'fours': (lambda c: c['fours'], True),
+    'sixes': (lambda c: c['sixes'], True),
+}
+BOWLING_METRICS = {
+    'wickets': (lambda c: c['wickets'], True),
+    'economy': (lambda c: c['runs'] / np.where(c['balls'] > 0, c['balls'], np.nan) * 6, False),
+    'average': (lambda c: c['runs'] / np.where(c['wickets'] > 0, c['wickets'], np.nan), False),
+    'strike_rate': (lambda c: c['balls'] / np.where(c['wickets'] > 0, c['wickets'], np.nan), False),
+}
+METRICS = {'batting': BATTING_METRICS, 'bowling': BOWLING_METRICS}
+
+# Each ranking is also kept pre-filtered at these minimum-balls tiers, so a qualification
+# filter only skips the few players between the nearest tier and the requested minimum.
+QUALIFICATION_TIERS = [0, 10, 30, 60, 120, 250, 500, 1000]
+MAX_LIMIT = 100
+
+
+def _slices(table):
+    """Sums a (player, phase, season) table into every (season, phase) slice; None means 'all'."""
+    flat = table.reset_index()
+    columns = list(table.columns)
+    for keys in (['season', 'phase'], ['season'], ['phase'], []):
+        grouped = flat.groupby(['player'] + keys, observed=True)[columns].sum()
+        if not keys:
+            yield (None, None), grouped
+            continue
+        for key, part in grouped.groupby(level=keys if len(keys) > 1 else keys[0], observed=True):
+            key = key if isinstance(key, tuple) else (key,)
+            named = dict(zip(keys, key))
+            season = str(named['season']) if 'season' in named else None
+            yield (season, named.get('phase')), part.droplevel(keys)
+
+
+def _build_board(part, role):
+    """Column arrays of one slice plus, per metric, its players in rank order at every tier."""
+    players = np.array([str(p) for p in part.index], dtype=object)
+    columns = {col: part[col].to_numpy() for col in part.columns}
+    orders = {}
+    for metric, (value_of, descending) in METRICS[role].items():
+        values = np.asarray(value_of(columns), dtype=float)
+        ranked = np.flatnonzero(~np.isnan(values))
+        # Rank by the metric, then by balls (larger sample first), then by name
+        primary = -values[ranked] if descending else values[ranked]
+        ranked = ranked[np.lexsort((players[ranked], -columns['balls'][ranked], primary))]
+        orders[metric] = {
+            'values': values,
+            'tiers': [(tier, ranked[columns['balls'][ranked] >= tier].astype(np.int32))
+                      for tier in QUALIFICATION_TIERS],
+        }
+    return {'players': players, 'columns': columns, 'orders': orders}
+
+
+def build_leaderboards(phase_stats):
+    """Builds every role x (season, phase) x metric ranking from the phase stats tables."""
+    if phase_stats is None:
+        return None
+    return {
+        role: {key: _build_board(part, role) for key, part in _slices(phase_stats[role])}
+        for role in METRICS
+    }
+
+registry.register('leaderboards', lambda parts: build_leaderboards(parts['phase_stats']))
+
+
+@metrics.timed
+def get_leaderboard(metric, role='batting', season=None, phase=None, min_balls=0, limit=10):
+    """
+    Returns the top 'limit' players by 'metric' for a role, optionally within one season and/or
+    phase, counting only players with at least 'min_balls' balls faced (or bowled).
+    """
+    if role not in METRICS:
+        return {'error': f"Unknown role '{role}'. Use 'batting' or 'bowling'."}
+    if metric not in METRICS[role]:
+        return {'error': f"Unknown {role} metric '{metric}'. Use one of: {', '.join(METRICS[role])}."}
+    if phase is not None and phase not in PHASES:
+        return {'error': f"Unknown phase '{phase}'. Use one of: {', '.join(PHASES)}."}
+
+    leaderboards = registry.get('leaderboards')
+    board = leaderboards[role].get((season, phase)) if leaderboards else None
+    leaders = []
+    if board is not None:
+        order = board['orders'][metric]
+        # The strictest pre-filtered tier that still includes everyone qualifying
+        ranked = next(ranked for tier, ranked in reversed(order['tiers']) if tier <= min_balls)
+        balls = board['columns']['balls']
+        for i in ranked:
+            if balls[i] < min_balls:
+                continue
+            value = order['values'][i]
+            # Counting metrics (runs, wickets, ...) are whole numbers, rates are rounded
+            value = int(value) if metric in board['columns'] else round(float(value), 2)
+            row = {'rank': len(leaders) + 1, 'player': board['players'][i], 'value': value}
+            row.update({col: int(values[i]) for col, values in board['columns'].items()})
+            leaders.append(row)
+            if len(leaders) >= limit:
+                break
+
+    return {
+        'metric': metric,
+        'role': role,
+        'season': season or 'All',
+        'phase': phase or 'All',
+        'min_balls': min_balls,
+        'leaders': leaders,
+    }
@@ -0,0 +1,222 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from . import metrics, registry
+from .player_service import standardize_player_name
+
+# --- Lineup Index ---
+# The playing XIs in Team1Players/Team2Players are stringified Python lists. They are parsed
+# once at load into integer-coded CSR arrays, so every lineup query is a slice plus a few
+# vectorized counts instead of re-parsing strings:
+#   appearances: player code -> the (match row, side) of every match the player played
+#   lineups:     (match row, side) -> the player codes of that XI
+
+# A name is quoted with ' unless it contains one (e.g. "D'Arcy Short"), as repr() does
+_QUOTED_NAME = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+DEFAULT_TEAMMATES = 10
+MAX_TEAMMATES = 100
+
+
+def parse_lineup(text):
+    """Parses one stringified playing XI into a list of names ([] if missing)."""
+    if not isinstance(text, str):
+        return []
+    return [single or double for single, double in _QUOTED_NAME.findall(text)]
+
+
+def build_lineup_index(matches):
+    """Parses every playing XI into the appearance and lineup arrays."""
+    # Slot 2 * row + side holds one side's XI: side 0 is Team1, side 1 is Team2
+    xis = [None] * (2 * len(matches))
+    xis[0::2] = [parse_lineup(text) for text in matches['Team1Players']]
+    xis[1::2] = [parse_lineup(text) for text in matches['Team2Players']]
+
+    sizes = np.fromiter((len(xi) for xi in xis), dtype=np.int64, count=len(xis))
+    names = pd.Series([name for xi in xis for name in xi], dtype=object)
+    codes, players = pd.factorize(names, sort=True)
+    lineup_offsets = np.concatenate([[0], np.cumsum(sizes)])
+    slots = np.repeat(np.arange(len(xis), dtype=np.int32), sizes)
+
+    # Invert slot -> players into player -> slots (a stable sort keeps each player's matches in order)
+    order = np.argsort(codes, kind='stable')
+    appearance_offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(players)))])
+
+    team1 = matches['Team1'].cat.codes.to_numpy()
+    team2 = matches['Team2'].cat.codes.to_numpy()
+    season = matches['Season'].astype('category')
+    return {
+        'players': np.asarray(players, dtype=object),
+        'player_codes': {name: code for code, name in enumerate(players)},
+        'appearance_offsets': appearance_offsets,
+        'appearance_slots': slots[order],
+        'lineup_offsets': lineup_offsets,
+        'lineup_players': codes.astype(np.int32),
+        # Per match row: both teams, the winner (-1 for no result) and the season, as codes
+        'teams': np.stack([team1, team2], axis=1).astype(np.int16),
+        'winner': matches['WinningTeam'].cat.codes.to_numpy().astype(np.int16),
+        'team_names': np.asarray(matches['Team1'].cat.categories, dtype=object),
+        'season': season.cat.codes.to_numpy().astype(np.int16),
+        'season_names': [str(s) for s in season.cat.categories],
+    }
+
+registry.register('lineups', lambda parts: (
+    build_lineup_index(parts['data'].matches) if parts['data'].matches is not None else None
+))
+
+
+# --- Queries ---
+
+def resolve_player(name):
+    """An exact lineup name as it is (some never batted or bowled), anything else via the name index."""
+    index = registry.get('lineups')
+    if index is not None and name in index['player_codes']:
+        return name
+    return standardize_player_name(name or '')
+
+
+def _season_code(index, season):
+    """The season's code, -1 for all seasons, or None if there is no such season."""
+    if season is None:
+        return -1
+    return index['season_names'].index(season) if season in index['season_names'] else None
+
+
+def _player_slots(index, player, season_code):
+    """The (match row, side) slots of a player's appearances, optionally within one season."""
+    code = index['player_codes'].get(player)
+    if code is None:
+        return np.empty(0, dtype=np.int32)
+    slots = index['appearance_slots'][index['appearance_offsets'][code]:index['appearance_offsets'][code + 1]]
+    if season_code >= 0:
+        slots = slots[index['season'][slots // 2] == season_code]
+    return slots
+
+
+def _record(won, no_result):
+    """Matches, wins, losses, no results and win percentage (of decided matches)."""
+    matches, wins, no_results = int(len(won)), int(won.sum()), int(no_result.sum())
+    decided = matches - no_results
+    return {
+        'matches': matches,
+        'wins': wins,
+        'losses': decided - wins,
+        'no_result': no_results,
+        'win_percentage': round(wins / decided * 100, 2) if decided > 0 else 0.0,
+    }
+
+
+def _outcomes(index, rows, teams):
+    """Whether 'teams' won each match row, and whether it had no result."""
+    winner = index['winner'][rows]
+    return winner == teams, winner < 0
+
+
+def _index_or_error(player, season):
+    index = registry.get('lineups')
+    if index is None:
+        return None, None, {'error': 'Data not loaded'}
+    season_code = _season_code(index, season)
+    if season_code is None:
+        return None, None, {'error': f"Unknown season '{season}'."}
+    return index, season_code, None
+
+
+@metrics.timed
+def get_appearances(player, season=None):
+    """Matches a player was in the XI for, with the results, by team and by season."""
+    index, season_code, error = _index_or_error(player, season)
+    if error:
+        return error
+    slots = _player_slots(index, player, season_code)
+    rows, sides = slots // 2, slots % 2
+    teams = index['teams'][rows, sides]
+    won, no_result = _outcomes(index, rows, teams)
+
+    by_team = {index['team_names'][team]: _record(won[teams == team], no_result[teams == team])
+               for team in np.unique(teams)}
+    seasons = index['season'][rows]
+    by_season = {index['season_names'][s]: int(count) for s, count in zip(*np.unique(seasons, return_counts=True))}
+    return {
+        'player': player,
+        'season': season or 'All',
+        **_record(won, no_result),
+        'by_team': by_team,
+        'matches_per_season': by_season,
+    }
+
+
+@metrics.timed
+def get_with_without(player, team=None, season=None):
+    """
+    A team's record in its matches with the player in the XI and in those without. The team
+    defaults to the one the player played the most matches for.
+    """
+    index, season_code, error = _index_or_error(player, season)
+    if error:
+        return error
+    slots = _player_slots(index, player, season_code)
+    rows, sides = slots // 2, slots % 2
+    player_teams = index['teams'][rows, sides]
+
+    if team is None:
+        if not len(player_teams):
+            return {'error': f"No appearances found for '{player}'."}
+        team_code = int(np.bincount(player_teams).argmax())
+    else:
+        found = np.flatnonzero(index['team_names'] == team)
+        if not len(found):
+            return {'error': f"Unknown team '{team}'."}
+        team_code = int(found[0])
+
+    plays = (index['teams'] == team_code).any(axis=1)
+    if season_code >= 0:
+        plays &= index['season'] == season_code
+    team_rows = np.flatnonzero(plays)
+    with_rows = rows[player_teams == team_code]
+    without_rows = np.setdiff1d(team_rows, with_rows, assume_unique=True)
+
+    return {
+        'player': player,
+        'team': index['team_names'][team_code],
+        'season': season or 'All',
+        'with': _record(*_outcomes(index, with_rows, team_code)),
+        'without': _record(*_outcomes(index, without_rows, team_code)),
+    }
+
+
+@metrics.timed
+def get_common_teammates(player, season=None, limit=DEFAULT_TEAMMATES):
+    """The players who shared the most XIs with the player, with their record together."""
+    index, season_code, error = _index_or_error(player, season)
+    if error:
+        return error
+    slots = _player_slots(index, player, season_code)
+    rows, sides = slots // 2, slots % 2
+    won, _ = _outcomes(index, rows, index['teams'][rows, sides])
+
+    # Every player of every one of those XIs, gathered in one go from the CSR arrays
+    starts, ends = index['lineup_offsets'][slots], index['lineup_offsets'][slots + 1]
+    sizes = ends - starts
+    positions = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+    teammates = index['lineup_players'][positions]
+    together = np.bincount(teammates, minlength=len(index['players']))
+    wins = np.bincount(teammates, weights=np.repeat(won, sizes), minlength=len(index['players']))
+    code = index['player_codes'].get(player)
+    if code is not None:
+        together[code] = 0
+
+    # Most matches together, then most wins together, then by name
+    candidates = np.flatnonzero(together)
+    ranked = candidates[np.lexsort((index['players'][candidates], -wins[candidates], -together[candidates]))]
+    return {
+        'player': player,
+        'season': season or 'All',
+        'matches': int(len(slots)),
+        'teammates': [
+            {'player': index['players'][mate], 'matches_together': int(together[mate]),
+             'wins_together': int(wins[mate])}
+            for mate in ranked[:limit]
+        ],
+    }
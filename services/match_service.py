@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+from . import metrics, registry
+
+# --- Innings Progression ---
+# Worm (cumulative) and Manhattan (per over) data for every innings of every match, computed
+# once at load with cumulative sums over the deliveries sorted by match, innings and ball. The
+# arrays are contiguous, one run per innings, so an innings is a slice (a view, not a copy):
+#   match -> its innings:     match_offsets[m]:match_offsets[m + 1] into the innings arrays
+#   innings -> its balls:     ball_offsets[i]:ball_offsets[i + 1] into the ball arrays
+#   innings -> its overs:     over_offsets[i]:over_offsets[i + 1] into the over arrays
+
+ILLEGAL_EXTRAS = ['wides', 'noballs']  # not counted as balls of the over
+BALLS_PER_INNINGS = 120
+
+
+def _within(values, starts, sizes):
+    """Cumulative sum of 'values' that restarts at each innings start."""
+    total = np.cumsum(values, dtype=np.int64)
+    return total - np.repeat(total[starts] - values[starts], sizes)
+
+
+def build_progression_index(matches, deliveries):
+    """The progression arrays of every innings, with the per-match and per-innings offsets."""
+    order = np.lexsort((deliveries['ballnumber'].to_numpy(), deliveries['overs'].to_numpy(),
+                        deliveries['innings'].to_numpy(), deliveries['ID'].to_numpy()))
+    ids = deliveries['ID'].to_numpy()[order]
+    innings = deliveries['innings'].to_numpy()[order]
+    overs = deliveries['overs'].to_numpy()[order]
+    runs = deliveries['total_run'].to_numpy()[order]
+    wickets = deliveries['isWicketDelivery'].to_numpy()[order]
+    legal = (~deliveries['extra_type'].isin(ILLEGAL_EXTRAS)).to_numpy()[order]
+
+    # Innings boundaries: wherever the match or the innings changes
+    new_innings = np.ones(len(ids), dtype=bool)
+    new_innings[1:] = (ids[1:] != ids[:-1]) | (innings[1:] != innings[:-1])
+    starts = np.flatnonzero(new_innings)
+    sizes = np.diff(np.append(starts, len(ids)))
+    ends = starts + sizes - 1
+
+    cum_runs = _within(runs, starts, sizes)
+    cum_wickets = _within(wickets, starts, sizes)
+    cum_balls = _within(legal.astype(np.int64), starts, sizes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        run_rate = np.where(cum_balls > 0, np.round(cum_runs * 6 / cum_balls, 2), 0.0)
+
+    # The chase: an innings 2 follows its match's innings 1 directly in the sorted order
+    innings_match, innings_number = ids[starts], innings[starts]
+    target = np.full(len(starts), -1, dtype=np.int64)
+    chases = np.flatnonzero((innings_number == 2)[1:] & (innings_match[1:] == innings_match[:-1])
+                            & (innings_number[:-1] == 1)) + 1
+    target[chases] = cum_runs[ends[chases - 1]] + 1
+    ball_target = np.repeat(target, sizes)
+    balls_left = BALLS_PER_INNINGS - cum_balls
+    with np.errstate(divide='ignore', invalid='ignore'):
+        required_rate = np.where((ball_target > 0) & (balls_left > 0),
+                                 np.round(np.maximum(ball_target - cum_runs, 0) * 6 / balls_left, 2), np.nan)
+
+    # Manhattan: one entry per over of each innings
+    new_over = new_innings.copy()
+    new_over[1:] |= overs[1:] != overs[:-1]
+    over_starts = np.flatnonzero(new_over)
+
+    match_ids, first_innings = np.unique(innings_match, return_index=True)
+    batting = deliveries['BattingTeam']
+    return {
+        'match_ids': match_ids,
+        'match_rows': pd.Index(matches['ID']).get_indexer(match_ids),
+        'match_offsets': np.append(first_innings, len(starts)),
+        'innings': innings_number.astype(np.int8),
+        'batting_team': batting.cat.codes.to_numpy()[order][starts],
+        'team_names': np.asarray(batting.cat.categories, dtype=object),
+        'target': target,
+        'ball_offsets': np.append(starts, len(ids)),
+        'over': overs.astype(np.int8),
+        'ball': deliveries['ballnumber'].to_numpy()[order].astype(np.int8),
+        'runs': cum_runs.astype(np.int32),
+        'wickets': cum_wickets.astype(np.int8),
+        'legal_balls': cum_balls.astype(np.int16),
+        'run_rate': run_rate,
+        'required_rate': required_rate,
+        'over_offsets': np.append(np.searchsorted(over_starts, starts), len(over_starts)),
+        'over_number': overs[over_starts].astype(np.int8),
+        'over_runs': np.add.reduceat(runs, over_starts).astype(np.int16),
+        'over_wickets': np.add.reduceat(wickets, over_starts).astype(np.int8),
+    }
+
+registry.register('progression', lambda parts: (
+    build_progression_index(parts['data'].matches, parts['data'].deliveries)
+    if parts['data'].deliveries is not None else None
+))
+
+
+# --- Queries ---
+
+def _match_position(index, match_id):
+    """The match's position in the index, or None if it has no deliveries."""
+    m = np.searchsorted(index['match_ids'], match_id)
+    if m >= len(index['match_ids']) or index['match_ids'][m] != match_id:
+        return None
+    return m
+
+
+def innings_slices(index, match_id):
+    """
+    The innings of a match as (innings position, ball slice, over slice), or None for an
+    unknown match. Indexing the arrays with the slices returns views, not copies.
+    """
+    m = _match_position(index, match_id)
+    if m is None:
+        return None
+    return [(i, slice(index['ball_offsets'][i], index['ball_offsets'][i + 1]),
+             slice(index['over_offsets'][i], index['over_offsets'][i + 1]))
+            for i in range(index['match_offsets'][m], index['match_offsets'][m + 1])]
+
+
+def _innings_json(index, i, balls, overs):
+    target = int(index['target'][i])
+    progression = {
+        'over': index['over'][balls].tolist(),
+        'ball': index['ball'][balls].tolist(),
+        'runs': index['runs'][balls].tolist(),
+        'wickets': index['wickets'][balls].tolist(),
+        'legal_balls': index['legal_balls'][balls].tolist(),
+        'run_rate': index['run_rate'][balls].tolist(),
+    }
+    if target > 0:
+        progression['required_rate'] = [None if rate != rate else rate for rate in index['required_rate'][balls].tolist()]
+    return {
+        'innings': int(index['innings'][i]),
+        'batting_team': index['team_names'][index['batting_team'][i]],
+        'total': int(index['runs'][balls.stop - 1]),
+        'wickets': int(index['wickets'][balls.stop - 1]),
+        'target': target if target > 0 else None,
+        'balls': progression,
+        'overs': {
+            'over': index['over_number'][overs].tolist(),
+            'runs': index['over_runs'][overs].tolist(),
+            'wickets': index['over_wickets'][overs].tolist(),
+        },
+    }
+
+
+@metrics.timed
+def get_match_progression(match_id, innings=None):
+    """Ball-by-ball worm data and per-over Manhattan data for a match's innings (or just one of them)."""
+    index = registry.get('progression')
+    if index is None:
+        return {'error': 'Data not loaded'}
+    m = _match_position(index, match_id)
+    if m is None or index['match_rows'][m] < 0:
+        return {'error': f"No deliveries found for match {match_id}."}
+    slices = innings_slices(index, match_id)
+    if innings is not None:
+        slices = [s for s in slices if index['innings'][s[0]] == innings]
+        if not slices:
+            return {'error': f"Match {match_id} has no innings {innings}."}
+
+    match = registry.get('data').matches.iloc[index['match_rows'][m]]
+    winner = match['WinningTeam']
+    return {
+        'match_id': int(match_id),
+        'season': str(match['Season']),
+        'date': str(match['Date']),
+        'venue': str(match['Venue']),
+        'teams': [str(match['Team1']), str(match['Team2'])],
+        'winner': winner if isinstance(winner, str) else None,
+        # Targets are first-innings total + 1; a rain-revised (D/L) target isn't in the data
+        'method': match['method'] if isinstance(match['method'], str) else None,
+        'innings': [_innings_json(index, *s) for s in slices],
+    }
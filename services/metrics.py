@@ -0,0 +1,152 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# --- Latency Metrics ---
+# In-process histograms and counters, rendered in the Prometheus text format by /metrics.
+# Service functions are wrapped with @timed; every timing taken while a request is active is
+# also collected for that request's Server-Timing header.
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'ipl_request_duration_seconds': 'Time spent handling a request, by endpoint.',
+    'ipl_requests_total': 'Requests handled, by endpoint and status code.',
+    'ipl_service_duration_seconds': 'Time spent in a service function or request phase.',
+}
+
+_lock = threading.Lock()
+_histograms = {}  # metric -> {labels tuple: Histogram}
+_counters = {}    # metric -> {labels tuple: value}
+_collectors = []  # callables returning extra (metric, type, help, [(labels, value)]) families
+_request_timings = ContextVar('request_timings', default=None)
+
+
+class Histogram:
+    """Counts observations into the fixed BUCKETS (per bucket, not cumulative) plus their sum."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def observe(metric, seconds, **labels):
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _histograms.setdefault(metric, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(seconds)
+
+
+def inc(metric, value=1, **labels):
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _counters.setdefault(metric, {})
+        series[key] = series.get(key, 0) + value
+
+
+def register_collector(collector):
+    """Adds a callable whose metric families (e.g. cache stats) are rendered with the rest."""
+    _collectors.append(collector)
+
+
+def _record(name, seconds):
+    observe('ipl_service_duration_seconds', seconds, function=name)
+    timings = _request_timings.get()
+    if timings is not None:
+        total, calls = timings.get(name, (0.0, 0))
+        timings[name] = (total + seconds, calls + 1)
+
+
+def timed(func):
+    """Decorator recording the latency of a service function (as 'module.function')."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - start)
+    return wrapper
+
+
+@contextmanager
+def span(name):
+    """Times a phase of request handling that isn't a function of its own (e.g. 'serialize')."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+# --- Per-request Timings ---
+
+def start_request():
+    """Starts collecting timings for the request handled by the current thread."""
+    return _request_timings.set({})
+
+
+def finish_request(token):
+    """Stops collecting and returns {name: (seconds, calls)} for the request."""
+    timings = _request_timings.get() or {}
+    _request_timings.reset(token)
+    return timings
+
+
+def server_timing(timings, total):
+    """Formats request timings (plus the total) as a Server-Timing header value, in milliseconds."""
+    entries = [
+        f'{name};dur={seconds * 1000:.3f}' + (f';desc="{calls} calls"' if calls > 1 else '')
+        for name, (seconds, calls) in timings.items()
+    ]
+    entries.append(f'total;dur={total * 1000:.3f}')
+    return ', '.join(entries)
+
+
+# --- Prometheus Text Format ---
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in labels) + '}'
+
+
+def render():
+    """Returns every metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    with _lock:
+        for metric, series in sorted(_histograms.items()):
+            lines += [f'# HELP {metric} {HELP.get(metric, metric)}', f'# TYPE {metric} histogram']
+            for labels, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), histogram.buckets):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+                lines.append(f'{metric}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                lines.append(f'{metric}_count{_format_labels(labels)} {histogram.count}')
+        for metric, series in sorted(_counters.items()):
+            lines += [f'# HELP {metric} {HELP.get(metric, metric)}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{_format_labels(labels)} {value}' for labels, value in sorted(series.items())]
+
+    for collector in _collectors:
+        for metric, kind, help_text, samples in collector():
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+            lines += [f'{metric}{_format_labels(tuple(sorted(labels.items())))} {value}'
+                      for labels, value in samples]
+    return '\n'.join(lines) + '\n'
@@ -1,33 +1,263 @@
-import pickle
-import pandas as pd
+import hashlib
+import json
+import numpy as np
 import os
 
+from . import metrics, registry
+
+FEATURES = ['Team1', 'Team2', 'Venue', 'TossWinner', 'TossDecision']
+
+
+class LinearWinModel:
+    """
+    Plain-array copy of the one-hot + logistic regression pipeline.
+
+    Each feature value maps to one weight, so scoring a fixture is a sum of gathered weights
+    plus the intercept -- no DataFrame, no sparse matrix. Unknown values contribute zero, the
+    same as OneHotEncoder(handle_unknown='ignore').
+    """
+
+    def __init__(self, features, vocabularies, weights, intercept):
+        self.features = list(features)
+        self.vocabularies = [dict(v) for v in vocabularies]  # value -> column in 'weights'
+        # A trailing zero weight absorbs unknown values (index -1).
+        self.weights = np.append(np.asarray(weights, dtype=np.float64), 0.0)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Extracts vocabularies and coefficients from the fitted sklearn Pipeline."""
+        preprocessor = pipeline.named_steps['preprocessor']
+        classifier = pipeline.named_steps['classifier']
+        encoder = preprocessor.named_transformers_['cat']
+        features = preprocessor.transformers_[0][2]
+
+        vocabularies = []
+        offset = 0
+        for categories in encoder.categories_:
+            vocabularies.append({value: offset + i for i, value in enumerate(categories.tolist())})
+            offset += len(categories)
+
+        return cls(features, vocabularies, classifier.coef_[0], classifier.intercept_[0])
+
+    @classmethod
+    def from_artifact(cls, artifact):
+        """Builds the model from the compact artifact written by train_model.py."""
+        vocabularies = []
+        offset = 0
+        for values in artifact['vocabularies']:
+            vocabularies.append({value: offset + i for i, value in enumerate(values)})
+            offset += len(values)
+        return cls(artifact['features'], vocabularies, artifact['coefficients'], artifact['intercept'])
+
+    def to_artifact(self, metadata):
+        """The compact, sklearn-free form of the model: vocabularies in weight order, coefficients, intercept."""
+        return {
+            'format': ARTIFACT_FORMAT,
+            'features': self.features,
+            'vocabularies': [sorted(v, key=v.get) for v in self.vocabularies],
+            'coefficients': self.weights[:-1].tolist(),
+            'intercept': self.intercept,
+            'metadata': metadata,
+        }
+
+    def encode(self, feature, values):
+        """Maps raw values of one feature to weight columns (-1 for unknown values or unused features)."""
+        if feature not in self.features:
+            return np.full(len(values), -1, dtype=np.int64)
+        vocabulary = self.vocabularies[self.features.index(feature)]
+        return np.fromiter((vocabulary.get(v, -1) for v in values), dtype=np.int64, count=len(values))
+
+    def predict_proba_codes(self, codes):
+        """Returns P(Team1 wins) for an (n_rows, n_features) array of encoded columns."""
+        logits = self.intercept + self.weights[codes].sum(axis=1)
+        # The classifier's positive class is 'Team2 wins' (outcome == 1).
+        return 1.0 / (1.0 + np.exp(logits))
+
+    def predict_proba(self, columns):
+        """Returns P(Team1 wins) for a dict of equally long value lists keyed by feature name."""
+        codes = np.column_stack([self.encode(f, columns[f]) for f in self.features])
+        return self.predict_proba_codes(codes)
+
+
 # --- Load Model ---
 model_path = 'model/win_predictor.pkl'
-model = None
+artifact_path = 'model/win_predictor.json'
+ARTIFACT_FORMAT = 1
+
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def verify_against_pipeline(compiled, pipeline, n=2000, seed=0):
+    """
+    Scores 'n' random fixtures (known and unknown values) with both the compiled model and
+    the sklearn pipeline and returns the largest difference in P(Team1 wins).
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    values = sorted({v for vocabulary in compiled.vocabularies for v in vocabulary} | {'Unknown'})
+    columns = {f: rng.choice(values, n).tolist() for f in FEATURES}
+    expected = pipeline.predict_proba(pd.DataFrame(columns))[:, 0]
+    return float(np.abs(compiled.predict_proba(columns) - expected).max())
+
+
+def _load_pipeline():
+    """Unpickles the sklearn pipeline (this is what pulls in sklearn and pandas)."""
+    import pickle
 
-if os.path.exists(model_path):
     with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-else:
-    print("Warning: Model file 'win_predictor.pkl' not found.")
+        return pickle.load(f)
+
+
+def _load_artifact():
+    """Loads the compact artifact, or returns None if it is missing, unreadable or older than the pickle."""
+    if not os.path.exists(artifact_path):
+        return None
+    try:
+        with open(artifact_path, 'rb') as f:
+            artifact_bytes = f.read()
+        artifact = json.loads(artifact_bytes)
+        if artifact.get('format') != ARTIFACT_FORMAT:
+            print(f"Warning: Model artifact has format {artifact.get('format')}, expected {ARTIFACT_FORMAT}.")
+            return None
+        compiled = LinearWinModel.from_artifact(artifact)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: Ignoring unreadable model artifact: {e}")
+        return None
 
+    # The artifact records the pipeline it was exported from; a retrained pickle makes it stale.
+    if os.path.exists(model_path) and file_sha256(model_path) != artifact['metadata'].get('pipeline_sha256'):
+        print("Warning: Model artifact is stale (the pickled pipeline changed); re-run train_model.py.")
+        return None
+    if os.environ.get('MODEL_VERIFY', '0') not in ('', '0', 'false') and os.path.exists(model_path):
+        difference = verify_against_pipeline(compiled, _load_pipeline())
+        if difference > 1e-9:
+            print(f"Warning: Model artifact disagrees with the pickled pipeline (max difference {difference:.2e}).")
+            return None
+
+    return {
+        'pipeline': None,
+        'compiled': compiled,
+        'version': hashlib.sha256(artifact_bytes).hexdigest(),
+        'metadata': artifact['metadata'],
+    }
+
+
+def load_model(parts=None):
+    """
+    Loads the compact artifact (plain JSON, no sklearn import), falling back to unpickling the
+    pipeline and compiling its plain-array copy when there is no usable artifact.
+    """
+    model = _load_artifact()
+    if model is not None:
+        return model
+
+    if not os.path.exists(model_path):
+        print("Warning: Model file 'win_predictor.pkl' not found.")
+        return {'pipeline': None, 'compiled': None, 'version': None, 'metadata': None}
+
+    pipeline = _load_pipeline()
+    return {
+        'pipeline': pipeline,
+        'compiled': LinearWinModel.from_pipeline(pipeline),
+        'version': file_sha256(model_path),
+        'metadata': None,
+    }
+
+# Loaded on first use (or by the warm-up thread), not at import time.
+registry.register('model', load_model)
+
+
+def get_compiled_model():
+    return registry.get('model')['compiled']
+
+
+def get_model_version():
+    return registry.get('model')['version']
+
+@metrics.timed
 def predict_win_probability(data):
     """
     Predicts win probability using the loaded model.
     'data' is a dictionary with keys: 'Team1', 'Team2', etc.
     """
-    if model is None:
+    compiled_model = get_compiled_model()
+    if compiled_model is None:
         return {'error': 'Model not loaded'}
 
-    input_df = pd.DataFrame([data])
-    
-    probabilities = model.predict_proba(input_df)[0]
-    
+    team1_prob = compiled_model.predict_proba({f: [data[f]] for f in FEATURES})[0]
+
     # --- FIX APPLIED HERE ---
     # The keys to get the team names from the 'data' dictionary must match
     # what the API sent: 'Team1' and 'Team2' (with capital letters).
     return {
-        data['Team1']: round(probabilities[0] * 100, 2),
-        data['Team2']: round(probabilities[1] * 100, 2)
-    }
\ No newline at end of file
+        data['Team1']: round(team1_prob * 100, 2),
+        data['Team2']: round((1 - team1_prob) * 100, 2)
+    }
+
+
+@metrics.timed
+def predict_win_probabilities(fixtures):
+    """Scores a list of fixture dicts (same keys as predict_win_probability) in one vectorized call."""
+    compiled_model = get_compiled_model()
+    if compiled_model is None:
+        return {'error': 'Model not loaded'}
+    if not fixtures:
+        return []
+
+    team1_probs = compiled_model.predict_proba({f: [fx[f] for fx in fixtures] for f in FEATURES})
+    return [
+        {
+            'team1': fx['Team1'],
+            'team2': fx['Team2'],
+            'venue': fx['Venue'],
+            'team1_win_probability': round(p * 100, 2),
+            'team2_win_probability': round((1 - p) * 100, 2),
+        }
+        for fx, p in zip(fixtures, team1_probs.tolist())
+    ]
+
+
+@metrics.timed
+def predict_win_matrix(teams, venue, toss_decision=None):
+    """
+    Scores every ordered team pair at one venue. matrix[i][j] is the chance (in %) that
+    teams[i], listed as Team1, beats teams[j]. Without a toss decision the four toss outcomes
+    (either side winning it, batting or fielding) are averaged.
+    """
+    compiled_model = get_compiled_model()
+    if compiled_model is None:
+        return {'error': 'Model not loaded'}
+
+    n = len(teams)
+    team_codes = compiled_model.encode('Team1', teams)
+    team2_codes = compiled_model.encode('Team2', teams)
+    toss_codes = compiled_model.encode('TossWinner', teams)
+    venue_code = compiled_model.encode('Venue', [venue])[0]
+    decisions = [toss_decision] if toss_decision else ['bat', 'field']
+
+    # Build every (Team1, Team2, toss winner, decision) combination as code arrays
+    rows, cols = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+    rows, cols = rows.ravel(), cols.ravel()
+    probs = np.zeros(n * n)
+    scenarios = 0
+    for decision_code in compiled_model.encode('TossDecision', decisions):
+        for toss_side in (rows, cols):
+            codes = np.column_stack([
+                team_codes[rows],
+                team2_codes[cols],
+                np.full(n * n, venue_code),
+                toss_codes[toss_side],
+                np.full(n * n, decision_code),
+            ])
+            probs += compiled_model.predict_proba_codes(codes)
+            scenarios += 1
+
+    matrix = np.round(probs / scenarios * 100, 2).reshape(n, n).tolist()
+    for i in range(n):
+        matrix[i][i] = None
+    return {'venue': venue, 'teams': list(teams), 'matrix': matrix}
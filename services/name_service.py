@@ -0,0 +1,159 @@
+import heapq
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from . import registry
+from .data_service import team_aliases
+from .team_service import teams_in
+
+
+def _ngrams(text, n=2):
+    """Returns the set of character n-grams of a (space-padded) string."""
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class NameResolver:
+    """
+    Resolves free-text names to official ones.
+
+    Built once from the list of known names: an exact lowercase/alias hash map, an n-gram
+    index that narrows fuzzy lookups to a handful of candidates, a sorted token list for
+    prefix autocomplete, and an LRU of recent resolutions.
+    """
+
+    def __init__(self, names, aliases=None, cutoff=0.6, max_candidates=40, cache_size=2048):
+        self.cutoff = cutoff
+        self.max_candidates = max_candidates
+
+        # --- Exact lookups ---
+        self._aliases = {alias.lower(): official for alias, official in (aliases or {}).items()}
+        self._exact = {}
+        for name in names:
+            self._exact.setdefault(name.lower(), name)
+        self._keys = list(self._exact)
+
+        # --- N-gram candidate index (gram -> positions in self._keys) ---
+        self._grams = defaultdict(list)
+        self._gram_counts = []
+        for i, key in enumerate(self._keys):
+            grams = _ngrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams[gram].append(i)
+
+        # --- Token prefix index for autocomplete ---
+        tokens = set()
+        for key in self._keys:
+            tokens.add((key, key))
+            for token in key.split():
+                tokens.add((token, key))
+        self._tokens = sorted(tokens)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _candidates(self, key):
+        """Returns the known names sharing the most n-grams with 'key'."""
+        grams = _ngrams(key)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self._grams.get(gram, ()))
+        # Rank by Dice overlap so long names don't crowd out short close matches
+        ranked = heapq.nlargest(
+            self.max_candidates, counts,
+            key=lambda i: 2 * counts[i] / (len(grams) + self._gram_counts[i])
+        )
+        return [self._keys[i] for i in ranked]
+
+    def _scored(self, key, cutoff):
+        """Scores the n-gram candidates the same way difflib.get_close_matches does."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(key)
+        scored = []
+        for candidate in self._candidates(key):
+            matcher.set_seq1(candidate)
+            if (matcher.real_quick_ratio() >= cutoff and
+                    matcher.quick_ratio() >= cutoff and
+                    matcher.ratio() >= cutoff):
+                scored.append((matcher.ratio(), candidate))
+        scored.sort(reverse=True)
+        return scored
+
+    def _resolve(self, name):
+        name_lower = name.strip().lower()
+        if name_lower in self._aliases:
+            return self._aliases[name_lower]
+        # Direct match check first for performance
+        if name_lower in self._exact:
+            return self._exact[name_lower]
+
+        scored = self._scored(name_lower, self.cutoff)
+        if scored:
+            return self._exact[scored[0][1]]
+        return name # Return original if no good match
+
+    @property
+    def names(self):
+        """The official names it resolves to."""
+        return list(self._exact.values())
+
+    def knows(self, names):
+        """True if every one of 'names' is already indexed."""
+        return all(name.lower() in self._exact for name in names)
+
+    def suggest(self, query, limit=10):
+        """Returns up to 'limit' names for autocomplete: prefix matches first, then fuzzy ones."""
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        results = []
+        seen = set()
+        start = bisect_left(self._tokens, (query, ''))
+        for token, key in self._tokens[start:]:
+            if not token.startswith(query) or len(results) >= limit:
+                break
+            if key not in seen:
+                seen.add(key)
+                results.append(self._exact[key])
+
+        if len(results) < limit:
+            for _, key in self._scored(query, cutoff=0.4):
+                if len(results) >= limit:
+                    break
+                if key not in seen:
+                    seen.add(key)
+                    results.append(self._exact[key])
+        return results
+
+
+def build_name_index(parts):
+    data = parts['data']
+    return {
+        'player': NameResolver(data.player_names),
+        'team': NameResolver(teams_in(data.matches), aliases=team_aliases),
+    }
+
+def update_name_index(parts, previous, change):
+    """Keeps each resolver (and its warm cache) unless the new rows bring names it doesn't know."""
+    data, deliveries = parts['data'], change.deliveries
+    players = set(deliveries['batter'].dropna()) | set(deliveries['bowler'].dropna())
+    # A resolver builds in milliseconds, so a new name just rebuilds the one it belongs to
+    return {
+        'player': previous['player'] if previous['player'].knows(players) else NameResolver(data.player_names),
+        'team': (previous['team'] if previous['team'].knows(teams_in(change.matches)) else
+                 NameResolver(teams_in(data.matches), aliases=team_aliases)),
+    }
+
+# Built once, together with the data it indexes
+registry.register('name_index', build_name_index, updater=update_name_index)
+
+
+def get_player_resolver():
+    return registry.get('name_index')['player']
+
+
+def get_team_resolver():
+    return registry.get('name_index')['team']
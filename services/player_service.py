@@ -1,143 +1,367 @@
 import numpy as np
-from difflib import get_close_matches
-from .data_service import deliveries_df, matches_df, player_names, team_aliases
+import pandas as pd
+from . import metrics, registry
+from .data_service import get_dataset, code_mask, PHASES
+from .name_service import get_player_resolver
 
+@metrics.timed
 def standardize_player_name(name):
     """Finds the closest matching official player name."""
-    name_lower = name.strip().lower()
-    # Direct match check first for performance
-    if name_lower in [p.lower() for p in player_names]:
-        return [p for p in player_names if p.lower() == name_lower][0]
-    
-    match = get_close_matches(name_lower, [p.lower() for p in player_names], n=1, cutoff=0.6)
-    if match:
-        # Find original casing
-        return [p for p in player_names if p.lower() == match[0]][0]
-    return name # Return original if no good match
+    return get_player_resolver().resolve(name)
+
+# --- Run accounting ---
+# Shared by every batting and bowling aggregate so careers, phases and leaderboards agree.
+
+def balls_faced(deliveries):
+    """Balls that count against the batter: everything but wides."""
+    return ~deliveries['extra_type'].isin(['wides'])
+
+
+def balls_bowled(deliveries):
+    """Legal deliveries: wides and no-balls aren't part of the over."""
+    return ~deliveries['extra_type'].isin(['wides', 'noballs'])
+
+
+def bowler_runs(deliveries):
+    """Runs charged to the bowler: byes and legbyes aren't."""
+    runs = deliveries['total_run'] - deliveries['extras_run']
+    return runs.where(~deliveries['extra_type'].isin(['byes', 'legbyes']), 0)
+
+
+# --- Precomputed career aggregates ---
+# Both summaries are served from tables built once at load, so a request is a dict lookup
+# instead of a scan over every delivery.
+
+def build_batting_aggregates(deliveries):
+    """Builds per-batter career rows (runs, balls, dismissals, boundaries, milestones) in one pass."""
+    balls = pd.DataFrame({
+        'batter': deliveries['batter'],
+        'ID': deliveries['ID'],
+        'runs': deliveries['batsman_run'],
+        'legal': balls_faced(deliveries),
+        'out': deliveries['player_out'] == deliveries['batter'],
+        'fours': deliveries['batsman_run'] == 4,
+        'sixes': deliveries['batsman_run'] == 6,
+    })
+
+    career = balls.groupby('batter', observed=True).agg(
+        innings=('ID', 'nunique'),
+        runs=('runs', 'sum'),
+        balls_faced=('legal', 'sum'),
+        dismissals=('out', 'sum'),
+        fours=('fours', 'sum'),
+        sixes=('sixes', 'sum'),
+    )
+
+    # Runs per innings drive the milestone counts and the highest score
+    innings_scores = balls.groupby(['batter', 'ID'], observed=True)['runs'].sum()
+    by_batter = innings_scores.groupby(level='batter', observed=True)
+    career['fifties'] = ((innings_scores >= 50) & (innings_scores < 100)).groupby(level='batter', observed=True).sum()
+    career['hundreds'] = (innings_scores >= 100).groupby(level='batter', observed=True).sum()
+    career['highest_score'] = by_batter.max()
+
+    return career.astype(int).to_dict('index'), innings_scores
+
+
+def build_bowling_aggregates(deliveries):
+    """Builds per-bowler career rows (runs conceded, legal balls, wickets, hauls, best figures) in one pass."""
+    balls = pd.DataFrame({
+        'bowler': deliveries['bowler'],
+        'ID': deliveries['ID'],
+        'bowler_run': bowler_runs(deliveries),
+        'legal': balls_bowled(deliveries),
+        'wicket': deliveries['isWicketDelivery'] == 1,
+        'wicket_count': deliveries['isWicketDelivery'],
+    })
+
+    career = balls.groupby('bowler', observed=True).agg(
+        innings=('ID', 'nunique'),
+        runs_conceded=('bowler_run', 'sum'),
+        balls_bowled=('legal', 'sum'),
+        wickets=('wicket', 'sum'),
+    )
+
+    innings_stats = balls.groupby(['bowler', 'ID'], observed=True).agg(
+        wickets_taken=('wicket_count', 'sum'),
+        runs_given=('bowler_run', 'sum')
+    )
+    career['three_wickets'] = (innings_stats['wickets_taken'] >= 3).groupby(level='bowler', observed=True).sum()
+    career['five_wickets'] = (innings_stats['wickets_taken'] >= 5).groupby(level='bowler', observed=True).sum()
+
+    # Best figures: most wickets, then fewest runs, in each bowler's innings
+    best = (innings_stats.reset_index()
+            .sort_values(by=['bowler', 'wickets_taken', 'runs_given'], ascending=[True, False, True])
+            .drop_duplicates('bowler')
+            .set_index('bowler'))
+    career['best_wickets'] = best['wickets_taken']
+    career['best_runs'] = best['runs_given']
+
+    return career.astype(int).to_dict('index'), innings_stats
+
+
+def build_matchup_cube(deliveries):
+    """
+    Builds the sparse batter x bowler matchup table. Only pairs that actually faced each
+    other get a cell: (batter, bowler) -> runs, legal balls, dismissals, fours and sixes.
+    Also returns per-batter and per-bowler lists of their cells for top-N queries.
+    """
+    balls = pd.DataFrame({
+        'batter': deliveries['batter'],
+        'bowler': deliveries['bowler'],
+        'runs': deliveries['batsman_run'],
+        'balls': balls_faced(deliveries),
+        'dismissals': deliveries['player_out'] == deliveries['batter'],
+        'fours': deliveries['batsman_run'] == 4,
+        'sixes': deliveries['batsman_run'] == 6,
+    })
+    cells = balls.groupby(['batter', 'bowler'], observed=True).sum().astype(int)
+
+    cube = {}
+    by_batter, by_bowler = {}, {}
+    for (batter, bowler), row in zip(cells.index, cells.to_dict('records')):
+        cube[(batter, bowler)] = row
+        by_batter.setdefault(batter, []).append((bowler, row))
+        by_bowler.setdefault(bowler, []).append((batter, row))
+    return cube, by_batter, by_bowler
+
+
+def season_column(deliveries, matches):
+    """The Season of every delivery's match, as a categorical sharing the matches' categories."""
+    season = matches['Season'].astype('category')
+    positions = pd.Index(matches['ID']).get_indexer(deliveries['ID'])
+    codes = np.where(positions >= 0, season.cat.codes.to_numpy()[positions], -1)
+    return pd.Categorical.from_codes(codes, dtype=season.dtype)
+
+
+def build_phase_stats(deliveries, matches):
+    """
+    Aggregates batting and bowling by (player, phase, season) in one grouped pass each, using
+    the same run accounting as the career summaries. Returns the two tables, indexed by
+    (player, phase, season).
+    """
+    season = season_column(deliveries, matches)
+    batting = pd.DataFrame({
+        'player': deliveries['batter'],
+        'phase': deliveries['phase'],
+        'season': season,
+        'runs': deliveries['batsman_run'],
+        'balls': balls_faced(deliveries),
+        'dismissals': deliveries['player_out'] == deliveries['batter'],
+        'fours': deliveries['batsman_run'] == 4,
+        'sixes': deliveries['batsman_run'] == 6,
+    }).groupby(['player', 'phase', 'season'], observed=True).sum().astype(int)
+
+    bowling = pd.DataFrame({
+        'player': deliveries['bowler'],
+        'phase': deliveries['phase'],
+        'season': season,
+        'runs': bowler_runs(deliveries),
+        'balls': balls_bowled(deliveries),
+        'wickets': deliveries['isWicketDelivery'] == 1,
+    }).groupby(['player', 'phase', 'season'], observed=True).sum().astype(int)
+    return batting, bowling
+
+
+def _index_phase_table(table):
+    """Turns a (player, phase, season) table into {(player, season): {phase: row}}; season None is the career."""
+    index = {}
+    for (player, phase, season), row in zip(table.index, table.to_dict('records')):
+        index.setdefault((player, str(season)), {})[phase] = row
+    career = table.groupby(level=['player', 'phase'], observed=True).sum()
+    for (player, phase), row in zip(career.index, career.to_dict('records')):
+        index.setdefault((player, None), {})[phase] = row
+    return index
+
+
+def build_mom_counts(matches):
+    """Counts Player of the Match awards per player."""
+    return {name: int(count) for name, count in matches['Player_of_Match'].value_counts().items()}
+
+
+def build_career_index(parts):
+    data = parts['data']
+    if data.deliveries is None or data.matches is None:
+        return {'batting': {}, 'batting_innings': None, 'bowling': {}, 'bowling_innings': None, 'mom': {}}
+    batting, batting_innings = build_batting_aggregates(data.deliveries)
+    bowling, bowling_innings = build_bowling_aggregates(data.deliveries)
+    return {
+        'batting': batting,
+        'batting_innings': batting_innings,
+        'bowling': bowling,
+        'bowling_innings': bowling_innings,
+        'mom': build_mom_counts(data.matches),
+    }
+
+
+def build_matchup_index(parts):
+    data = parts['data']
+    if data.deliveries is None:
+        return {'cube': {}, 'by_batter': {}, 'by_bowler': {}}
+    cube, by_batter, by_bowler = build_matchup_cube(data.deliveries)
+    return {'cube': cube, 'by_batter': by_batter, 'by_bowler': by_bowler}
+
+
+def build_phase_index(parts):
+    data = parts['data']
+    if data.deliveries is None or data.matches is None:
+        return None
+    batting, bowling = build_phase_stats(data.deliveries, data.matches)
+    return {
+        'batting': batting,
+        'bowling': bowling,
+        'batting_by_player': _index_phase_table(batting),
+        'bowling_by_player': _index_phase_table(bowling),
+    }
+
+
+# --- Incremental updates ---
+# New matches only add innings, so career and matchup rows of the new deliveries are built
+# the same way and added to the previous ones; untouched rows are shared, not copied.
+
+def merge_batting(previous, new):
+    """Adds new batting career rows to the previous ones (the highest score is the larger one)."""
+    merged = dict(previous)
+    for player, row in new.items():
+        old = merged.get(player)
+        if old is not None:
+            row = dict({key: old[key] + value for key, value in row.items()},
+                       highest_score=max(old['highest_score'], row['highest_score']))
+        merged[player] = row
+    return merged
+
+
+def merge_bowling(previous, new):
+    """Adds new bowling career rows to the previous ones (best figures: most wickets, then fewest runs)."""
+    merged = dict(previous)
+    for player, row in new.items():
+        old = merged.get(player)
+        if old is not None:
+            best = row if (row['best_wickets'], -row['best_runs']) > (old['best_wickets'], -old['best_runs']) else old
+            row = dict({key: old[key] + value for key, value in row.items()},
+                       best_wickets=best['best_wickets'], best_runs=best['best_runs'])
+        merged[player] = row
+    return merged
+
+
+def update_career_index(parts, previous, change):
+    batting, batting_innings = build_batting_aggregates(change.deliveries)
+    bowling, bowling_innings = build_bowling_aggregates(change.deliveries)
+    mom = build_mom_counts(change.matches)
+    return {
+        'batting': merge_batting(previous['batting'], batting),
+        'batting_innings': pd.concat([previous['batting_innings'], batting_innings]),
+        'bowling': merge_bowling(previous['bowling'], bowling),
+        'bowling_innings': pd.concat([previous['bowling_innings'], bowling_innings]),
+        'mom': {name: previous['mom'].get(name, 0) + count for name, count in mom.items()},
+    }
+
+
+def _reindex_cells(lists, cube, player, opponents, key):
+    """Rebuilds one player's list of (opponent, cell), ordered by opponent like a full build."""
+    opponents = {opponent for opponent, _ in lists.get(player, [])} | opponents
+    lists[player] = [(opponent, cube[key(opponent)]) for opponent in sorted(opponents)]
+
+
+def update_matchup_index(parts, previous, change):
+    new_cells, new_by_batter, new_by_bowler = build_matchup_cube(change.deliveries)
+    cube = dict(previous['cube'])
+    for pair, row in new_cells.items():
+        old = cube.get(pair)
+        cube[pair] = row if old is None else {key: old[key] + value for key, value in row.items()}
+
+    by_batter, by_bowler = dict(previous['by_batter']), dict(previous['by_bowler'])
+    for batter, cells in new_by_batter.items():
+        _reindex_cells(by_batter, cube, batter, {bowler for bowler, _ in cells}, lambda bowler: (batter, bowler))
+    for bowler, cells in new_by_bowler.items():
+        _reindex_cells(by_bowler, cube, bowler, {batter for batter, _ in cells}, lambda batter: (batter, bowler))
+    return {'cube': cube, 'by_batter': by_batter, 'by_bowler': by_bowler}
+
+
+registry.register('career_aggregates', build_career_index, updater=update_career_index)
+registry.register('matchup_cube', build_matchup_index, updater=update_matchup_index)
+registry.register('phase_stats', build_phase_index)
+
 
 #batsman summary
+@metrics.timed
 def get_batsman_summary(player_name):
     """Generates a comprehensive summary of a batsman's performance."""
-    if deliveries_df is None or matches_df is None:
-        return {}
-    
-    player_df = deliveries_df[deliveries_df['batter'] == player_name]
-    if player_df.empty:
+    careers = registry.get('career_aggregates')
+    career = careers['batting'].get(player_name)
+    if career is None:
         return {}
 
-    # --- Basic Stats ---
-    runs = int(player_df['batsman_run'].sum())
-    balls_faced = player_df[~player_df['extra_type'].isin(['wides'])].shape[0]
-    
-    # --- Innings & Dismissals ---
-    innings = int(player_df['ID'].nunique())
-    dismissals = player_df[player_df['player_out'] == player_name].shape[0]
-    not_out = innings - dismissals
+    runs = career['runs']
+    balls_faced = career['balls_faced']
+    dismissals = career['dismissals']
 
     # --- Averages & Strike Rate ---
     avg = (runs / dismissals) if dismissals > 0 else float('inf')
     strike_rate = (runs / balls_faced * 100) if balls_faced > 0 else 0.0
 
-    # --- Scores & Milestones ---
-    # Group by match to calculate runs per innings
-    innings_scores = player_df.groupby('ID')['batsman_run'].sum()
-    
-    fifties = int(innings_scores[(innings_scores >= 50) & (innings_scores < 100)].count())
-    hundreds = int(innings_scores[innings_scores >= 100].count())
-    highest_score = int(innings_scores.max()) if not innings_scores.empty else 0
-    
-    # --- Awards ---
-    # Man of the Match awards are in the matches_df
-    mom_awards = int(matches_df[matches_df['Player_of_Match'] == player_name].shape[0])
-
     # --- Final Dictionary ---
     return {
-        "Innings": innings,
+        "Innings": career['innings'],
         "Total Runs": runs,
         "Dismissals": dismissals,
-        "Not Out": not_out,
+        "Not Out": career['innings'] - dismissals,
         "Average": f"{avg:.2f}",
         "Strike Rate": f"{strike_rate:.2f}",
-        "Fifties": fifties,
-        "Hundreds": hundreds,
-        "Highest Score": highest_score,
-        "Fours": int(player_df[player_df['batsman_run'] == 4].shape[0]),
-        "Sixes": int(player_df[player_df['batsman_run'] == 6].shape[0]),
-        "Man of the Match": mom_awards,
+        "Fifties": career['fifties'],
+        "Hundreds": career['hundreds'],
+        "Highest Score": career['highest_score'],
+        "Fours": career['fours'],
+        "Sixes": career['sixes'],
+        "Man of the Match": careers['mom'].get(player_name, 0),
     }
 
 #boller summary
+@metrics.timed
 def get_bowler_summary(player_name):
     """Generates a comprehensive summary of a bowler's performance."""
-    if deliveries_df is None or matches_df is None:
-        return {}
-    
-    player_df = deliveries_df[deliveries_df['bowler'] == player_name].copy()
-    if player_df.empty:
+    careers = registry.get('career_aggregates')
+    career = careers['bowling'].get(player_name)
+    if career is None:
         return {}
 
-    # --- Accurately calculate runs conceded by the bowler ---
-    # This excludes byes and legbyes, which aren't charged to the bowler.
-    player_df['bowler_run'] = player_df['total_run'] - player_df['extras_run']
-    player_df.loc[player_df['extra_type'].isin(['byes', 'legbyes']), 'bowler_run'] = 0
-
-    # --- Basic Stats ---
-    innings = int(player_df['ID'].nunique())
-    runs_conceded = int(player_df['bowler_run'].sum())
-    balls_bowled = player_df[~player_df['extra_type'].isin(['wides', 'noballs'])].shape[0]
+    runs_conceded = career['runs_conceded']
+    balls_bowled = career['balls_bowled']
+    wickets = career['wickets']
     overs_bowled = f"{(balls_bowled // 6)}.{balls_bowled % 6}"
-    
+
     # --- Wickets & Averages ---
-    wickets = int(player_df[player_df['isWicketDelivery'] == 1].shape[0])
     economy = (runs_conceded / (balls_bowled / 6)) if balls_bowled > 0 else 0.0
     average = (runs_conceded / wickets) if wickets > 0 else float('inf')
     strike_rate = (balls_bowled / wickets) if wickets > 0 else float('inf')
-    
-    # --- Milestones & Best Performance ---
-    # Group by match to calculate wickets per innings
-    innings_stats = player_df.groupby('ID').agg(
-        wickets_taken=('isWicketDelivery', 'sum'),
-        runs_given=('bowler_run', 'sum')
-    )
-    
-    three_wickets = int(innings_stats[innings_stats['wickets_taken'] >= 3].count()['wickets_taken'])
-    five_wickets = int(innings_stats[innings_stats['wickets_taken'] >= 5].count()['wickets_taken'])
-    
-    # Calculate best bowling figures
-    if not innings_stats.empty:
-        best_figures_row = innings_stats.sort_values(by=['wickets_taken', 'runs_given'], ascending=[False, True]).iloc[0]
-        best_figures = f"{int(best_figures_row['wickets_taken'])}/{int(best_figures_row['runs_given'])}"
-    else:
-        best_figures = "N/A"
-
-    # --- Awards ---
-    mom_awards = int(matches_df[matches_df['Player_of_Match'] == player_name].shape[0])
 
     # --- Final Dictionary ---
     return {
-        "Innings": innings,
+        "Innings": career['innings'],
         "Overs Bowled": overs_bowled,
         "Wickets": wickets,
         "Runs Conceded": runs_conceded,
         "Average": f"{average:.2f}",
         "Economy": f"{economy:.2f}",
         "Strike Rate": f"{strike_rate:.2f}",
-        "3+ Wicket Hauls": three_wickets,
-        "5+ Wicket Hauls": five_wickets,
-        "Best Figures": best_figures,
-        "Man of the Match": mom_awards,
+        "3+ Wicket Hauls": career['three_wickets'],
+        "5+ Wicket Hauls": career['five_wickets'],
+        "Best Figures": f"{career['best_wickets']}/{career['best_runs']}",
+        "Man of the Match": careers['mom'].get(player_name, 0),
     }
 
 
+@metrics.timed
 def get_player_runs_per_season(player_name):
     """Calculates a player's runs season by season."""
+    data = get_dataset()
+    deliveries_df, matches_df = data.deliveries, data.matches
     if deliveries_df is None or matches_df is None: return {}
 
-    player_df = deliveries_df[deliveries_df['batter'] == player_name]
+    player_df = deliveries_df[code_mask(deliveries_df['batter'], player_name)]
     # Merge with matches to get Season info
     merged_df = player_df.merge(matches_df[['ID', 'Season']], on='ID')
     
-    seasonal_runs = merged_df.groupby('Season')['batsman_run'].sum().sort_index()
+    seasonal_runs = merged_df.groupby('Season', observed=True)['batsman_run'].sum().sort_index()
 
     return {
         'seasons': seasonal_runs.index.astype(str).tolist(),
@@ -145,53 +369,70 @@ def get_player_runs_per_season(player_name):
     }
 
 
-def get_player_vs_player_stats(batsman, bowler):
-    """Calculates head-to-head stats for a batsman against a bowler."""
-    if deliveries_df is None: return {}
-    
-    h2h_df = deliveries_df[(deliveries_df['batter'] == batsman) & (deliveries_df['bowler'] == bowler)]
-    if h2h_df.empty:
-        return {"runs_scored": 0, "dismissals": 0, "strike_rate": 0.0}
-
-    runs = int(h2h_df['batsman_run'].sum())
-    balls = h2h_df[~h2h_df['extra_type'].isin(['wides'])].shape[0]
-    dismissals = int(h2h_df[h2h_df['player_out'] == batsman].shape[0])
+def _matchup_stats(cell):
+    """Formats one matchup cell the way the head-to-head endpoints report it."""
+    runs, balls = cell['runs'], cell['balls']
     strike_rate = (runs / balls * 100) if balls > 0 else 0.0
-
     return {
         "runs_scored": runs,
         "balls_faced": balls,
-        "dismissals": dismissals,
+        "dismissals": cell['dismissals'],
         "strike_rate": f"{strike_rate:.2f}"
     }
 
-def get_performance_by_phase(player_name, role):
-    """Analyzes player performance across different match phases."""
-    if deliveries_df is None: return {}
+@metrics.timed
+def get_player_vs_player_stats(batsman, bowler):
+    """Calculates head-to-head stats for a batsman against a bowler."""
+    if get_dataset().deliveries is None: return {}
+
+    cell = registry.get('matchup_cube')['cube'].get((batsman, bowler))
+    if cell is None:
+        return {"runs_scored": 0, "dismissals": 0, "strike_rate": 0.0}
+    return _matchup_stats(cell)
 
-    phases = {
-        'Powerplay': (deliveries_df['overs'] >= 0) & (deliveries_df['overs'] < 6),
-        'Middle': (deliveries_df['overs'] >= 6) & (deliveries_df['overs'] < 15),
-        'Death': (deliveries_df['overs'] >= 15) & (deliveries_df['overs'] < 20)
-    }
+@metrics.timed
+def get_top_matchups(player_name, role, n=10, min_balls=12):
+    """
+    Ranks a player's matchups from the matchup cube. For a batsman: the toughest bowlers
+    (most dismissals, then lowest strike rate). For a bowler: the favourite victims (most
+    dismissals, then fewest runs per ball).
+    """
+    matchups = registry.get('matchup_cube')
+    if role == 'batsman':
+        cells = matchups['by_batter'].get(player_name, [])
+    else:
+        cells = matchups['by_bowler'].get(player_name, [])
+
+    qualified = [(opponent, cell) for opponent, cell in cells if cell['balls'] >= min_balls]
+    qualified.sort(key=lambda item: (-item[1]['dismissals'], item[1]['runs'] / item[1]['balls'], item[0]))
+
+    results = []
+    for opponent, cell in qualified[:n]:
+        stats = _matchup_stats(cell)
+        stats['opponent'] = opponent
+        stats['fours'] = cell['fours']
+        stats['sixes'] = cell['sixes']
+        results.append(stats)
+    return results
+
+@metrics.timed
+def get_performance_by_phase(player_name, role, season=None):
+    """Analyzes player performance across different match phases (optionally in one season)."""
+    phase_stats = registry.get('phase_stats')
+    if phase_stats is None: return {}
 
     results = {}
     if role == 'batsman':
-        df = deliveries_df[deliveries_df['batter'] == player_name]
-        for phase, condition in phases.items():
-            phase_df = df[condition]
-            runs = int(phase_df['batsman_run'].sum())
-            balls = phase_df[~phase_df['extra_type'].isin(['wides'])].shape[0]
-            strike_rate = (runs / balls * 100) if balls > 0 else 0
-            results[phase] = {'runs': runs, 'strike_rate': round(strike_rate, 2)}
+        rows = phase_stats['batting_by_player'].get((player_name, season), {})
+        for phase in PHASES:
+            row = rows.get(phase, {'runs': 0, 'balls': 0})
+            strike_rate = (row['runs'] / row['balls'] * 100) if row['balls'] > 0 else 0
+            results[phase] = {'runs': row['runs'], 'strike_rate': round(strike_rate, 2)}
     else: # bowler
-        df = deliveries_df[deliveries_df['bowler'] == player_name]
-        for phase, condition in phases.items():
-            phase_df = df[condition]
-            runs = int(phase_df['total_run'].sum())
-            wickets = int(phase_df['isWicketDelivery'].sum())
-            balls = phase_df[~phase_df['extra_type'].isin(['wides', 'noballs'])].shape[0]
-            economy = (runs / (balls / 6)) if balls > 0 else 0
-            results[phase] = {'wickets': wickets, 'economy': round(economy, 2)}
-            
-    return results
\ No newline at end of file
+        rows = phase_stats['bowling_by_player'].get((player_name, season), {})
+        for phase in PHASES:
+            row = rows.get(phase, {'runs': 0, 'balls': 0, 'wickets': 0})
+            economy = (row['runs'] / (row['balls'] / 6)) if row['balls'] > 0 else 0
+            results[phase] = {'wickets': row['wickets'], 'economy': round(economy, 2)}
+
+    return results
@@ -0,0 +1,95 @@
+import heapq
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# --- Slow Request Profiler ---
+# Opt-in (PROFILE_SLOW_REQUESTS=1). A daemon thread samples the Python stack of every thread
+# that is handling a request; when a request finishes among the slowest seen so far, its
+# samples are written to PROFILE_DIR as folded stacks ("outer;inner;leaf count", the input
+# format of flamegraph tools). Only the PROFILE_KEEP slowest are kept on disk per process.
+
+
+def _fold(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+class SlowRequestProfiler:
+    def __init__(self, directory, interval=0.005, keep=20):
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self._active = {}   # thread id -> Counter of folded stacks
+        self._slowest = []  # min-heap of (duration, path)
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_started(self):
+        # Started lazily in the process that serves requests (threads don't survive a fork)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._active.clear()
+                self._slowest = []
+                os.makedirs(self.directory, exist_ok=True)
+                threading.Thread(target=self._sample, name='profiler', daemon=True).start()
+
+    def _sample(self):
+        own = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, stacks in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own:
+                        stacks[_fold(frame)] += 1
+
+    def begin(self):
+        """Starts sampling the current thread's request."""
+        self._ensure_started()
+        with self._lock:
+            self._active[threading.get_ident()] = Counter()
+
+    def end(self, label, duration):
+        """Stops sampling; keeps the stacks on disk if the request is among the slowest."""
+        with self._lock:
+            stacks = self._active.pop(threading.get_ident(), None)
+            if not stacks or (len(self._slowest) >= self.keep and duration <= self._slowest[0][0]):
+                return
+            path = os.path.join(self.directory, f"{duration * 1000:09.1f}ms-{os.getpid()}-{time.time_ns()}.folded")
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, (duration, path))
+                evicted = None
+            else:
+                evicted = heapq.heapreplace(self._slowest, (duration, path))
+
+        try:
+            with open(path, 'w') as f:
+                f.write(f"# {label} {duration * 1000:.1f} ms, {sum(stacks.values())} samples\n")
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            if evicted is not None and os.path.exists(evicted[1]):
+                os.remove(evicted[1])
+        except OSError as e:
+            print(f"Warning: Could not write request profile: {e}")
+
+
+def from_env():
+    """Returns a profiler configured from the environment, or None unless PROFILE_SLOW_REQUESTS is set."""
+    if os.environ.get('PROFILE_SLOW_REQUESTS', '0') in ('', '0', 'false'):
+        return None
+    return SlowRequestProfiler(
+        os.environ.get('PROFILE_DIR', 'profiles'),
+        interval=float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000,
+        keep=int(os.environ.get('PROFILE_KEEP', 20)),
+    )
@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+
+from . import metrics, registry
+from .player_service import balls_faced, balls_bowled, bowler_runs, season_column
+
+# --- Aggregation Queries ---
+# A declarative query -- filters, group-by keys and metrics -- over every delivery, e.g.
+#   {"filters": {"batter": "V Kohli", "phase": "Death"}, "group_by": ["season"],
+#    "metrics": ["runs", "balls", "strike_rate"], "order_by": "season"}
+# The deliveries are copied once into integer-coded column arrays sorted by season and match,
+# so a season or a match is a contiguous row range. Every other dimension gets a posting list
+# (its rows per value, CSR style). The planner drives a query from the filter with the fewest
+# rows, masks the candidate rows with the remaining filters and aggregates them with bincount.
+
+# Filterable (and groupable) dimensions. Season and match are row ranges, the rest posting lists.
+DIMENSIONS = ['batter', 'bowler', 'batting_team', 'bowling_team', 'venue', 'season', 'phase', 'innings', 'match']
+RANGE_DIMENSIONS = ('season', 'match')
+
+# Summed columns, and the metrics derived from them (None where undefined)
+SUMS = ['runs', 'balls', 'dismissals', 'fours', 'sixes', 'wickets', 'runs_conceded', 'balls_bowled', 'deliveries']
+DERIVED = {
+    'strike_rate': (lambda s: s['runs'] / s['balls'] * 100, ['runs', 'balls']),
+    'average': (lambda s: s['runs'] / s['dismissals'], ['runs', 'dismissals']),
+    'economy': (lambda s: s['runs_conceded'] / s['balls_bowled'] * 6, ['runs_conceded', 'balls_bowled']),
+    'bowling_average': (lambda s: s['runs_conceded'] / s['wickets'], ['runs_conceded', 'wickets']),
+}
+METRICS = SUMS + ['matches'] + list(DERIVED)
+
+MAX_GROUP_BY = 3
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def _posting_list(codes, size, ranged):
+    """
+    Rows per code as (offsets, order): code c's rows are order[offsets[c]:offsets[c + 1]]. For a
+    dimension the rows are sorted by, order is None and the offsets are row numbers themselves.
+    Rows with no known value (code -1) are in no list.
+    """
+    known = np.flatnonzero(codes >= 0)
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[known], minlength=size))])
+    if ranged:
+        return offsets + (len(codes) - len(known)), None  # the unknown rows sort first
+    return offsets, known[np.argsort(codes[known], kind='stable')].astype(np.int32)
+
+
+def build_query_index(matches, deliveries):
+    """The coded column arrays, value dictionaries and posting lists of every dimension."""
+    venue = matches.set_index('ID')['Venue'].astype(str).reindex(deliveries['ID']).to_numpy()
+    labels = {
+        'batter': deliveries['batter'], 'bowler': deliveries['bowler'],
+        'batting_team': deliveries['BattingTeam'], 'bowling_team': deliveries['BowlingTeam'],
+        'venue': pd.Series(venue, dtype='category'),
+        'season': pd.Series(season_column(deliveries, matches)),
+        'phase': deliveries['phase'],
+        'innings': deliveries['innings'].astype(str).astype('category'),
+    }
+    sums = {
+        'runs': deliveries['batsman_run'],
+        'balls': balls_faced(deliveries),
+        'dismissals': deliveries['player_out'] == deliveries['batter'],
+        'fours': deliveries['batsman_run'] == 4,
+        'sixes': deliveries['batsman_run'] == 6,
+        'wickets': deliveries['isWicketDelivery'] == 1,
+        'runs_conceded': bowler_runs(deliveries),
+        'balls_bowled': balls_bowled(deliveries),
+    }
+
+    # Sort by season, then match, so both become contiguous row ranges. Matches are coded in
+    # that order, so their codes rise with the rows too.
+    season_codes = labels['season'].cat.codes.to_numpy()
+    ids = deliveries['ID'].to_numpy()
+    order = np.lexsort((ids, season_codes))
+    match_codes, match_ids = pd.factorize(ids[order])
+
+    index = {'rows': len(order), 'codes': {}, 'values': {}, 'lookup': {}, 'postings': {}, 'sums': {}}
+    for dim in DIMENSIONS:
+        if dim == 'match':
+            codes, values = match_codes, [str(i) for i in match_ids]
+        else:
+            codes, values = labels[dim].cat.codes.to_numpy()[order], [str(c) for c in labels[dim].cat.categories]
+        index['codes'][dim] = codes.astype(np.int32)
+        index['values'][dim] = np.asarray(values, dtype=object)
+        index['lookup'][dim] = {value: code for code, value in enumerate(values)}
+        index['postings'][dim] = _posting_list(index['codes'][dim], len(values), dim in RANGE_DIMENSIONS)
+    for name, column in sums.items():
+        index['sums'][name] = np.asarray(column, dtype=np.int32)[order]
+    return index
+
+registry.register('query_index', lambda parts: (
+    build_query_index(parts['data'].matches, parts['data'].deliveries)
+    if parts['data'].deliveries is not None else None
+))
+
+
+# --- Planning ---
+
+def _as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def parse_spec(spec):
+    """Validates a query spec. Returns (filters, group_by, metrics, order_by, descending, limit) or an error dict."""
+    if not isinstance(spec, dict):
+        return {'error': 'The query must be a JSON object.'}
+    filters = spec.get('filters') or {}
+    group_by = _as_list(spec.get('group_by') or [])
+    wanted = _as_list(spec.get('metrics') or ['runs', 'balls', 'strike_rate'])
+    if not isinstance(filters, dict):
+        return {'error': "'filters' must be an object of dimension: value(s)."}
+
+    unknown = [dim for dim in list(filters) + group_by if dim not in DIMENSIONS]
+    if unknown:
+        return {'error': f"Unknown dimension(s) {unknown}. Choose from: {', '.join(DIMENSIONS)}."}
+    if len(group_by) > MAX_GROUP_BY or len(set(group_by)) != len(group_by):
+        return {'error': f"'group_by' takes up to {MAX_GROUP_BY} distinct dimensions."}
+    bad = [m for m in wanted if m not in METRICS]
+    if bad:
+        return {'error': f"Unknown metric(s) {bad}. Choose from: {', '.join(METRICS)}."}
+
+    order_by = spec.get('order_by', wanted[0])
+    if order_by not in wanted and order_by not in group_by:
+        return {'error': "'order_by' must be one of the requested metrics or group-by keys."}
+    try:
+        limit = max(1, min(int(spec.get('limit', DEFAULT_LIMIT)), MAX_LIMIT))
+    except (TypeError, ValueError):
+        return {'error': "'limit' must be an integer."}
+    filters = {dim: [str(v) for v in _as_list(values)] for dim, values in filters.items()}
+    return filters, group_by, wanted, order_by, not spec.get('ascending', False), limit
+
+
+def _rows_for(index, dim, codes):
+    """The rows (ascending) holding any of the codes, from the dimension's ranges or posting list."""
+    offsets, order = index['postings'][dim]
+    parts = [np.arange(offsets[c], offsets[c + 1], dtype=np.int32) if order is None else order[offsets[c]:offsets[c + 1]]
+             for c in codes]
+    rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+    return rows if len(parts) <= 1 else np.sort(rows)
+
+
+def plan(index, filters):
+    """
+    Resolves the filter values to codes and orders the filters by how many rows they match:
+    the first drives the query (its rows are read from the index) and the rest become masks.
+    Returns (steps, error), each step being (dimension, codes, matching rows).
+    """
+    steps = []
+    for dim, values in filters.items():
+        unknown = [v for v in values if v not in index['lookup'][dim]]
+        if unknown:
+            return None, {'error': f"Unknown {dim} value(s): {', '.join(unknown)}."}
+        codes = sorted({index['lookup'][dim][v] for v in values})
+        offsets = index['postings'][dim][0]
+        steps.append((dim, codes, int(sum(offsets[c + 1] - offsets[c] for c in codes))))
+    steps.sort(key=lambda step: step[2])
+    return steps, None
+
+
+# --- Execution ---
+
+def _metric_values(sums, groups, n_groups, n_matches, match_codes, wanted):
+    """Every requested metric per group, as float arrays (NaN where undefined)."""
+    values = {}
+    for name in wanted:
+        if name == 'deliveries':
+            values[name] = np.bincount(groups, minlength=n_groups).astype(float)
+        elif name == 'matches':
+            # Distinct (group, match) pairs per group
+            pairs = np.unique(groups.astype(np.int64) * n_matches + match_codes)
+            values[name] = np.bincount(pairs // n_matches, minlength=n_groups).astype(float)
+        elif name in DERIVED:
+            formula, needs = DERIVED[name]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result = formula({n: sums[n] for n in needs})
+            values[name] = np.where(np.isfinite(result), np.round(result, 2), np.nan)
+        else:
+            values[name] = sums[name]
+    return values
+
+
+def prepare_query(spec):
+    """Validates and plans a query spec. Returns (query, None), or (None, an error dict)."""
+    parsed = parse_spec(spec)
+    if isinstance(parsed, dict):
+        return None, parsed
+    index = registry.get('query_index')
+    if index is None:
+        return None, {'error': 'Data not loaded'}
+    filters, group_by, wanted, order_by, descending, limit = parsed
+    steps, error = plan(index, filters)
+    if error:
+        return None, error
+    return {'index': index, 'filters': filters, 'steps': steps, 'group_by': group_by, 'metrics': wanted,
+            'order_by': order_by, 'descending': descending, 'limit': limit}, None
+
+
+@metrics.timed
+def execute_query(query):
+    """Runs a prepared query; returns the grouped rows (ordered and limited) and the plan used."""
+    index, steps, group_by, wanted = query['index'], query['steps'], query['group_by'], query['metrics']
+    order_by, descending = query['order_by'], query['descending']
+    if steps:
+        driver, codes, _ = steps[0]
+        rows = _rows_for(index, driver, codes)
+        for dim, codes, _ in steps[1:]:
+            column = index['codes'][dim][rows]
+            rows = rows[column == codes[0]] if len(codes) == 1 else rows[np.isin(column, codes)]
+    else:
+        driver, rows = None, np.arange(index['rows'], dtype=np.int32)
+
+    # One integer key per group, from the group-by codes (deliveries with an unknown key are dropped)
+    shape = [len(index['values'][dim]) for dim in group_by]
+    keys = [index['codes'][dim][rows] for dim in group_by]
+    if keys:
+        known = np.logical_and.reduce([k >= 0 for k in keys])
+        rows, keys = rows[known], [k[known] for k in keys]
+        group_keys, groups = np.unique(np.ravel_multi_index(keys, shape), return_inverse=True)
+        group_codes = dict(zip(group_by, np.unravel_index(group_keys, shape)))
+    else:
+        group_keys, groups, group_codes = np.zeros(min(len(rows), 1)), np.zeros(len(rows), dtype=np.int64), {}
+    groups, n_groups = groups.ravel(), len(group_keys)
+
+    sums = {name: np.bincount(groups, weights=index['sums'][name][rows], minlength=n_groups)
+            for name in SUMS if name != 'deliveries'}
+    values = _metric_values(sums, groups, n_groups, len(index['values']['match']),
+                            index['codes']['match'][rows], wanted)
+
+    # Order by the chosen metric (undefined values last) or key, then by the group keys. Key
+    # codes follow the values' natural order (names and seasons sorted, phases and matches in play order).
+    if order_by in values:
+        primary = np.where(np.isnan(values[order_by]), np.inf, -values[order_by] if descending else values[order_by])
+    else:
+        primary = -group_codes[order_by] if descending else group_codes[order_by]
+    ranked = np.lexsort([group_codes[dim] for dim in reversed(group_by)] + [primary])
+
+    result_rows = []
+    for g in ranked[:query['limit']]:
+        row = {dim: index['values'][dim][group_codes[dim][g]] for dim in group_by}
+        for name in wanted:
+            value = values[name][g]
+            row[name] = None if np.isnan(value) else (round(float(value), 2) if name in DERIVED else int(value))
+        result_rows.append(row)
+
+    return {
+        'filters': query['filters'],
+        'group_by': group_by,
+        'metrics': wanted,
+        'order_by': order_by,
+        'total_groups': int(len(group_keys)),
+        'rows': result_rows,
+        'plan': {
+            'driving_index': driver or 'full_scan',
+            'index_rows': int(steps[0][2]) if steps else index['rows'],
+            'masks': [dim for dim, _, _ in steps[1:]],
+            'matched_deliveries': int(len(rows)),
+        },
+    }
+
+
+def run_query(spec):
+    """Validates, plans and runs a query spec (or returns an {'error': ...} dict)."""
+    query, error = prepare_query(spec)
+    return error if error else execute_query(query)
@@ -0,0 +1,297 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# --- Component Registry ---
+# Everything expensive (datasets, derived indexes, the model) is registered here as a named
+# builder and only built on first use -- or ahead of time by a background warm-up thread --
+# so importing the app stays cheap and the process can answer health checks while loading.
+
+_builders = []  # (name, builder) in registration order; builder(parts) -> component
+_updaters = {}  # name -> updater(parts, previous, change) -> component, for incremental updates
+_lock = threading.Lock()
+_reload_lock = threading.Lock()  # one rebuild at a time
+_snapshot = None
+_status = {'state': 'cold', 'error': None, 'timings': {}, 'started_at': None, 'ready_at': None,
+           'generation': 0, 'last_reload': None}
+_building_timings = ContextVar('building_timings', default=None)
+_warmup_thread = None
+_swap_listeners = []
+# Per request (or other unit of work): the snapshot it first read, once pin() has been called
+_pinned = ContextVar('pinned_snapshot', default=None)
+_watch = {'paths': None, 'interval': None, 'thread': None, 'stamps': None}
+
+
+def register(name, builder, updater=None):
+    """
+    Registers a component. 'builder' receives a dict of the components registered (and built)
+    before it and returns the component. The optional 'updater' derives the component from its
+    previous version when a change is applied with update(); without one it is rebuilt.
+    """
+    _builders.append((name, builder))
+    if updater is not None:
+        _updaters[name] = updater
+
+
+class Snapshot:
+    """An immutable bundle of built components; requests read everything from one snapshot."""
+
+    def __init__(self, parts, timings):
+        self._parts = parts
+        self.timings = timings
+
+    def __getitem__(self, name):
+        return self._parts[name]
+
+
+@contextmanager
+def phase(name):
+    """Times a sub-phase of the component currently being built (e.g. 'data.csv_parse')."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _building_timings.get()
+        if timings is not None:
+            timings[name] = round(time.perf_counter() - start, 4)
+
+
+def _build(previous=None, change=None, given=None):
+    parts, timings = {}, {}
+    token = _building_timings.set(timings)
+    try:
+        for name, builder in _builders:
+            start = time.perf_counter()
+            if given and name in given:
+                parts[name] = given[name]
+            elif previous is not None and name in _updaters:
+                parts[name] = _updaters[name](parts, previous[name], change)
+            else:
+                parts[name] = builder(parts)
+            timings[name] = round(time.perf_counter() - start, 4)
+    finally:
+        _building_timings.reset(token)
+    return Snapshot(parts, timings)
+
+
+def build(**given):
+    """
+    Builds a complete snapshot without swapping it in. Components passed as keyword arguments
+    are used as they are (e.g. data=... to build the indexes of other frames).
+    """
+    return _build(given=given)
+
+
+def snapshot():
+    """
+    Returns the current snapshot, building it on first use (other callers wait for it). Inside
+    a pinned unit of work, every call returns the snapshot the first call saw.
+    """
+    pinned = _pinned.get()
+    if pinned is not None and pinned[0] is not None:
+        return pinned[0]
+
+    current = _current()
+    if pinned is not None:
+        pinned[0] = current
+    return current
+
+
+def _current():
+    global _snapshot
+    current = _snapshot
+    if current is not None:
+        return current
+
+    with _lock:
+        if _snapshot is None:
+            _status.update(state='loading', started_at=time.time())
+            start = time.perf_counter()
+            try:
+                _snapshot = _build()
+            except Exception as e:
+                _status.update(state='error', error=f"{type(e).__name__}: {e}")
+                raise
+            _status.update(state='ready', error=None, timings=_snapshot.timings, ready_at=time.time())
+            total = time.perf_counter() - start
+            breakdown = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in _snapshot.timings.items())
+            print(f"Startup: data and indexes ready in {total:.2f}s ({breakdown})")
+        return _snapshot
+
+
+def get(name):
+    """Returns one component of the current snapshot."""
+    return snapshot()[name]
+
+
+def pin():
+    """
+    Starts a unit of work (e.g. a request) that sees one snapshot throughout, even if a reload
+    swaps in a new one meanwhile. The snapshot is pinned on first use, so pinning never waits
+    for loading by itself.
+    """
+    _pinned.set([None])
+
+
+def unpin():
+    _pinned.set(None)
+
+
+# --- Hot Reload ---
+# A reload builds a complete new snapshot on a background thread while requests keep reading
+# the old one, then swaps it in with a single assignment. Requests that already pinned the
+# old snapshot finish on it; it is freed once the last of them is done.
+
+def on_swap(callback):
+    """Registers a callable to run after a reload swaps in a new snapshot (e.g. clearing caches)."""
+    _swap_listeners.append(callback)
+
+
+def reload():
+    """
+    Rebuilds every component from the current files and swaps the result in. The old snapshot
+    stays in place if the build fails. Returns False if a reload was already running or failed.
+    """
+    if _snapshot is None:
+        snapshot()  # nothing to swap yet: this is just the first load
+        return True
+    if not _reload_lock.acquire(blocking=False):
+        return False
+
+    try:
+        start = time.perf_counter()
+        try:
+            fresh = _build()
+        except Exception as e:
+            _status['last_reload'] = {'ok': False, 'error': f"{type(e).__name__}: {e}", 'at': time.time()}
+            print(f"Error: Reload failed, keeping the current data: {e}")
+            return False
+
+        _swap(fresh)
+        print(f"Reload: generation {_status['generation']} swapped in after {time.perf_counter() - start:.2f}s")
+        return True
+    finally:
+        _reload_lock.release()
+
+
+def update(change):
+    """
+    Applies 'change' to the current snapshot incrementally: components with an updater are
+    derived from their previous version, the others are rebuilt, and the result is swapped in
+    like a reload. Once every component is built, change.commit() (if it has one) persists the
+    change, so nothing is written unless the whole build succeeded. Waits for a running reload;
+    any exception leaves the current snapshot in place. Returns the new generation.
+    """
+    _current()  # loads the first snapshot if there is none yet
+    with _reload_lock:
+        fresh = _build(_snapshot, change)
+        commit = getattr(change, 'commit', None)
+        if commit is not None:
+            commit()
+        _swap(fresh)
+        if _watch['paths'] is not None:
+            # The change already wrote the files: the watcher needn't rebuild from them again
+            _watch['stamps'] = _stamps(_watch['paths'])
+        return _status['generation']
+
+
+def _swap(fresh):
+    global _snapshot
+    with _lock:
+        _snapshot = fresh
+        _status.update(timings=fresh.timings, ready_at=time.time(), generation=_status['generation'] + 1,
+                       last_reload={'ok': True, 'error': None, 'at': time.time()})
+    for callback in _swap_listeners:
+        callback()
+
+
+def reload_async():
+    """Starts a reload on a daemon thread."""
+    threading.Thread(target=reload, name='reload', daemon=True).start()
+
+
+def _stamps(paths):
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append((path, None, None))
+    return tuple(stamps)
+
+
+def _watch_loop(paths, interval):
+    pending = None
+    while True:
+        time.sleep(interval)
+        current = _stamps(paths)
+        if current == _watch['stamps']:
+            pending = None
+        elif current == pending:
+            # Unchanged for a whole interval, so the files are (most likely) completely written
+            _watch['stamps'], pending = current, None
+            reload()
+        else:
+            pending = current
+
+
+def start_watching(paths, interval=2.0):
+    """Polls the files' modification times and size, and reloads once a change has settled."""
+    _watch.update(paths=list(paths), interval=interval)
+    if _watch['stamps'] is None:
+        # A forked worker keeps the stamps its parent last loaded, so it can't miss a change
+        _watch['stamps'] = _stamps(_watch['paths'])
+    thread = threading.Thread(target=_watch_loop, args=(_watch['paths'], interval), name='watcher', daemon=True)
+    _watch['thread'] = thread
+    thread.start()
+
+
+def is_watching():
+    return _watch['thread'] is not None
+
+
+def _after_fork_in_child():
+    # Threads don't survive a fork: a preloaded gunicorn worker starts its own watcher.
+    global _reload_lock
+    _reload_lock = threading.Lock()
+    if _watch['thread'] is not None:
+        start_watching(_watch['paths'], _watch['interval'])
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def is_ready():
+    return _snapshot is not None
+
+
+def status():
+    """Returns the load state ('cold', 'loading', 'ready' or 'error') with per-phase timings."""
+    return dict(_status)
+
+
+def start_warmup():
+    """Builds the snapshot on a daemon thread so the process can serve health checks meanwhile."""
+    global _warmup_thread
+    if _warmup_thread is not None or _snapshot is not None:
+        return
+
+    def warm_up():
+        try:
+            snapshot()
+        except Exception as e:
+            print(f"Error: Warm-up failed: {e}")
+
+    _warmup_thread = threading.Thread(target=warm_up, name='warmup', daemon=True)
+    _warmup_thread.start()
+
+
+def wait_until_ready(timeout=None):
+    """Blocks until a running warm-up finishes (or builds the snapshot if none was started)."""
+    if _warmup_thread is not None:
+        _warmup_thread.join(timeout)
+    else:
+        snapshot()
+    return is_ready()
@@ -0,0 +1,133 @@
+import numpy as np
+
+from . import metrics, registry
+from .data_service import PHASES
+from . import player_service  # noqa: F401 -- registers 'phase_stats', which must be built first
+
+# --- Similar Players ---
+# Each player's career is summarised as a vector of rates per innings phase, standardized
+# (z-scores) into one dense matrix per role. Similar players are the nearest rows by Euclidean
+# distance, found by brute force: one matrix product scores every player against a whole
+# batch of query players at once, which for a few hundred rows beats any tree index.
+#   batting: strike rate, boundary % and dismissal rate per phase, and the share of balls faced in each
+#   bowling: economy and wicket rate per phase, and the share of balls bowled in each
+
+# A phase rate is shrunk towards the average of all players by this many balls' worth of it,
+# so a handful of balls in a phase doesn't make a player look extreme there.
+PRIOR_BALLS = 30
+DEFAULT_NEIGHBOURS = 10
+MAX_NEIGHBOURS = 50
+MAX_QUERY_PLAYERS = 10
+ROLES = ('batting', 'bowling')
+
+
+def _shrunk_rate(counts, balls):
+    """counts / balls per (player, phase), shrunk towards the phase's rate over all players."""
+    prior = counts.sum(axis=0) / np.maximum(balls.sum(axis=0), 1)
+    return (counts + prior * PRIOR_BALLS) / (balls + PRIOR_BALLS)
+
+
+def _profile_matrix(table, role):
+    """The (players x features) matrix of one role, with the feature names and per-player balls."""
+    career = table.groupby(level=['player', 'phase'], observed=True).sum()
+    # (player, phase) rows -> one row per player with a (column, phase) block per stat
+    wide = career.unstack('phase', fill_value=0).reindex(columns=PHASES, level='phase', fill_value=0)
+    column = lambda name: wide[name].to_numpy(dtype=float)
+    balls = column('balls')
+
+    if role == 'batting':
+        features = {
+            'strike_rate': _shrunk_rate(column('runs'), balls) * 100,
+            'boundary_pct': _shrunk_rate(column('fours') + column('sixes'), balls) * 100,
+            'dismissal_rate': _shrunk_rate(column('dismissals'), balls) * 100,
+        }
+    else:
+        features = {
+            'economy': _shrunk_rate(column('runs'), balls) * 6,
+            'wicket_rate': _shrunk_rate(column('wickets'), balls) * 100,
+        }
+    features['ball_share'] = balls / np.maximum(balls.sum(axis=1, keepdims=True), 1)
+
+    names = [f'{name}_{phase}' for name in features for phase in PHASES]
+    raw = np.hstack(list(features.values()))
+    return np.array([str(p) for p in wide.index], dtype=object), names, raw, balls.sum(axis=1)
+
+
+def build_similarity_index(phase_stats):
+    """Standardized feature matrices of every role, with their squared row norms for the distances."""
+    if phase_stats is None:
+        return None
+    index = {}
+    for role in ROLES:
+        players, names, raw, balls = _profile_matrix(phase_stats[role], role)
+        std = raw.std(axis=0)
+        matrix = ((raw - raw.mean(axis=0)) / np.where(std > 0, std, 1)).astype(np.float32)
+        index[role] = {
+            'players': players,
+            'rows': {player: row for row, player in enumerate(players)},
+            'features': names,
+            'raw': raw,
+            'matrix': np.ascontiguousarray(matrix),
+            'norms': (matrix * matrix).sum(axis=1),
+            'balls': balls,
+        }
+    return index
+
+registry.register('similarity', lambda parts: build_similarity_index(parts['phase_stats']))
+
+
+# --- Queries ---
+
+def nearest(part, rows, k, candidates):
+    """
+    The k nearest candidate rows to each of 'rows' (a batch), as (row, distance) lists. The
+    squared distances of the whole batch come from one matrix product:
+    |a - b|^2 = |a|^2 - 2 a.b + |b|^2.
+    """
+    matrix, norms = part['matrix'], part['norms']
+    pool = matrix[candidates]
+    squared = norms[rows][:, None] - 2 * (matrix[rows] @ pool.T) + norms[candidates][None, :]
+    squared[candidates[None, :] == rows[:, None]] = np.inf  # a player isn't their own neighbour
+
+    results = []
+    for distances in squared:
+        k_here = min(k, int(np.isfinite(distances).sum()))
+        top = np.argpartition(distances, k_here - 1)[:k_here] if k_here else np.empty(0, dtype=np.int64)
+        top = top[np.lexsort((part['players'][candidates[top]], distances[top]))]
+        results.append([(int(candidates[i]), float(np.sqrt(max(distances[i], 0)))) for i in top])
+    return results
+
+
+def _profile(part, row):
+    return {name: round(float(value), 2) for name, value in zip(part['features'], part['raw'][row])}
+
+
+@metrics.timed
+def get_similar_players(players, role='batting', min_balls=0, limit=DEFAULT_NEIGHBOURS):
+    """The players whose phase profiles are closest to each given player's, qualifying on min_balls."""
+    if role not in ROLES:
+        return {'error': f"Invalid role '{role}'. Choose from: {', '.join(ROLES)}."}
+    index = registry.get('similarity')
+    if index is None:
+        return {'error': 'Data not loaded'}
+    part = index[role]
+
+    unknown = [player for player in players if player not in part['rows']]
+    if unknown:
+        return {'error': f"No {role} data found for: {', '.join(unknown)}."}
+    rows = np.array([part['rows'][player] for player in players], dtype=np.int64)
+    candidates = np.flatnonzero(part['balls'] >= min_balls)
+
+    results = []
+    for player, row, neighbours in zip(players, rows, nearest(part, rows, limit, candidates)):
+        results.append({
+            'player': player,
+            'balls': int(part['balls'][row]),
+            'profile': _profile(part, row),
+            'similar': [
+                {'player': part['players'][other], 'distance': round(distance, 3),
+                 'balls': int(part['balls'][other]), 'profile': _profile(part, other)}
+                for other, distance in neighbours
+            ],
+        })
+    return {'role': role, 'min_balls': min_balls, 'results': results}
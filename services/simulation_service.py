@@ -0,0 +1,243 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+from .data_service import get_dataset
+from .model_service import get_compiled_model
+
+# --- Season Simulator ---
+# Playoff odds by Monte Carlo: every remaining league fixture is scored once by the win
+# predictor (one batched call), then whole seasons are drawn as a (simulations x fixtures)
+# matrix of uniform numbers, in chunks spread over a process pool. Each chunk returns only
+# count tables (points and final position per team), so little crosses the process boundary.
+
+POINTS_PER_WIN = 2
+POINTS_PER_NO_RESULT = 1
+DEFAULT_SIMULATIONS = 100_000
+MAX_SIMULATIONS = 1_000_000
+DEFAULT_QUALIFY = 4
+CHUNK_SIMULATIONS = 25_000
+# Stop drawing once this much time has passed and report the chunks finished so far. Only the
+# leading run of finished chunks counts, so a cut-short answer is the one 'seed' gives for
+# that many simulations, whichever chunks the pool happened to finish first.
+BUDGET_SECONDS = float(os.environ.get('SIMULATION_BUDGET_MS', 2000)) / 1000
+# Processes for the draws; 0 or 1 runs them in the request's own thread
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', min(4, os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    """The process pool, started on first use. 'spawn' keeps the children clear of the server's threads."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=SIMULATION_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+# --- Fixtures ---
+
+def season_fixtures(season, after=0):
+    """
+    The league fixtures of a season in MatchNumber order (playoffs excluded). The first 'after'
+    matches keep their real result; the rest are left to simulate.
+    """
+    matches = get_dataset().matches
+    if matches is None:
+        return None
+    league = matches[matches['Season'].astype(str) == str(season)].copy()
+    league['number'] = pd.to_numeric(league['MatchNumber'].astype(str), errors='coerce')
+    league = league.dropna(subset=['number']).sort_values('number')
+
+    fixtures = []
+    for number, team1, team2, venue, winner in league[['number', 'Team1', 'Team2', 'Venue', 'WinningTeam']].itertuples(index=False):
+        fixture = {'Team1': team1, 'Team2': team2, 'Venue': venue}
+        if number <= after:
+            fixture['Played'] = True
+            fixture['Winner'] = winner if isinstance(winner, str) else None
+        fixtures.append(fixture)
+    return fixtures
+
+
+def score_fixtures(fixtures):
+    """
+    P(Team1 wins) for every fixture in one batched model call. A fixture without a known toss
+    averages the four toss outcomes (either side winning it, batting or fielding).
+    """
+    model = get_compiled_model()
+    scenarios = []
+    for fx in fixtures:
+        if fx.get('TossWinner') and fx.get('TossDecision'):
+            scenarios.append([(fx['TossWinner'], fx['TossDecision'])])
+        else:
+            scenarios.append([(toss, decision) for toss in (fx['Team1'], fx['Team2']) for decision in ('bat', 'field')])
+
+    rows = [(fx, toss, decision) for fx, options in zip(fixtures, scenarios) for toss, decision in options]
+    probabilities = model.predict_proba({
+        'Team1': [fx['Team1'] for fx, _, _ in rows],
+        'Team2': [fx['Team2'] for fx, _, _ in rows],
+        'Venue': [fx['Venue'] for fx, _, _ in rows],
+        'TossWinner': [toss for _, toss, _ in rows],
+        'TossDecision': [decision for _, _, decision in rows],
+    })
+    counts = np.array([len(options) for options in scenarios])
+    return np.add.reduceat(probabilities, np.concatenate([[0], np.cumsum(counts)[:-1]])) / counts
+
+
+# --- Draws ---
+
+def simulate_chunk(task):
+    """
+    Simulates 'simulations' seasons of the remaining fixtures (runs in a pool worker). Returns
+    (position_counts, points_counts): per team, how often it finished in each position, and
+    how often it ended on each points total. Ties on points are broken at random.
+    """
+    team1_win, team1, team2, base_points, max_points, simulations, seed = task
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_points)
+
+    # One row per simulated season: did Team1 win each fixture?
+    wins = (rng.random((simulations, len(team1_win)), dtype=np.float32) < team1_win).astype(np.float32)
+    home = np.zeros((len(team1_win), n_teams), dtype=np.float32)
+    away = np.zeros((len(team1_win), n_teams), dtype=np.float32)
+    home[np.arange(len(team1)), team1] = POINTS_PER_WIN
+    away[np.arange(len(team2)), team2] = POINTS_PER_WIN
+    points = (base_points + wins @ home + (1 - wins) @ away).astype(np.int32)
+
+    # Rank by points; a jitter below one point breaks ties (there is no net run rate to use)
+    order = np.argsort(-(points + rng.random(points.shape, dtype=np.float32) * 0.5), axis=1)
+    positions = np.empty_like(order)
+    positions[np.arange(simulations)[:, None], order] = np.arange(n_teams)
+
+    teams = np.broadcast_to(np.arange(n_teams), points.shape)
+    position_counts = np.bincount((teams * n_teams + positions).ravel(), minlength=n_teams * n_teams)
+    points_counts = np.bincount((teams * (max_points + 1) + points).ravel(), minlength=n_teams * (max_points + 1))
+    return position_counts.reshape(n_teams, n_teams), points_counts.reshape(n_teams, max_points + 1)
+
+
+def _run_chunks(tasks, deadline):
+    """
+    Runs the chunks (on the pool if there is one) until done or past the deadline, and returns
+    the results of the leading chunks that finished (at least the first). Past the deadline,
+    chunks that haven't started are cancelled; a chunk already running in a worker can't be
+    stopped, so it is abandoned: it finishes in the background and its result is dropped.
+    """
+    results = []
+    if SIMULATION_WORKERS <= 1 or len(tasks) == 1:
+        for task in tasks:
+            if results and time.perf_counter() > deadline:
+                break
+            results.append(simulate_chunk(task))
+        return results
+
+    futures = [_executor().submit(simulate_chunk, task) for task in tasks]
+    wait(futures, timeout=max(0.0, deadline - time.perf_counter()))
+    for future in futures[1:]:
+        future.cancel()  # a no-op for chunks already running or done
+    for future in futures:
+        if results and (future.cancelled() or not future.done()):
+            break
+        results.append(future.result())  # past the budget, but at least the first chunk
+    return results
+
+
+@metrics.timed
+def simulate_season(fixtures, simulations=DEFAULT_SIMULATIONS, qualify=DEFAULT_QUALIFY, seed=0):
+    """
+    Simulates the season 'simulations' times from its fixtures (dicts with Team1, Team2, Venue,
+    optionally TossWinner/TossDecision, and Played/Winner for matches already decided). Returns
+    per-team points distributions and position and qualification probabilities.
+    """
+    if get_compiled_model() is None:
+        return {'error': 'Model not loaded'}
+    if not fixtures:
+        return {'error': 'No fixtures to simulate.'}
+    start = time.perf_counter()
+
+    teams = sorted({fx['Team1'] for fx in fixtures} | {fx['Team2'] for fx in fixtures})
+    if qualify < 1 or qualify > len(teams):
+        return {'error': f"'qualify' must be between 1 and {len(teams)}."}
+    team_index = {team: i for i, team in enumerate(teams)}
+
+    # Results already known become fixed points; the rest are scored and drawn
+    base_points = np.zeros(len(teams), dtype=np.int32)
+    remaining = []
+    for fx in fixtures:
+        if not fx.get('Played'):
+            remaining.append(fx)
+        elif fx.get('Winner') is not None and fx['Winner'] not in (fx['Team1'], fx['Team2']):
+            return {'error': f"Winner '{fx['Winner']}' isn't one of {fx['Team1']} and {fx['Team2']}."}
+        elif fx.get('Winner') is not None:
+            base_points[team_index[fx['Winner']]] += POINTS_PER_WIN
+        else:
+            base_points[team_index[fx['Team1']]] += POINTS_PER_NO_RESULT
+            base_points[team_index[fx['Team2']]] += POINTS_PER_NO_RESULT
+
+    team1 = np.array([team_index[fx['Team1']] for fx in remaining], dtype=np.int64)
+    team2 = np.array([team_index[fx['Team2']] for fx in remaining], dtype=np.int64)
+    team1_win = score_fixtures(remaining).astype(np.float32) if remaining else np.zeros(0, dtype=np.float32)
+    games = np.bincount(np.concatenate([team1, team2]), minlength=len(teams))
+    max_points = int((base_points + POINTS_PER_WIN * games).max())
+
+    sizes = [CHUNK_SIMULATIONS] * (simulations // CHUNK_SIMULATIONS)
+    if simulations % CHUNK_SIMULATIONS:
+        sizes.append(simulations % CHUNK_SIMULATIONS)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(team1_win, team1, team2, base_points, max_points, size, s) for size, s in zip(sizes, seeds)]
+    results = _run_chunks(tasks, start + BUDGET_SECONDS)
+
+    position_counts = sum(r[0] for r in results)
+    points_counts = sum(r[1] for r in results)
+    completed = int(position_counts[0].sum())
+    position_p = position_counts / completed
+    points_p = points_counts / completed
+
+    table = []
+    for i, team in enumerate(teams):
+        distribution = {int(pts): round(float(p), 5) for pts, p in enumerate(points_p[i]) if p > 0}
+        table.append({
+            'team': team,
+            'current_points': int(base_points[i]),
+            'remaining_matches': int(games[i]),
+            'expected_points': round(float(points_p[i] @ np.arange(max_points + 1)), 2),
+            'points_distribution': distribution,
+            'position_probabilities': [round(float(p), 5) for p in position_p[i]],
+            'qualification_probability': round(float(position_p[i, :qualify].sum()), 5),
+            'top_two_probability': round(float(position_p[i, :2].sum()), 5),
+            'first_place_probability': round(float(position_p[i, 0]), 5),
+        })
+    table.sort(key=lambda row: (-row['qualification_probability'], -row['expected_points'], row['team']))
+
+    return {
+        'fixtures': len(fixtures),
+        'simulated_fixtures': len(remaining),
+        'simulations': completed,
+        'requested_simulations': simulations,
+        'truncated': completed < simulations,
+        'qualify': qualify,
+        'seed': seed,
+        'table': table,
+    }
+
+
+@metrics.timed
+def simulate_known_season(season, after=0, simulations=DEFAULT_SIMULATIONS, qualify=DEFAULT_QUALIFY, seed=0):
+    """Simulates a season of the dataset from its schedule, keeping the real results of its first 'after' matches."""
+    fixtures = season_fixtures(season, after)
+    if fixtures is None:
+        return {'error': 'Data not loaded'}
+    if not fixtures:
+        return {'error': f"No league matches found for season '{season}'."}
+    result = simulate_season(fixtures, simulations, qualify, seed)
+    if 'error' not in result:
+        result = {'season': str(season), 'after_match': after, **result}
+    return result
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Bump this whenever the layout or the derived columns change so old snapshots are rebuilt.
+SNAPSHOT_VERSION = 4
+MANIFEST_NAME = 'manifest.json'
+
+
+def source_hash(paths):
+    """Returns a content hash of the source CSV files (plus the snapshot format version)."""
+    digest = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_frame(df, frame_dir, dictionaries):
+    """
+    Writes each column of a DataFrame as a .npy file and returns its column specs. Categorical
+    columns store their codes; their categories go into 'dictionaries', shared between every
+    column (of any frame) that uses the same categories.
+    """
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        file_name = f"{i:03d}.npy"
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = [str(c) for c in series.cat.categories]
+            dictionary = next((k for k, v in dictionaries.items() if v == categories), None)
+            if dictionary is None:
+                dictionary = f"d{len(dictionaries)}"
+                dictionaries[dictionary] = categories
+            np.save(os.path.join(frame_dir, file_name), series.cat.codes.to_numpy())
+            columns.append({'name': col, 'kind': 'category', 'file': file_name, 'dictionary': dictionary})
+        elif series.dtype == object:
+            # --- Dictionary-encode the remaining string columns: int32 codes on disk ---
+            codes, categories = pd.factorize(series, use_na_sentinel=True)
+            np.save(os.path.join(frame_dir, file_name), codes.astype(np.int32))
+            columns.append({'name': col, 'kind': 'string', 'file': file_name,
+                            'categories': [str(c) for c in categories]})
+        else:
+            np.save(os.path.join(frame_dir, file_name), series.to_numpy())
+            columns.append({'name': col, 'kind': 'numeric', 'file': file_name})
+    return columns
+
+
+def _decode_frame(frame_dir, columns, dtypes):
+    """Rebuilds a DataFrame from memory-mapped column files."""
+    data = {}
+    for spec in columns:
+        values = np.load(os.path.join(frame_dir, spec['file']), mmap_mode='r')
+        if spec['kind'] == 'category':
+            data[spec['name']] = pd.Categorical.from_codes(values, dtype=dtypes[spec['dictionary']])
+        elif spec['kind'] == 'string':
+            categories = np.array(spec['categories'] + [np.nan], dtype=object)
+            # Code -1 (missing) indexes the trailing NaN, matching what read_csv produces.
+            data[spec['name']] = categories[values]
+        else:
+            data[spec['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def write_snapshot(snapshot_root, key, frames):
+    """Writes a dict of named DataFrames as a columnar snapshot keyed by 'key' under 'snapshot_root'."""
+    os.makedirs(snapshot_root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.build-', dir=snapshot_root)
+    try:
+        manifest = {'version': SNAPSHOT_VERSION, 'key': key, 'dictionaries': {}, 'frames': {}}
+        for name, df in frames.items():
+            frame_dir = os.path.join(tmp_dir, name)
+            os.makedirs(frame_dir)
+            columns = _encode_frame(df, frame_dir, manifest['dictionaries'])
+            manifest['frames'][name] = {'rows': int(len(df)), 'columns': columns}
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+
+        # Publish atomically; another worker may have won the race, which is fine.
+        final_dir = os.path.join(snapshot_root, key)
+        try:
+            os.rename(tmp_dir, final_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Drop snapshots built from older versions of the CSVs.
+    for entry in os.listdir(snapshot_root):
+        if entry != key and not entry.startswith('.build-'):
+            shutil.rmtree(os.path.join(snapshot_root, entry), ignore_errors=True)
+
+
+def read_snapshot(snapshot_root, key):
+    """Returns the dict of DataFrames stored under 'key', or None if no valid snapshot exists."""
+    snapshot_dir = os.path.join(snapshot_root, key)
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != SNAPSHOT_VERSION or manifest.get('key') != key:
+            return None
+        # One dtype object per dictionary, so columns sharing it stay directly comparable
+        dtypes = {name: pd.CategoricalDtype(categories) for name, categories in manifest['dictionaries'].items()}
+        return {
+            name: _decode_frame(os.path.join(snapshot_dir, name), spec['columns'], dtypes)
+            for name, spec in manifest['frames'].items()
+        }
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: Ignoring unreadable snapshot '{snapshot_dir}': {e}")
+        return None
@@ -1,99 +1,175 @@
-from .data_service import matches_df
+from . import metrics, registry
+from .data_service import get_dataset, code_mask
+import numpy as np
 import pandas as pd
+
+def teams_in(matches):
+    """Returns the sorted unique team names of a matches frame."""
+    if matches is None:
+        return []
+    return sorted(list(set(matches['Team1'].unique().tolist() + matches['Team2'].unique().tolist())))
+
+@metrics.timed
 def get_all_teams():
     """Returns a list of all unique team names."""
-    if matches_df is None:
-        return []
-    return sorted(list(set(matches_df['Team1'].unique().tolist() + matches_df['Team2'].unique().tolist())))
+    return teams_in(get_dataset().matches)
 
+@metrics.timed
 def get_all_venues():
     """Returns a sorted list of all unique venue names."""
+    matches_df = get_dataset().matches
     if matches_df is None:
         return []
     return sorted(list(matches_df['Venue'].unique()))
 
+@metrics.timed
 def get_all_seasons():
     """Returns a sorted list of all unique seasons."""
+    matches_df = get_dataset().matches
     if matches_df is None:
         return []
     return sorted(list(matches_df['Season'].unique()))
 
+# --- Head-to-Head Cube ---
+# Every match is folded into four cells of its team pair: (season, venue), (season, 'All'),
+# ('All', venue) and ('All', 'All'), so any season/venue filter combination is one lookup.
+
+def _new_cell():
+    return {'matches': 0, 'wins': {}, 'toss_match_wins': 0, 'margins': {}, 'results': []}
+
+
+def _margin_stats(values, threshold):
+    if not values:
+        return 0, 0, 0
+    return round(sum(values) / len(values), 2), int(max(values)), sum(1 for v in values if v > threshold)
+
+
+def _finalize_cell(cell):
+    """Turns the raw per-match lists of a cell into the aggregates the endpoint reports."""
+    # Ordered result sequence -> longest winning streak per team
+    cell['results'].sort(key=lambda result: result[0])
+    max_streaks = {}
+    current_team, current_count = None, 0
+    for _, winner in cell['results']:
+        if winner == current_team:
+            current_count += 1
+        else:
+            current_team, current_count = winner, 1
+        if current_count > max_streaks.get(winner, 0):
+            max_streaks[winner] = current_count
+    cell['max_streaks'] = max_streaks
+
+    # Margin lists -> avg/max/big-win counts per team and result type
+    margins = {}
+    for team, by_type in cell['margins'].items():
+        avg_runs, max_runs, big_runs = _margin_stats(by_type.get('Runs', []), 50)
+        avg_wickets, max_wickets, big_wickets = _margin_stats(by_type.get('Wickets', []), 7)
+        margins[team] = {
+            'avg_run_margin': avg_runs,
+            'max_run_margin': max_runs,
+            'big_run_wins (>50)': big_runs,
+            'avg_wicket_margin': avg_wickets,
+            'max_wicket_margin': max_wickets,
+            'big_wicket_wins (>7)': big_wickets
+        }
+    cell['margins'] = margins
+    del cell['results']
+    return cell
+
+
+def build_head_to_head_cube(matches):
+    """Builds pair -> (season, venue) -> aggregate cell for every team pair that has met."""
+    cube = {}
+    columns = matches[['Team1', 'Team2', 'Season', 'Venue', 'Date', 'TossWinner', 'WinningTeam', 'WonBy', 'Margin']]
+    for team1, team2, season, venue, date, toss_winner, winner, won_by, margin in columns.itertuples(index=False):
+        pair_cells = cube.setdefault(tuple(sorted((team1, team2))), {})
+        has_winner = isinstance(winner, str)
+        season = str(season)
+        for key in ((season, venue), (season, 'All'), ('All', venue), ('All', 'All')):
+            cell = pair_cells.get(key)
+            if cell is None:
+                cell = pair_cells[key] = _new_cell()
+            cell['matches'] += 1
+            if not has_winner:
+                continue
+            cell['wins'][winner] = cell['wins'].get(winner, 0) + 1
+            if toss_winner == winner:
+                cell['toss_match_wins'] += 1
+            team_margins = cell['margins'].setdefault(winner, {})
+            if won_by in ('Runs', 'Wickets'):
+                team_margins.setdefault(won_by, []).append(margin)
+            cell['results'].append((date, winner))
+
+    for pair_cells in cube.values():
+        for cell in pair_cells.values():
+            _finalize_cell(cell)
+    return cube
+
+
+def update_head_to_head_cube(parts, previous, change):
+    """
+    Rebuilds just the pairs that met in the new matches, from all of their matches: streaks
+    and margin averages need a pair's whole history, which only its own matches hold.
+    """
+    matches = parts['data'].matches
+    pairs = {tuple(sorted(pair)) for pair in zip(change.matches['Team1'], change.matches['Team2'])}
+    played = np.zeros(len(matches), dtype=bool)
+    for team1, team2 in pairs:
+        played |= code_mask(matches['Team1'], team1) & code_mask(matches['Team2'], team2)
+        played |= code_mask(matches['Team1'], team2) & code_mask(matches['Team2'], team1)
+    cube = dict(previous)
+    cube.update(build_head_to_head_cube(matches[played]))
+    return cube
+
+
+registry.register('h2h_cube', lambda parts: (
+    build_head_to_head_cube(parts['data'].matches) if parts['data'].matches is not None else {}
+), updater=update_head_to_head_cube)
+
+
 # --- New Advanced Head-to-Head Service ---
+@metrics.timed
 def get_advanced_head_to_head(team1, team2, season=None, venue=None):
     """
     Performs a deep analytical dive into the head-to-head matchup between two teams,
     with optional filtering by season and venue.
     """
-    if matches_df is None:
+    if get_dataset().matches is None:
         return {'error': 'Data not loaded'}
+    no_matches = {'summary': {'message': 'No matches found with the selected filters.'}}
+    if not team1 or not team2 or team1 == team2:
+        return no_matches
 
-    # 1. Core Filtering Logic
-    h2h_df = matches_df[
-        ((matches_df['Team1'] == team1) & (matches_df['Team2'] == team2)) |
-        ((matches_df['Team1'] == team2) & (matches_df['Team2'] == team1))
-    ].copy()
-
-    if season and season != 'All':
-        h2h_df = h2h_df[h2h_df['Season'] == season]
-    
-    if venue and venue != 'All':
-        h2h_df = h2h_df[h2h_df['Venue'] == venue]
-
-    if h2h_df.empty:
-        return {'summary': {'message': 'No matches found with the selected filters.'}}
+    # 1. Core Filtering Logic: a single cube lookup
+    season_key = str(season) if season and season != 'All' else 'All'
+    venue_key = venue if venue and venue != 'All' else 'All'
+    cell = registry.get('h2h_cube').get(tuple(sorted((team1, team2))), {}).get((season_key, venue_key))
+    if cell is None:
+        return no_matches
 
     # 2. Basic Win/Loss/Draw Calculation
-    total_matches = h2h_df.shape[0]
-    team1_wins = h2h_df['WinningTeam'].value_counts().get(team1, 0)
-    team2_wins = h2h_df['WinningTeam'].value_counts().get(team2, 0)
-    draws = total_matches - (team1_wins + team2_wins)
+    total_matches = cell['matches']
+    team1_wins = cell['wins'].get(team1, 0)
+    team2_wins = cell['wins'].get(team2, 0)
 
     summary = {
-        'total_matches': int(total_matches),
-        team1: int(team1_wins),
-        team2: int(team2_wins),
-        'draws': int(draws)
+        'total_matches': total_matches,
+        team1: team1_wins,
+        team2: team2_wins,
+        'draws': total_matches - (team1_wins + team2_wins)
     }
 
     # 3. Toss vs. Match Win Correlation
-    toss_winners = h2h_df[h2h_df['TossWinner'] == h2h_df['WinningTeam']]
-    toss_win_match_win_percent = (len(toss_winners) / total_matches * 100) if total_matches > 0 else 0
+    toss_win_match_win_percent = cell['toss_match_wins'] / total_matches * 100
     toss_analysis = {'toss_win_match_win_percent': round(toss_win_match_win_percent, 2)}
 
     # 4. Win Margin Analysis
-    win_margins = {}
-    for team in [team1, team2]:
-        team_wins_df = h2h_df[h2h_df['WinningTeam'] == team]
-        if not team_wins_df.empty:
-            runs_wins = team_wins_df[team_wins_df['WonBy'] == 'Runs']
-            wickets_wins = team_wins_df[team_wins_df['WonBy'] == 'Wickets']
-            win_margins[team] = {
-                'avg_run_margin': round(runs_wins['Margin'].mean(), 2) if not runs_wins.empty else 0,
-                'max_run_margin': int(runs_wins['Margin'].max()) if not runs_wins.empty else 0,
-                'big_run_wins (>50)': int((runs_wins['Margin'] > 50).sum()),
-                'avg_wicket_margin': round(wickets_wins['Margin'].mean(), 2) if not wickets_wins.empty else 0,
-                'max_wicket_margin': int(wickets_wins['Margin'].max()) if not wickets_wins.empty else 0,
-                'big_wicket_wins (>7)': int((wickets_wins['Margin'] > 7).sum())
-            }
-        else:
-            win_margins[team] = {}
+    win_margins = {team: cell['margins'].get(team, {}) for team in [team1, team2]}
 
     # 5. Winning Streak Analysis
-    h2h_df = h2h_df.sort_values(by='Date').dropna(subset=['WinningTeam'])
-    streaks = {team1: 0, team2: 0, 'current_streak_team': None, 'current_streak_count': 0}
     max_streaks = {team1: 0, team2: 0}
+    max_streaks.update(cell['max_streaks'])
 
-    if not h2h_df.empty:
-        for winner in h2h_df['WinningTeam']:
-            if streaks['current_streak_team'] == winner:
-                streaks['current_streak_count'] += 1
-            else:
-                streaks['current_streak_team'] = winner
-                streaks['current_streak_count'] = 1
-            
-            if streaks['current_streak_count'] > max_streaks.get(winner, 0):
-                max_streaks[winner] = streaks['current_streak_count']
-    
     # --- Combine all analytics into a single response ---
     return {
         'summary': summary,
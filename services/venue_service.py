@@ -1,32 +1,110 @@
 import pandas as pd # Import the pandas library
-from .data_service import matches_df
+from . import metrics, registry
+
+DEFAULT_MIN_MATCHES = 5
+
+def build_fortress_matrix(matches):
+    """
+    Builds the full team x venue matches-played and wins matrices in one vectorized pass:
+    each match becomes two (team, venue) rows, one per side, which are then counted.
+    """
+    sides = pd.DataFrame({
+        'team': pd.concat([matches['Team1'], matches['Team2']], ignore_index=True),
+        'Venue': pd.concat([matches['Venue'], matches['Venue']], ignore_index=True),
+    })
+    winners = pd.concat([matches['WinningTeam'], matches['WinningTeam']], ignore_index=True)
+    sides['win'] = (sides['team'] == winners).astype(int)
+
+    counts = sides.groupby(['team', 'Venue'], observed=True)['win'].agg(['size', 'sum'])
+    played = counts['size'].unstack(fill_value=0)
+    wins = counts['sum'].unstack(fill_value=0)
+    return played, wins
 
-def get_venue_fortress_stats(team_name):
-    """Calculates a team's win percentage at each venue."""
-    if matches_df is None:
-        return {}
-    
-    # Filter for matches involving the team
-    team_matches = matches_df[(matches_df['Team1'] == team_name) | (matches_df['Team2'] == team_name)]
-    
-    if team_matches.empty:
-        return {}
 
-    # Calculate total matches and wins per venue
-    venue_stats = team_matches.groupby('Venue').apply(
-        lambda x: pd.Series({
-            'matches_played': x.shape[0],
-            'wins': x[x['WinningTeam'] == team_name].shape[0]
-        })
-    ).reset_index()
+def _team_fortress(fortress_played, fortress_wins, team_name, min_matches):
+    """Slices one team's row out of the matrix: qualifying venues sorted by win percentage."""
+    played = fortress_played.loc[team_name]
+    venue_stats = pd.DataFrame({
+        'Venue': played.index,
+        'matches_played': played.values,
+        'wins': fortress_wins.loc[team_name].values,
+    })
+    venue_stats = venue_stats[venue_stats['matches_played'] > 0]
 
     # Calculate win percentage
     venue_stats['win_percentage'] = (venue_stats['wins'] / venue_stats['matches_played'] * 100).round(2)
-    
-    # Sort by win percentage and filter for venues with at least 5 matches
-    venue_stats = venue_stats[venue_stats['matches_played'] >= 5].sort_values(by='win_percentage', ascending=False)
-    
+
+    # Sort by win percentage and filter for venues with at least 'min_matches' matches
+    venue_stats = venue_stats[venue_stats['matches_played'] >= min_matches].sort_values(by='win_percentage', ascending=False)
+
     return {
         'venues': venue_stats['Venue'].tolist(),
         'win_percentages': venue_stats['win_percentage'].tolist()
-    }
\ No newline at end of file
+    }
+
+
+def build_fortress_index(matches):
+    """Builds the matrices plus every team's default view, which is then served straight from a dict."""
+    if matches is None:
+        return {'played': None, 'wins': None, 'by_team': {}}
+    played, wins = build_fortress_matrix(matches)
+    by_team = {team: _team_fortress(played, wins, team, DEFAULT_MIN_MATCHES) for team in played.index}
+    return {'played': played, 'wins': wins, 'by_team': by_team}
+
+def with_text_labels(matrix):
+    """The matrix with plain string labels, so matrices from different dictionaries align."""
+    return matrix.set_axis(matrix.index.astype(str), axis=0).set_axis(matrix.columns.astype(str), axis=1)
+
+
+def _add_counts(previous, new):
+    """Adds two team x venue count matrices over the union of their teams and venues."""
+    total = with_text_labels(previous).add(with_text_labels(new), fill_value=0)
+    return total.fillna(0).astype(int).sort_index().sort_index(axis=1)
+
+
+def update_fortress_index(parts, previous, change):
+    """Adds the new matches' counts to the matrices and refreshes the default view of their teams."""
+    if previous['played'] is None:
+        return build_fortress_index(parts['data'].matches)
+    new_played, new_wins = build_fortress_matrix(change.matches)
+    played = _add_counts(previous['played'], new_played)
+    wins = _add_counts(previous['wins'], new_wins)
+    by_team = dict(previous['by_team'])
+    for team in new_played.index:
+        by_team[team] = _team_fortress(played, wins, team, DEFAULT_MIN_MATCHES)
+    return {'played': played, 'wins': wins, 'by_team': by_team}
+
+registry.register('fortress', lambda parts: build_fortress_index(parts['data'].matches),
+                  updater=update_fortress_index)
+
+@metrics.timed
+def get_venue_fortress_stats(team_name):
+    """Calculates a team's win percentage at each venue."""
+    return registry.get('fortress')['by_team'].get(team_name, {})
+
+@metrics.timed
+def get_venue_fortress_matrix(min_matches=DEFAULT_MIN_MATCHES):
+    """
+    Returns the whole team x venue win-percentage matrix for heatmaps. Cells with fewer than
+    'min_matches' matches are null; teams and venues without any qualifying cell are dropped.
+    """
+    fortress = registry.get('fortress')
+    fortress_played, fortress_wins = fortress['played'], fortress['wins']
+    if fortress_played is None:
+        return {}
+
+    qualified = fortress_played >= min_matches
+    teams = qualified.any(axis=1)
+    venues = qualified.any(axis=0)
+    played = fortress_played.loc[teams, venues]
+    wins = fortress_wins.loc[teams, venues]
+
+    percentages = (wins / played.where(qualified.loc[teams, venues]) * 100).round(2)
+    return {
+        'min_matches': min_matches,
+        'teams': played.index.tolist(),
+        'venues': played.columns.tolist(),
+        'matches_played': played.values.tolist(),
+        'wins': wins.values.tolist(),
+        'win_percentages': percentages.astype(object).where(percentages.notna(), None).values.tolist()
+    }
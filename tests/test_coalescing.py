@@ -0,0 +1,77 @@
+"""Concurrent identical requests share one computation (see COALESCE_REQUESTS in api/response_cache.py)."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api import response_cache
+from api.response_cache import in_flight
+
+CLIENTS = 8
+URL = '/api/player-runs-per-season?player=Coalescing Test Player'
+
+
+@pytest.fixture(scope='module')
+def app():
+    from app import app
+    return app
+
+
+def _fire(app, count):
+    """Sends 'count' identical requests at once, each from its own client and thread."""
+    def get(_):
+        return app.test_client().get(URL)
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(get, range(count)))
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the concurrent requests"
+        time.sleep(0.005)
+
+
+def test_identical_requests_share_one_computation(app, monkeypatch):
+    response_cache.response_cache.clear()
+    before = in_flight.stats()
+    calls = []
+
+    def compute(player):
+        calls.append(player)
+        # Hold the computation until every other request is waiting on it
+        _wait_for(lambda: in_flight.stats()['followers'] - before['followers'] == CLIENTS - 1)
+        return {'player': player}
+
+    monkeypatch.setattr('api.player_routes.get_player_runs_per_season', compute)
+    responses = _fire(app, CLIENTS)
+
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [200] * CLIENTS
+    assert len({r.get_data() for r in responses}) == 1
+    after = in_flight.stats()
+    assert after['leaders'] - before['leaders'] == 1
+    assert after['followers'] - before['followers'] == CLIENTS - 1
+    assert after['in_flight'] == 0
+
+    metrics = app.test_client().get('/metrics').get_data(as_text=True)
+    assert f"ipl_coalesce_followers_total {after['followers']}" in metrics
+
+
+def test_without_coalescing_every_request_computes(app, monkeypatch):
+    response_cache.response_cache.clear()
+    monkeypatch.setattr(response_cache, 'COALESCE_REQUESTS', False)
+    together = threading.Barrier(CLIENTS, timeout=10)
+    calls = []
+
+    def compute(player):
+        calls.append(player)
+        together.wait()  # every request is computing at the same time
+        return {'player': player}
+
+    monkeypatch.setattr('api.player_routes.get_player_runs_per_season', compute)
+    responses = _fire(app, CLIENTS)
+
+    assert len(calls) == CLIENTS
+    assert [r.status_code for r in responses] == [200] * CLIENTS
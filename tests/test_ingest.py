@@ -0,0 +1,109 @@
+"""
+Incremental ingestion, run end to end in a subprocess against a temporary copy of the datasets
+(IPL_DATA_DIR), so the real CSVs are never touched.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+
+import pandas as pd
+import pytest
+
+from services.data_service import MATCHES_CSV, DELIVERIES_CSV
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEW_ID_OFFSET = 900_000_000  # new matches are copies of real ones under unused IDs
+
+pytestmark = pytest.mark.skipif(
+    not (os.path.exists(MATCHES_CSV) and os.path.exists(DELIVERIES_CSV)), reason="datasets not present")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A copy of the datasets, plus a batch of 3 new matches and their deliveries in batch/."""
+    shutil.copy(MATCHES_CSV, tmp_path)
+    shutil.copy(DELIVERIES_CSV, tmp_path)
+    matches = pd.read_csv(MATCHES_CSV).head(3)
+    deliveries = pd.read_csv(DELIVERIES_CSV)
+    deliveries = deliveries[deliveries['ID'].isin(matches['ID'])].copy()
+    matches['ID'] += NEW_ID_OFFSET
+    deliveries['ID'] += NEW_ID_OFFSET
+    os.mkdir(tmp_path / 'batch')
+    matches.to_csv(tmp_path / 'batch' / 'matches.csv', index=False)
+    deliveries.to_csv(tmp_path / 'batch' / 'deliveries.csv', index=False)
+    return tmp_path
+
+
+def _run(data_dir, *args):
+    env = dict(os.environ, IPL_DATA_DIR=str(data_dir))
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, timeout=600)
+
+
+def _script(data_dir, code):
+    return _run(data_dir, '-c', textwrap.dedent(code))
+
+
+def _csv_bytes(data_dir):
+    return [(data_dir / os.path.basename(path)).read_bytes() for path in (MATCHES_CSV, DELIVERIES_CSV)]
+
+
+def test_ingest_verify_and_reject_repeat(data_dir):
+    batch = ['--matches', str(data_dir / 'batch' / 'matches.csv'),
+             '--deliveries', str(data_dir / 'batch' / 'deliveries.csv')]
+    first = _run(data_dir, 'ingest.py', *batch, '--verify')
+    assert first.returncode == 0, first.stderr
+    assert 'Consistency check passed' in first.stdout
+
+    again = _run(data_dir, 'ingest.py', *batch)
+    assert again.returncode != 0 and 'already loaded' in again.stderr
+    matches = pd.read_csv(data_dir / os.path.basename(MATCHES_CSV))
+    assert not matches['ID'].duplicated().any()
+
+
+def test_failed_update_writes_nothing(data_dir):
+    before = _csv_bytes(data_dir)
+    result = _script(data_dir, """
+        import pandas as pd
+        from services import registry, team_service, name_service, model_service, player_service, venue_service  # noqa: F401
+        from services.ingest_service import append_rows
+
+        def fail(parts, previous, change):
+            raise ValueError('broken updater')
+
+        registry.snapshot()
+        batch = pd.read_csv('{0}/batch/matches.csv'), pd.read_csv('{0}/batch/deliveries.csv')
+        updater, registry._updaters['fortress'] = registry._updaters['fortress'], fail
+        assert append_rows(*batch) == {{'error': 'broken updater'}}
+        assert len(registry.get('data').matches) == len(pd.read_csv('{0}/{1}'))
+
+        registry._updaters['fortress'] = updater
+        assert 'error' not in append_rows(*batch)
+    """.format(data_dir, os.path.basename(MATCHES_CSV)))
+    assert result.returncode == 0, result.stderr
+
+    # The failed attempt left the files alone, so the retry appended the batch exactly once
+    after = _csv_bytes(data_dir)
+    assert after[0].startswith(before[0]) and after[1].startswith(before[1])
+    matches = pd.read_csv(data_dir / os.path.basename(MATCHES_CSV))
+    assert not matches['ID'].duplicated().any()
+    assert (matches['ID'] >= NEW_ID_OFFSET).sum() == 3
+
+
+def test_rejects_ids_already_in_the_files(data_dir):
+    result = _script(data_dir, """
+        import pandas as pd
+        from services import registry
+        from services.ingest_service import append_rows, _appended_copy
+        import os
+
+        registry.snapshot()
+        matches = pd.read_csv('{0}/batch/matches.csv')
+        # Another process appends the batch after this one has loaded the data
+        path = '{0}/{1}'
+        os.replace(_appended_copy(path, matches, list(matches.columns)), path)
+        result = append_rows(matches, pd.read_csv('{0}/batch/deliveries.csv'))
+        assert 'already in the CSV files' in result['error'], result
+    """.format(data_dir, os.path.basename(MATCHES_CSV)))
+    assert result.returncode == 0, result.stderr
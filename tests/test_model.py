@@ -0,0 +1,90 @@
+"""
+The plain-array model (LinearWinModel) against the sklearn pipeline it is compiled from: the
+same P(Team1 wins) for known and unseen values, through every path the endpoints use.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from services import model_service
+from services.model_service import (
+    FEATURES, LinearWinModel, artifact_path, file_sha256, model_path, verify_against_pipeline
+)
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('sklearn')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(model_path), reason="model not present")
+
+TOLERANCE = 1e-9
+
+
+@pytest.fixture(scope='module')
+def pipeline():
+    return model_service._load_pipeline()
+
+
+@pytest.fixture(scope='module')
+def compiled(pipeline):
+    return LinearWinModel.from_pipeline(pipeline)
+
+
+def expected(pipeline, columns):
+    """P(Team1 wins) from the sklearn pipeline (its first class is 'Team1 wins')."""
+    return pipeline.predict_proba(pd.DataFrame(columns))[:, 0]
+
+
+def known(compiled, feature):
+    vocabulary = compiled.vocabularies[compiled.features.index(feature)]
+    return sorted(vocabulary, key=vocabulary.get)
+
+
+def test_compiled_model_matches_pipeline(pipeline, compiled):
+    assert compiled.features == FEATURES  # predict_win_matrix stacks its code columns in this order
+    assert verify_against_pipeline(compiled, pipeline) < TOLERANCE
+
+
+def test_unseen_values_match_pipeline(pipeline, compiled):
+    teams = known(compiled, 'Team1')
+    columns = {
+        'Team1': [teams[0], 'Unseen XI', 'Unseen XI', teams[1]],
+        'Team2': [teams[1], teams[0], 'Other XI', teams[2]],
+        'Venue': ['Nowhere Ground', known(compiled, 'Venue')[0], 'Nowhere Ground', 'Nowhere Ground'],
+        'TossWinner': ['Unseen XI', teams[0], 'Other XI', teams[1]],
+        'TossDecision': ['bat', 'field', 'neither', 'field'],
+    }
+    assert np.abs(compiled.predict_proba(columns) - expected(pipeline, columns)).max() < TOLERANCE
+
+
+def test_artifact_matches_pipeline(pipeline):
+    if not os.path.exists(artifact_path):
+        pytest.skip("no compact artifact")
+    with open(artifact_path) as f:
+        artifact = json.load(f)
+    assert artifact['metadata']['pipeline_sha256'] == file_sha256(model_path), "stale artifact: re-run train_model.py"
+    assert verify_against_pipeline(LinearWinModel.from_artifact(artifact), pipeline) < TOLERANCE
+
+
+def test_batch_and_matrix_match_pipeline(monkeypatch, pipeline, compiled):
+    monkeypatch.setattr(model_service, 'get_compiled_model', lambda: compiled)
+    teams = known(compiled, 'Team1')[:4] + ['Unseen XI']
+    venue = known(compiled, 'Venue')[0]
+
+    fixtures = [{'Team1': a, 'Team2': b, 'Venue': venue, 'TossWinner': a, 'TossDecision': 'bat'}
+                for a in teams for b in teams if a != b]
+    batch = model_service.predict_win_probabilities(fixtures)
+    reference = expected(pipeline, {f: [fx[f] for fx in fixtures] for f in FEATURES})
+    assert [p['team1_win_probability'] for p in batch] == pytest.approx((reference * 100).tolist(), abs=0.006)
+
+    # The matrix scores encoded columns directly (predict_proba_codes), averaging the toss outcomes
+    matrix = model_service.predict_win_matrix(teams, venue)['matrix']
+    for i, a in enumerate(teams):
+        for j, b in enumerate(teams):
+            if i == j:
+                assert matrix[i][j] is None
+                continue
+            columns = {'Team1': [a] * 4, 'Team2': [b] * 4, 'Venue': [venue] * 4,
+                       'TossWinner': [a, a, b, b], 'TossDecision': ['bat', 'field'] * 2}
+            assert matrix[i][j] == pytest.approx(round(expected(pipeline, columns).mean() * 100, 2), abs=0.011)
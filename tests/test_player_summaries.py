@@ -0,0 +1,109 @@
+"""
+Parity of the precomputed career summaries with the original scan-based implementations,
+which are kept below as the reference. Both run on the datasets in data/ (or IPL_DATA_DIR).
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from services.data_service import MATCHES_CSV, DELIVERIES_CSV
+from services.player_service import get_batsman_summary, get_bowler_summary
+
+# Every n-th player (by name) is compared, which covers regulars and one-match players alike
+SAMPLE_EVERY = 5
+
+pytestmark = pytest.mark.skipif(
+    not (os.path.exists(MATCHES_CSV) and os.path.exists(DELIVERIES_CSV)), reason="datasets not present")
+
+
+@pytest.fixture(scope='module')
+def frames():
+    """The raw CSVs, as the original implementations read them."""
+    return pd.read_csv(MATCHES_CSV), pd.read_csv(DELIVERIES_CSV)
+
+
+# --- Reference implementations (the original per-request scans) ---
+
+def reference_batsman_summary(deliveries_df, matches_df, player_name):
+    player_df = deliveries_df[deliveries_df['batter'] == player_name]
+    if player_df.empty:
+        return {}
+    runs = int(player_df['batsman_run'].sum())
+    balls_faced = player_df[~player_df['extra_type'].isin(['wides'])].shape[0]
+    innings = int(player_df['ID'].nunique())
+    dismissals = player_df[player_df['player_out'] == player_name].shape[0]
+    avg = (runs / dismissals) if dismissals > 0 else float('inf')
+    strike_rate = (runs / balls_faced * 100) if balls_faced > 0 else 0.0
+    innings_scores = player_df.groupby('ID')['batsman_run'].sum()
+    return {
+        "Innings": innings,
+        "Total Runs": runs,
+        "Dismissals": dismissals,
+        "Not Out": innings - dismissals,
+        "Average": f"{avg:.2f}",
+        "Strike Rate": f"{strike_rate:.2f}",
+        "Fifties": int(innings_scores[(innings_scores >= 50) & (innings_scores < 100)].count()),
+        "Hundreds": int(innings_scores[innings_scores >= 100].count()),
+        "Highest Score": int(innings_scores.max()) if not innings_scores.empty else 0,
+        "Fours": int(player_df[player_df['batsman_run'] == 4].shape[0]),
+        "Sixes": int(player_df[player_df['batsman_run'] == 6].shape[0]),
+        "Man of the Match": int(matches_df[matches_df['Player_of_Match'] == player_name].shape[0]),
+    }
+
+
+def reference_bowler_summary(deliveries_df, matches_df, player_name):
+    player_df = deliveries_df[deliveries_df['bowler'] == player_name].copy()
+    if player_df.empty:
+        return {}
+    player_df['bowler_run'] = player_df['total_run'] - player_df['extras_run']
+    player_df.loc[player_df['extra_type'].isin(['byes', 'legbyes']), 'bowler_run'] = 0
+    innings = int(player_df['ID'].nunique())
+    runs_conceded = int(player_df['bowler_run'].sum())
+    balls_bowled = player_df[~player_df['extra_type'].isin(['wides', 'noballs'])].shape[0]
+    wickets = int(player_df[player_df['isWicketDelivery'] == 1].shape[0])
+    economy = (runs_conceded / (balls_bowled / 6)) if balls_bowled > 0 else 0.0
+    average = (runs_conceded / wickets) if wickets > 0 else float('inf')
+    strike_rate = (balls_bowled / wickets) if wickets > 0 else float('inf')
+    innings_stats = player_df.groupby('ID').agg(
+        wickets_taken=('isWicketDelivery', 'sum'),
+        runs_given=('bowler_run', 'sum')
+    )
+    best = innings_stats.sort_values(by=['wickets_taken', 'runs_given'], ascending=[False, True]).iloc[0]
+    return {
+        "Innings": innings,
+        "Overs Bowled": f"{(balls_bowled // 6)}.{balls_bowled % 6}",
+        "Wickets": wickets,
+        "Runs Conceded": runs_conceded,
+        "Average": f"{average:.2f}",
+        "Economy": f"{economy:.2f}",
+        "Strike Rate": f"{strike_rate:.2f}",
+        "3+ Wicket Hauls": int(innings_stats[innings_stats['wickets_taken'] >= 3].count()['wickets_taken']),
+        "5+ Wicket Hauls": int(innings_stats[innings_stats['wickets_taken'] >= 5].count()['wickets_taken']),
+        "Best Figures": f"{int(best['wickets_taken'])}/{int(best['runs_given'])}",
+        "Man of the Match": int(matches_df[matches_df['Player_of_Match'] == player_name].shape[0]),
+    }
+
+
+# --- Parity ---
+
+def _typed(summary):
+    """Values with their types, so 5 and '5' (or numpy and Python ints) don't compare equal."""
+    return {key: (type(value).__name__, value) for key, value in summary.items()}
+
+
+@pytest.mark.parametrize('role, column, summary, reference', [
+    ('batting', 'batter', get_batsman_summary, reference_batsman_summary),
+    ('bowling', 'bowler', get_bowler_summary, reference_bowler_summary),
+])
+def test_summaries_match_reference(frames, role, column, summary, reference):
+    matches_df, deliveries_df = frames
+    players = sorted(deliveries_df[column].unique())[::SAMPLE_EVERY]
+    mismatches = [player for player in players
+                  if _typed(summary(player)) != _typed(reference(deliveries_df, matches_df, player))]
+    assert not mismatches, f"{len(mismatches)} {role} summaries differ, e.g. {mismatches[:5]}"
+
+
+def test_unknown_player_is_empty():
+    assert get_batsman_summary('Not A Player') == {}
+    assert get_bowler_summary('Not A Player') == {}
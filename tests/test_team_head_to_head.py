@@ -0,0 +1,37 @@
+"""The team head-to-head endpoint, answered from the pre-aggregated cube."""
+import os
+
+import pytest
+
+from services.data_service import MATCHES_CSV
+
+pytestmark = pytest.mark.skipif(not os.path.exists(MATCHES_CSV), reason="datasets not present")
+
+NO_MATCHES = {'summary': {'message': 'No matches found with the selected filters.'}}
+
+
+@pytest.fixture(scope='module')
+def client():
+    from app import app
+    return app.test_client()
+
+
+@pytest.mark.parametrize('query', [
+    'team2=Mumbai Indians',
+    'team1=Mumbai Indians',
+    '',
+    'team1=Mumbai Indians&team2=Mumbai Indians',
+])
+def test_missing_or_same_team_finds_no_matches(client, query):
+    response = client.get(f'/api/team-head-to-head?{query}')
+    assert response.status_code == 200
+    assert response.get_json() == NO_MATCHES
+
+
+def test_abbreviated_and_swapped_teams_share_one_answer(client):
+    full = client.get('/api/team-head-to-head?team1=Mumbai Indians&team2=Chennai Super Kings')
+    assert full.get_json()['summary']['total_matches'] > 0
+    for query in ('team1=MI&team2=CSK', 'team1=CSK&team2=MI', 'team1=Chennai Super Kings&team2=Mumbai Indians'):
+        response = client.get(f'/api/team-head-to-head?{query}')
+        assert response.get_data() == full.get_data()
+        assert response.headers['ETag'] == full.headers['ETag']
@@ -1,59 +1,145 @@
+import argparse
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
 import pandas as pd
-from sklearn.model_selection import train_test_split
+import sklearn
+from sklearn.model_selection import train_test_split, StratifiedKFold, cross_val_score
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-import pickle
-import os
 
-print("Loading data...")
-# Adjust path as needed
-matches = pd.read_csv('data/IPL_Matches_2008_2022.csv')
-
-# --- Feature Engineering ---
-# 1. Simplify WinningTeam to a binary outcome (0 for Team1, 1 for Team2)
-# We need to handle non-decisive matches (e.g., tied/no result)
-df = matches.dropna(subset=['WinningTeam']) # Drop matches with no winner
-df['outcome'] = (df['WinningTeam'] == df['Team2']).astype(int)
-
-# 2. Select features
-features = ['Team1', 'Team2', 'Venue', 'TossWinner', 'TossDecision']
-X = df[features]
-y = df['outcome']
-
-print("Splitting data...")
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# --- Model Pipeline ---
-# Define the preprocessing steps for categorical features
-# OneHotEncoder will create binary columns for each category and handle unknown values
-categorical_features = ['Team1', 'Team2', 'Venue', 'TossWinner', 'TossDecision']
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
+from services.model_service import (
+    FEATURES, LinearWinModel, model_path, artifact_path, file_sha256, verify_against_pipeline
+)
+
+MATCHES_CSV = 'data/IPL_Matches_2008_2022.csv'
+
+# --- Search Space ---
+# Feature sets are subsets of the features the API sends; the served model ignores the rest.
+FEATURE_SETS = {
+    'all': FEATURES,
+    'no_toss_decision': ['Team1', 'Team2', 'Venue', 'TossWinner'],
+    'teams_venue': ['Team1', 'Team2', 'Venue'],
+    'teams_toss': ['Team1', 'Team2', 'TossWinner', 'TossDecision'],
+}
+PARAM_GRID = [{'C': C, 'penalty': penalty} for C in (0.03, 0.1, 0.3, 1.0, 3.0) for penalty in ('l1', 'l2')]
+CV_FOLDS = 5
+
+
+def make_pipeline(features, C=1.0, penalty='l2'):
+    """One-hot encodes the categorical features (ignoring unseen values) into a logistic regression."""
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('cat', OneHotEncoder(handle_unknown='ignore'), features)
+        ])
+    return Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('classifier', LogisticRegression(solver='liblinear', C=C, penalty=penalty))
     ])
 
-# Create the logistic regression pipeline
-model_pipeline = Pipeline(steps=[
-    ('preprocessor', preprocessor),
-    ('classifier', LogisticRegression(solver='liblinear'))
-])
 
-print("Training model...")
-model_pipeline.fit(X_train, y_train)
+def load_training_data():
+    matches = pd.read_csv(MATCHES_CSV)
+
+    # --- Feature Engineering ---
+    # Simplify WinningTeam to a binary outcome (0 for Team1, 1 for Team2), dropping
+    # non-decisive matches (e.g., tied/no result)
+    df = matches.dropna(subset=['WinningTeam']).copy()
+    df['outcome'] = (df['WinningTeam'] == df['Team2']).astype(int)
+    return df[FEATURES], df['outcome']
+
+
+def evaluate(candidate):
+    """Cross-validated accuracy of one (feature set, hyperparameters) candidate; runs in a worker process."""
+    name, params, X, y = candidate
+    folds = StratifiedKFold(n_splits=CV_FOLDS, shuffle=True, random_state=42)
+    scores = cross_val_score(make_pipeline(FEATURE_SETS[name], **params), X, y, cv=folds, scoring='accuracy')
+    return {'feature_set': name, 'params': params, 'cv_mean': float(scores.mean()), 'cv_std': float(scores.std())}
+
+
+def search(X, y, workers):
+    """Evaluates every candidate across a process pool; returns the results, best first."""
+    # Plain arrays for the workers: unpickled pandas data comes back read-only, which sklearn rejects
+    y = y.to_numpy().copy()
+    candidates = [(name, params, X, y) for name in FEATURE_SETS for params in PARAM_GRID]
+    print(f"Searching {len(candidates)} candidates ({CV_FOLDS}-fold CV) on {workers} processes...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(evaluate, candidates))
+    # Ties go to the simpler feature set, then to stronger regularization
+    return sorted(results, key=lambda r: (-round(r['cv_mean'], 6), len(FEATURE_SETS[r['feature_set']]), r['params']['C']))
+
+
+def export_artifact(pipeline, metadata):
+    """Writes the compact artifact after checking it scores exactly like the pipeline."""
+    compiled = LinearWinModel.from_pipeline(pipeline)
+    difference = verify_against_pipeline(compiled, pipeline)
+    if difference > 1e-9:
+        raise SystemExit(f"Error: Compiled model disagrees with the pipeline (max difference {difference:.2e}).")
+    print(f"Consistency check passed (max difference {difference:.1e}).")
+
+    metadata = dict(metadata, pipeline_sha256=file_sha256(model_path), data_sha256=file_sha256(MATCHES_CSV),
+                    sklearn_version=sklearn.__version__, exported_at=datetime.now(timezone.utc).isoformat(timespec='seconds'))
+    with open(artifact_path, 'w') as f:
+        json.dump(compiled.to_artifact(metadata), f, separators=(',', ':'))
+    print(f"Model artifact saved to {artifact_path} ({os.path.getsize(artifact_path)} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the win predictor and export its compact artifact.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes for the CV search")
+    parser.add_argument('--export-only', action='store_true',
+                        help="Don't retrain: export the artifact from the existing pickled pipeline")
+    args = parser.parse_args()
+
+    print("Loading data...")
+    X, y = load_training_data()
+
+    print("Splitting data...")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    if args.export_only:
+        with open(model_path, 'rb') as f:
+            model_pipeline = pickle.load(f)
+        classifier = model_pipeline.named_steps['classifier']
+        metadata = {
+            'features': list(model_pipeline.named_steps['preprocessor'].transformers_[0][2]),
+            'params': {'C': classifier.C, 'penalty': classifier.penalty},
+            'cv_accuracy': None,
+        }
+    else:
+        results = search(X_train, y_train, args.workers)
+        for r in results[:5]:
+            print(f"  {r['feature_set']:<18} C={r['params']['C']:<5} {r['params']['penalty']}  "
+                  f"CV accuracy {r['cv_mean']:.4f} ± {r['cv_std']:.4f}")
+        best = results[0]
+
+        print("Training model...")
+        model_pipeline = make_pipeline(FEATURE_SETS[best['feature_set']], **best['params'])
+        model_pipeline.fit(X_train, y_train)
 
-# --- Evaluate and Save ---
-accuracy = model_pipeline.score(X_test, y_test)
-print(f"Model Accuracy: {accuracy:.4f}")
+        # Ensure the model directory exists and save the trained model pipeline
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        with open(model_path, 'wb') as f:
+            pickle.dump(model_pipeline, f)
+        print(f"Model saved successfully to {model_path}")
+        metadata = {
+            'features': FEATURE_SETS[best['feature_set']],
+            'params': best['params'],
+            'cv_accuracy': round(best['cv_mean'], 4),
+            'search': results[:5],
+        }
 
-# Ensure the model directory exists
-if not os.path.exists('model'):
-    os.makedirs('model')
+    # --- Evaluate and Export ---
+    accuracy = model_pipeline.score(X_test, y_test)
+    print(f"Model Accuracy: {accuracy:.4f}")
+    metadata.update(test_accuracy=round(float(accuracy), 4), train_rows=int(len(X_train)), test_rows=int(len(X_test)))
+    export_artifact(model_pipeline, metadata)
 
-# Save the trained model pipeline
-model_path = 'model/win_predictor.pkl'
-with open(model_path, 'wb') as f:
-    pickle.dump(model_pipeline, f)
 
-print(f"Model saved successfully to {model_path}")
\ No newline at end of file
+if __name__ == '__main__':
+    main()